@@ -8,7 +8,7 @@ from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from ....db.database import get_db
 from ....auth.auth import authenticate_user, create_access_token, create_user, get_user_by_email, ACCESS_TOKEN_EXPIRE_MINUTES
-from ....auth.dependencies import get_current_active_user
+from ....auth.dependencies import get_current_user, get_current_active_user, invalidate_user_cache
 from ....db.models.project import User
 from ....services.security_logger import security_logger, log_login_attempt
 
@@ -146,10 +146,20 @@ async def register_user(
         password=user_data.password,
         full_name=user_data.full_name
     )
+    invalidate_user_cache(user.email)
     
     return user
 
 
+@router.post("/logout")
+async def logout(
+    current_user: User = Depends(get_current_user)
+):
+    """Log out: the next request re-reads the account from the database"""
+    invalidate_user_cache(current_user.email)
+    return {"message": "Logged out successfully"}
+
+
 @router.get("/me", response_model=UserResponse)
 async def read_users_me(
     current_user: User = Depends(get_current_active_user)
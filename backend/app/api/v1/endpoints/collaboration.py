@@ -2,7 +2,7 @@
 # For commercial licenses, please contact Tiago Sasaki at tiago@confenge.com.br.
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, HTTPException, File, UploadFile
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, raiseload, selectinload
 from typing import List, Optional, Dict, Any
 import json
 import os
@@ -17,9 +17,11 @@ from ...auth.dependencies import get_current_active_user
 from ...db.models.project import User, Project, Conflict
 from ...db.models.collaboration import (
     Comment, CommentAttachment, Annotation, ActivityLog, 
-    ConflictAssignment, WorkflowState, Notification, ConflictWatch
+    ConflictAssignment, WorkflowState, Notification, ConflictWatch, MimeType,
+    COMMENT_TYPES, ANNOTATION_TYPES, PRIORITIES
 )
 from ...services.websocket_manager import connection_manager, collaboration_manager
+from ...services.activity_log_writer import activity_log_writer
 
 router = APIRouter(prefix="/collaboration", tags=["collaboration"])
 
@@ -155,10 +157,11 @@ def get_conflict_comments(
     conflict_id: int,
     limit: int = 50,
     offset: int = 0,
+    search: Optional[str] = None,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ) -> Dict[str, Any]:
-    """Get comments for a conflict"""
+    """Get comments for a conflict, optionally full-text filtered by search"""
     # Verify access to conflict
     conflict = db.query(Conflict).filter(Conflict.id == conflict_id).first()
     if not conflict:
@@ -183,6 +186,9 @@ def get_conflict_comments(
     if not current_user.is_superuser:
         comments_query = comments_query.filter(Comment.is_internal == False)
     
+    if search:
+        comments_query = comments_query.filter(Comment.matching(search))
+    
     comments = comments_query.offset(offset).limit(limit).all()
     
     # Format response
@@ -246,12 +252,16 @@ async def add_comment(
     if not project:
         raise HTTPException(status_code=403, detail="Access denied")
     
+    comment_type = comment_data.get("comment_type", "general")
+    if comment_type not in COMMENT_TYPES:
+        raise HTTPException(status_code=400, detail=f"Invalid comment_type: {comment_type}")
+    
     # Create comment
     comment = Comment(
         conflict_id=conflict_id,
         user_id=current_user.id,
         message=comment_data.get("message", ""),
-        comment_type=comment_data.get("comment_type", "general"),
+        comment_type=comment_type,
         is_internal=comment_data.get("is_internal", False),
         parent_comment_id=comment_data.get("parent_comment_id")
     )
@@ -260,8 +270,8 @@ async def add_comment(
     db.commit()
     db.refresh(comment)
     
-    # Create activity log
-    activity = ActivityLog(
+    # Activity log row is written in the background with other queued rows
+    activity_log_writer.submit(
         project_id=conflict.project_id,
         conflict_id=conflict_id,
         user_id=current_user.id,
@@ -271,8 +281,6 @@ async def add_comment(
         entity_id=comment.id,
         description=f"{current_user.full_name} added a comment to conflict {conflict_id}"
     )
-    db.add(activity)
-    db.commit()
     
     # Format response
     comment_response = {
@@ -343,7 +351,7 @@ async def upload_comment_attachment(
         filename=file.filename,
         file_path=file_path,
         file_size=len(content),
-        file_type=file.content_type
+        file_type_id=MimeType.id_for(db, file.content_type)
     )
     
     db.add(attachment)
@@ -362,10 +370,11 @@ async def upload_comment_attachment(
 @router.get("/conflicts/{conflict_id}/annotations")
 def get_conflict_annotations(
     conflict_id: int,
+    search: Optional[str] = None,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ) -> List[Dict[str, Any]]:
-    """Get annotations for a conflict"""
+    """Get annotations for a conflict, optionally full-text filtered by search"""
     # Verify access to conflict
     conflict = db.query(Conflict).filter(Conflict.id == conflict_id).first()
     if not conflict:
@@ -380,26 +389,30 @@ def get_conflict_annotations(
         raise HTTPException(status_code=403, detail="Access denied")
     
     # Get annotations
-    annotations = db.query(Annotation).filter(
+    annotations_query = db.query(Annotation).options(
+        selectinload(Annotation.user),
+        selectinload(Annotation.resolved_by)
+    ).filter(
         Annotation.conflict_id == conflict_id,
         Annotation.is_visible == True
-    ).order_by(Annotation.created_at.desc()).all()
+    )
+    if search:
+        annotations_query = annotations_query.filter(Annotation.matching(search))
+    annotations = annotations_query.order_by(Annotation.created_at.desc()).all()
     
     # Format response
     annotation_list = []
     for annotation in annotations:
-        user = db.query(User).filter(User.id == annotation.user_id).first()
-        resolved_by = None
-        if annotation.resolved_by_id:
-            resolved_by = db.query(User).filter(User.id == annotation.resolved_by_id).first()
+        user = annotation.user
+        resolved_by = annotation.resolved_by
         
         annotation_data = {
             "id": annotation.id,
             "annotation_type": annotation.annotation_type,
             "title": annotation.title,
             "description": annotation.description,
-            "position_data": json.loads(annotation.position_data) if annotation.position_data else None,
-            "visual_data": json.loads(annotation.visual_data) if annotation.visual_data else None,
+            "position_data": annotation.position_data,
+            "visual_data": annotation.visual_data,
             "is_resolved": annotation.is_resolved,
             "priority": annotation.priority,
             "created_at": annotation.created_at,
@@ -441,25 +454,32 @@ async def add_annotation(
     if not project:
         raise HTTPException(status_code=403, detail="Access denied")
     
+    annotation_type = annotation_data.get("annotation_type", "point")
+    if annotation_type not in ANNOTATION_TYPES:
+        raise HTTPException(status_code=400, detail=f"Invalid annotation_type: {annotation_type}")
+    priority = annotation_data.get("priority", "medium")
+    if priority not in PRIORITIES:
+        raise HTTPException(status_code=400, detail=f"Invalid priority: {priority}")
+    
     # Create annotation
     annotation = Annotation(
         conflict_id=conflict_id,
         element_id=annotation_data.get("element_id"),
         user_id=current_user.id,
-        annotation_type=annotation_data.get("annotation_type", "point"),
+        annotation_type=annotation_type,
         title=annotation_data.get("title", ""),
         description=annotation_data.get("description", ""),
-        position_data=json.dumps(annotation_data.get("position_data", {})),
-        visual_data=json.dumps(annotation_data.get("visual_data", {})),
-        priority=annotation_data.get("priority", "medium")
+        position_data=annotation_data.get("position_data", {}),
+        visual_data=annotation_data.get("visual_data", {}),
+        priority=priority
     )
     
     db.add(annotation)
     db.commit()
     db.refresh(annotation)
     
-    # Create activity log
-    activity = ActivityLog(
+    # Activity log row is written in the background with other queued rows
+    activity_log_writer.submit(
         project_id=conflict.project_id,
         conflict_id=conflict_id,
         user_id=current_user.id,
@@ -469,8 +489,6 @@ async def add_annotation(
         entity_id=annotation.id,
         description=f"{current_user.full_name} added an annotation to conflict {conflict_id}"
     )
-    db.add(activity)
-    db.commit()
     
     # Format response
     annotation_response = {
@@ -478,8 +496,8 @@ async def add_annotation(
         "annotation_type": annotation.annotation_type,
         "title": annotation.title,
         "description": annotation.description,
-        "position_data": json.loads(annotation.position_data) if annotation.position_data else None,
-        "visual_data": json.loads(annotation.visual_data) if annotation.visual_data else None,
+        "position_data": annotation.position_data,
+        "visual_data": annotation.visual_data,
         "priority": annotation.priority,
         "created_at": annotation.created_at,
         "user": {
@@ -521,14 +539,16 @@ def get_conflict_activity(
         raise HTTPException(status_code=403, detail="Access denied")
     
     # Get activity logs
-    activities = db.query(ActivityLog).filter(
+    activities = db.query(ActivityLog).options(
+        selectinload(ActivityLog.user), raiseload("*")
+    ).filter(
         ActivityLog.conflict_id == conflict_id
     ).order_by(ActivityLog.created_at.desc()).offset(offset).limit(limit).all()
     
     # Format response
     activity_list = []
     for activity in activities:
-        user = db.query(User).filter(User.id == activity.user_id).first()
+        user = activity.user
         activity_data = {
             "id": activity.id,
             "activity_type": activity.activity_type,
@@ -536,9 +556,9 @@ def get_conflict_activity(
             "entity_type": activity.entity_type,
             "entity_id": activity.entity_id,
             "description": activity.description,
-            "old_values": json.loads(activity.old_values) if activity.old_values else None,
-            "new_values": json.loads(activity.new_values) if activity.new_values else None,
-            "metadata": json.loads(activity.metadata) if activity.metadata else None,
+            "old_values": activity.old_values,
+            "new_values": activity.new_values,
+            "metadata": activity.context_metadata,
             "created_at": activity.created_at,
             "user": {
                 "id": user.id,
@@ -574,14 +594,16 @@ def get_project_activity(
         raise HTTPException(status_code=404, detail="Project not found or access denied")
     
     # Get activity logs
-    activities = db.query(ActivityLog).filter(
+    activities = db.query(ActivityLog).options(
+        selectinload(ActivityLog.user), raiseload("*")
+    ).filter(
         ActivityLog.project_id == project_id
     ).order_by(ActivityLog.created_at.desc()).offset(offset).limit(limit).all()
     
     # Format response
     activity_list = []
     for activity in activities:
-        user = db.query(User).filter(User.id == activity.user_id).first()
+        user = activity.user
         activity_data = {
             "id": activity.id,
             "conflict_id": activity.conflict_id,
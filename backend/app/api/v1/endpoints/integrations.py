@@ -4,7 +4,6 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import Dict, Any, Optional
-import json
 from datetime import datetime
 
 from ...db.database import get_db
@@ -43,21 +42,9 @@ def get_project_integration_config(
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    # Parse JSON configs
-    planning_config = {}
-    budget_config = {}
-    
-    if project.planning_tool_config:
-        try:
-            planning_config = json.loads(project.planning_tool_config)
-        except json.JSONDecodeError:
-            planning_config = {}
-    
-    if project.budget_tool_config:
-        try:
-            budget_config = json.loads(project.budget_tool_config)
-        except json.JSONDecodeError:
-            budget_config = {}
+    # JSON columns come back already decoded
+    planning_config = project.planning_tool_config or {}
+    budget_config = project.budget_tool_config or {}
     
     return {
         "project_id": project_id,
@@ -124,7 +111,7 @@ def configure_planning_integration(
     project.planning_tool_api_key = encrypted_key
     project.planning_tool_project_id = config_data["project_id"]
     project.planning_tool_base_url = config_data.get("base_url", "")
-    project.planning_tool_config = json.dumps(additional_config) if additional_config else None
+    project.planning_tool_config = additional_config or None
     project.sync_status = "not_configured"
     project.sync_error_message = None
     
@@ -191,7 +178,7 @@ def configure_budget_integration(
     project.budget_tool_api_key = encrypted_key
     project.budget_tool_project_id = config_data["project_id"]
     project.budget_tool_base_url = config_data.get("base_url", "")
-    project.budget_tool_config = json.dumps(additional_config) if additional_config else None
+    project.budget_tool_config = additional_config or None
     
     db.commit()
     db.refresh(project)
@@ -1,16 +1,36 @@
 # Production use requires a separate commercial license from the Licensor.
 # For commercial licenses, please contact Tiago Sasaki at tiago@confenge.com.br.
 
-from fastapi import APIRouter, File, UploadFile, HTTPException, Depends, Request
-from sqlalchemy.orm import Session, joinedload
-from typing import List
+from fastapi import APIRouter, File, UploadFile, HTTPException, Depends, Request, Response, Query
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
+from sqlalchemy import select, text, literal
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload, raiseload
+from typing import Callable, Iterator, List, Optional
 import os
+import re
+import logging
+import asyncio
+import orjson
 import uuid
+import hashlib
+import itertools
+import time
+from collections import defaultdict
+from functools import lru_cache
 from datetime import datetime
-from ...db.models.project import Project, IFCModel, Conflict, User, Solution, SolutionFeedback, ProjectCost
-from ...db.database import get_db
+from ...db.models.project import (
+    Project, IFCModel, Conflict, Element, User, Solution, SolutionFeedback, ProjectCost,
+    conflict_element_association
+)
+from ...db.database import get_db, upsert_insert
 from ...services.bim_processor import process_ifc_file
-from ...tasks.process_ifc import process_ifc_task, convert_ifc_to_gltf, convert_ifc_to_xkt, run_inter_model_clash_detection, invalidate_project_cache, invalidate_model_cache
+from ...services.async_io import write_stream
+from ...tasks.process_ifc import (
+    process_ifc_task, convert_ifc_to_gltf, convert_ifc_to_xkt, run_inter_model_clash_detection,
+    invalidate_project_cache, invalidate_model_cache,
+    get_list_cache_key, get_cached_list_response, cache_list_response
+)
 from ...auth.dependencies import get_current_active_user, require_project_view, require_file_upload, require_project_edit
 from ...core.exceptions import (
     ValidationError, ResourceNotFoundError, handle_database_error, 
@@ -20,28 +40,130 @@ from ...services.rules_engine import suggest_solutions_for_conflict, create_solu
 from ...services.feedback_service import FeedbackDataCollector
 from ...services.ml_service import Predictor
 from ...tasks.ml_tasks import train_risk_prediction_model
+from ...tasks.dispatch import enqueue, enqueue_many
 from ...services.security_logger import security_logger, log_file_upload, log_validation_failure
 
-router = APIRouter(prefix="/projects", tags=["projects"])
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/projects", tags=["projects"], default_response_class=ORJSONResponse)
 
-# Ensure upload directory exists
+# Ensure upload directories exist once at import instead of on every upload
 UPLOAD_DIR = "/app/uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
+os.makedirs(os.path.join(UPLOAD_DIR, "converted"), exist_ok=True)
 
 # Database query optimization helpers
-def get_conflicts_with_elements(db: Session, project_id: int):
-    """Get conflicts with elements using optimized query to avoid N+1 problems"""
-    return db.query(Conflict).options(
-        joinedload(Conflict.elements)
-    ).filter(Conflict.project_id == project_id).all()
+def get_conflicts_with_elements(db: Session, project_id: int, batch_size: int = 500,
+                                cursor: int = 0, limit: Optional[int] = None):
+    """
+    Iterate conflicts with their elements using columns-only queries.
+    
+    Conflicts are read in batches from a server-side cursor; each batch's elements
+    come from one join over the association table, grouped by conflict in Python.
+    No ORM instances are constructed on this read path.
+    
+    Args:
+        cursor: Only return conflicts with an id greater than this
+        limit: Maximum number of conflicts to return, or None for all
+    
+    Yields:
+        (conflict_row, element_rows) tuples
+    """
+    conflicts = db.execute(
+        select(
+            Conflict.id, Conflict.conflict_type, Conflict.description,
+            Conflict.severity, Conflict.status, Conflict.created_at
+        ).where(
+            Conflict.project_id == project_id,
+            Conflict.id > cursor
+        ).order_by(Conflict.id).limit(limit),
+        execution_options={"yield_per": batch_size}
+    )
+    
+    for batch in conflicts.partitions():
+        elements_by_conflict = defaultdict(list)
+        element_rows = db.execute(
+            select(
+                conflict_element_association.c.conflict_id,
+                Element.id, Element.ifc_id, Element.element_type, Element.name
+            ).join(
+                Element, Element.id == conflict_element_association.c.element_id
+            ).where(conflict_element_association.c.conflict_id.in_([c.id for c in batch]))
+        )
+        for row in element_rows:
+            elements_by_conflict[row.conflict_id].append(row)
+        
+        for c in batch:
+            yield c, elements_by_conflict[c.id]
+
+def _find_project_model_by_hash(db: Session, project_id: int, content_sha256: str) -> Optional[IFCModel]:
+    """The project's model with this content hash, if one was already uploaded"""
+    return db.query(IFCModel).filter(
+        IFCModel.project_id == project_id,
+        IFCModel.content_sha256 == content_sha256
+    ).first()
+
+def _duplicate_upload_response(duplicate_model: IFCModel, file_path: str, filename: str,
+                               file_size: int, current_user: User, request: Request) -> dict:
+    """Drop the new copy of an already uploaded file and point the client at the existing model"""
+    safe_file_cleanup(file_path)
+    log_file_upload(
+        user_id=current_user.id,
+        filename=filename,
+        file_size=file_size,
+        success=True,
+        request=request
+    )
+    return {
+        "message": "IFC file already uploaded",
+        "model_id": duplicate_model.id,
+        "file_path": duplicate_model.file_path,
+        "duplicate": True
+    }
+
+def _assert_project_owner(db: Session, project_id: int, user_id: int) -> None:
+    """Raise 404 unless the project exists and is owned by the user, without loading it"""
+    owned = db.execute(
+        select(literal(1)).where(Project.id == project_id, Project.owner_id == user_id)
+    ).scalar()
+    if not owned:
+        raise HTTPException(status_code=404, detail="Project not found")
+
 
 def get_solutions_with_conflict(db: Session, conflict_id: int):
     """Get solutions with conflict data using optimized query"""
+    # raiseload guards against lazy loads sneaking back in as per-row queries
     return db.query(Solution).options(
-        joinedload(Solution.conflict)
+        joinedload(Solution.conflict),
+        raiseload("*")
     ).filter(Solution.conflict_id == conflict_id).order_by(Solution.confidence_score.desc()).all()
 
 
+def cached_json_response(request: Request, cache_key: str, build_payload: Callable[[], object]) -> Response:
+    """
+    Serve a JSON payload from the list response cache with ETag revalidation.
+    
+    Args:
+        request: Incoming request, checked for If-None-Match
+        cache_key: Redis key for the cached response
+        build_payload: Callable producing the payload on cache miss
+        
+    Returns:
+        304 response if the client copy is current, otherwise the JSON body
+    """
+    cached = get_cached_list_response(cache_key)
+    if cached is None:
+        body = orjson.dumps(build_payload())
+        etag = cache_list_response(cache_key, body)
+    else:
+        body, etag = cached
+    
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
 def ensure_file_exists(file_path: str) -> bool:
     """
     Verify that a file exists and is readable.
@@ -58,6 +180,34 @@ def ensure_file_exists(file_path: str) -> bool:
         return False
 
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB upload limit for security
+
+
+def link_duplicate_file(existing_path: str, file_path: str) -> bool:
+    """
+    Replace a freshly written file with a hardlink to identical existing content.
+    
+    Args:
+        existing_path: Path of the previously stored file with the same content
+        file_path: Path of the new copy to replace
+        
+    Returns:
+        True if the new path now shares storage with the existing file, False otherwise
+    """
+    try:
+        if not ensure_file_exists(existing_path):
+            return False
+        os.remove(file_path)
+        os.link(existing_path, file_path)
+        return True
+    except OSError as e:
+        logger.warning("Could not hardlink %s to %s: %s", file_path, existing_path, e)
+        if not os.path.exists(file_path):
+            raise
+        return False
+
+
 def safe_file_cleanup(file_path: str) -> bool:
     """
     Safely remove a file without raising exceptions.
@@ -74,10 +224,85 @@ def safe_file_cleanup(file_path: str) -> bool:
             return True
         return False
     except Exception as e:
-        print(f"Error during file cleanup for {file_path}: {e}")
+        logger.warning("Error during file cleanup for %s: %s", file_path, e)
         return False
 
 
+IFC_HEADER = b'ISO-10303-21;'
+IFC_MAGIC_PATTERN = re.compile(rb'\s*ISO-10303-21\s*;')
+IFC_SNIFF_SIZE = 4096  # bytes inspected before anything is written to disk
+IFC_ENTITY_PATTERN = re.compile(rb'#\d+\s*=\s*[A-Z_]+\([^)]*\);')
+SUSPICIOUS_PATTERNS = (
+    b'javascript:', b'vbscript:', b'<script',
+    b'eval(', b'exec(', b'import os', b'subprocess',
+    b'<?php', b'<%', b'__import__'
+)
+
+
+class IFCContentValidator:
+    """
+    Incremental IFC content validation for files received in chunks.
+    
+    Applies the same checks as validate_ifc_content without holding the whole
+    file in memory. Substring and entity searches run over each chunk plus an
+    overlap carried from the previous one, so matches spanning a chunk boundary
+    are not missed.
+    """
+    
+    OVERLAP_SIZE = 64 * 1024
+    TAIL_SIZE = 4096
+    MAX_LINES = 1000000
+    
+    def __init__(self):
+        self.head = b''
+        self.tail = b''
+        self.line_count = 1
+        self.has_header_section = False
+        self.has_data_section = False
+        self.has_entity = False
+        self.has_suspicious_content = False
+        self._carry = b''
+    
+    def feed(self, chunk: bytes) -> None:
+        """Process the next chunk of file content"""
+        if len(self.head) < len(IFC_HEADER):
+            self.head += chunk[:len(IFC_HEADER) - len(self.head)]
+        
+        self.line_count += chunk.count(b'\n')
+        self.tail = (self.tail + chunk)[-self.TAIL_SIZE:]
+        
+        window = self._carry + chunk
+        if not self.has_header_section:
+            self.has_header_section = b'HEADER;' in window
+        if not self.has_data_section:
+            self.has_data_section = b'DATA;' in window
+        if not self.has_entity:
+            # IFC entities should follow #ID=ENTITY_TYPE(params) format
+            self.has_entity = IFC_ENTITY_PATTERN.search(window) is not None
+        if not self.has_suspicious_content:
+            window_lower = window.lower()
+            self.has_suspicious_content = any(pattern in window_lower for pattern in SUSPICIOUS_PATTERNS)
+        
+        self._carry = window[-self.OVERLAP_SIZE:]
+    
+    def is_valid(self) -> bool:
+        """Whether all content fed so far forms a valid IFC file"""
+        return (
+            # IFC files must start with specific header format
+            self.head == IFC_HEADER
+            # Must contain HEADER and DATA sections
+            and self.has_header_section
+            and self.has_data_section
+            # Must end with ENDSEC;
+            and self.tail.rstrip().endswith(b'ENDSEC;')
+            # Reasonable line count (prevent extremely large files)
+            and self.line_count <= self.MAX_LINES
+            # No patterns that might indicate malicious content
+            and not self.has_suspicious_content
+            and self.has_entity
+        )
+
+
 def validate_ifc_content(file_content: bytes) -> bool:
     """
     Validate IFC file content for security and format compliance.
@@ -89,65 +314,44 @@ def validate_ifc_content(file_content: bytes) -> bool:
         True if file appears to be a valid IFC file, False otherwise
     """
     try:
-        # Check for basic IFC header structure
-        content_str = file_content.decode('utf-8', errors='ignore')
-        
-        # IFC files must start with specific header format
-        if not content_str.startswith('ISO-10303-21;'):
-            return False
-        
-        # Must contain HEADER section
-        if 'HEADER;' not in content_str:
-            return False
-        
-        # Must contain DATA section
-        if 'DATA;' not in content_str:
-            return False
-        
-        # Must end with ENDSEC;
-        if not content_str.rstrip().endswith('ENDSEC;'):
-            return False
-        
-        # Check for reasonable line count (prevent extremely large files)
-        lines = content_str.split('\n')
-        if len(lines) > 1000000:  # Max 1M lines
-            return False
-        
-        # Check for suspicious patterns that might indicate malicious content
-        suspicious_patterns = [
-            'javascript:', 'vbscript:', '<script',
-            'eval(', 'exec(', 'import os', 'subprocess',
-            '<?php', '<%', '__import__'
-        ]
-        
-        content_lower = content_str.lower()
-        for pattern in suspicious_patterns:
-            if pattern in content_lower:
-                return False
-        
-        # Basic validation of IFC entity structure
-        # IFC entities should follow #ID=ENTITY_TYPE(params) format
-        import re
-        entity_pattern = r'#\d+\s*=\s*[A-Z_]+\([^)]*\);'
-        if not re.search(entity_pattern, content_str):
-            return False
-        
-        return True
+        validator = IFCContentValidator()
+        validator.feed(file_content)
+        return validator.is_valid()
         
     except Exception as e:
-        print(f"Error validating IFC content: {e}")
+        logger.warning("Error validating IFC content: %s", e)
         return False
 
 
+MAX_PAGE_SIZE = 200
+
+
 @router.get("/", response_model=List[dict])
 def get_projects(
+    request: Request,
+    cursor: int = Query(0, ge=0, description="Return projects with an id greater than this"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; all projects when omitted"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Get all projects for current user"""
-    # Use eager loading to avoid N+1 queries if needed in future
-    projects = db.query(Project).filter(Project.owner_id == current_user.id).all()
-    return [{"id": p.id, "name": p.name, "status": p.status, "created_at": p.created_at} for p in projects]
+    """
+    Get projects for current user, optionally paginated by project id.
+    
+    Without limit every project is returned. With it, pages are ordered by
+    id; pass the last id received as cursor to get the next page. A page
+    shorter than limit is the last one.
+    """
+    def build_payload():
+        rows = db.execute(
+            select(Project.id, Project.name, Project.status, Project.created_at).where(
+                Project.owner_id == current_user.id,
+                Project.id > cursor
+            ).order_by(Project.id).limit(limit)
+        ).all()
+        return [dict(row._mapping) for row in rows]
+    
+    cache_key = get_list_cache_key("projects", current_user.id, page=f"{cursor}:{limit}")
+    return cached_json_response(request, cache_key, build_payload)
 
 
 @router.post("/", response_model=dict)
@@ -190,55 +394,81 @@ async def upload_ifc_model(
         if not file.filename.lower().endswith('.ifc'):
             raise FileError(ErrorCode.INVALID_FILE_TYPE, "File must be IFC format")
         
-        # Check file size (limit to 50MB for security)
-        MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
-        file_content = await file.read()
-        if len(file_content) > MAX_FILE_SIZE:
-            raise FileError(ErrorCode.FILE_TOO_LARGE, "File exceeds maximum size limit of 50MB")
-        
-        # Validate IFC file content
-        if not validate_ifc_content(file_content):
-            # Log validation failure with security details
-            log_validation_failure(
-                validation_type="ifc_file_content",
-                user_id=current_user.id,
-                input_data=file.filename,
-                error="Invalid IFC file format or content",
-                request=request
-            )
-            raise FileError(ErrorCode.INVALID_FILE_TYPE, "Invalid IFC file format or content")
-        
-        # Reset file pointer for future reads
-        await file.seek(0)
-        
         # Permission check is handled by require_file_upload dependency
         # But we still need to verify project exists
         try:
-            project = db.query(Project).filter(Project.id == project_id).first()
-            if not project:
+            project_exists = db.execute(select(literal(1)).where(Project.id == project_id)).scalar()
+            if not project_exists:
                 raise ResourceNotFoundError("Project not found")
         except Exception as e:
             raise handle_database_error("project lookup", e)
         
-        # Ensure upload directory exists
-        os.makedirs(UPLOAD_DIR, exist_ok=True)
-        os.makedirs(os.path.join(UPLOAD_DIR, "converted"), exist_ok=True)
-        
         # Generate unique filename
         file_id = str(uuid.uuid4())
         file_extension = os.path.splitext(file.filename)[1]
         unique_filename = f"{file_id}{file_extension}"
         file_path = os.path.join(UPLOAD_DIR, unique_filename)
         
-        # Save file to disk with error handling
+        # Stream the upload to disk in chunks, hashing and validating on the way,
+        # so the full file is never held in memory
+        file_size = 0
+        hasher = hashlib.sha256()
+        validator = IFCContentValidator()
+        
+        def consume_chunk(chunk: bytes) -> None:
+            hasher.update(chunk)
+            validator.feed(chunk)
+        
+        async def upload_chunks():
+            nonlocal file_size
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                # Reject non-STEP content from the first chunk, before any write
+                if file_size == 0 and not IFC_MAGIC_PATTERN.match(chunk, 0, IFC_SNIFF_SIZE):
+                    log_validation_failure(
+                        validation_type="ifc_file_content",
+                        user_id=current_user.id,
+                        input_data=file.filename,
+                        error="Not an IFC STEP file",
+                        request=request
+                    )
+                    raise FileError(ErrorCode.INVALID_FILE_TYPE, "Not an IFC STEP file")
+                file_size += len(chunk)
+                # Check file size (limit to 50MB for security) before writing more
+                if file_size > MAX_FILE_SIZE:
+                    raise FileError(ErrorCode.FILE_TOO_LARGE, "File exceeds maximum size limit of 50MB")
+                # Hashing and the content scan take milliseconds per chunk; keep them off the event loop
+                await asyncio.to_thread(consume_chunk, chunk)
+                yield chunk
+        
+        # Preallocate the expected size; the multipart parser knows the part size,
+        # otherwise Content-Length (which includes the form framing) bounds it
+        size_hint = file.size
+        if size_hint is None and request is not None:
+            content_length = request.headers.get("content-length", "")
+            size_hint = int(content_length) if content_length.isdigit() else None
+        if size_hint:
+            size_hint = min(size_hint, MAX_FILE_SIZE)
+        
         try:
-            with open(file_path, "wb") as f:
-                f.write(file_content)
+            await write_stream(file_path, upload_chunks(), size_hint=size_hint)
         except OSError as e:
             raise HTTPException(
                 status_code=500, 
                 detail=f"Failed to save file to disk: {str(e)}"
             )
+        content_sha256 = hasher.hexdigest()
+        
+        # Validate IFC file content
+        if not validator.is_valid():
+            # Log validation failure with security details
+            log_validation_failure(
+                validation_type="ifc_file_content",
+                user_id=current_user.id,
+                input_data=file.filename,
+                error="Invalid IFC file format or content",
+                request=request
+            )
+            raise FileError(ErrorCode.INVALID_FILE_TYPE, "Invalid IFC file format or content")
         
         # Verify file was written successfully
         if not ensure_file_exists(file_path):
@@ -247,22 +477,49 @@ async def upload_ifc_model(
                 detail="File was not saved successfully"
             )
         
+        # Identical content already uploaded to this project: reuse that model
+        duplicate_model = _find_project_model_by_hash(db, project_id, content_sha256)
+        if duplicate_model:
+            return _duplicate_upload_response(duplicate_model, file_path, file.filename, file_size,
+                                              current_user, request)
+        
+        # Identical content in another project: share its storage and converted files
+        source_model = db.query(IFCModel).filter(
+            IFCModel.content_sha256 == content_sha256
+        ).first()
+        if source_model and source_model.file_path:
+            await asyncio.to_thread(link_duplicate_file, source_model.file_path, file_path)
+        
+        # Generate paths for converted files
+        file_base = os.path.splitext(unique_filename)[0]
+        gltf_path = os.path.join(UPLOAD_DIR, "converted", f"{file_base}.gltf")
+        xkt_path = os.path.join(UPLOAD_DIR, "converted", f"{file_base}.xkt")
+        reused_gltf_path = source_model.gltf_path if source_model and source_model.gltf_path and ensure_file_exists(source_model.gltf_path) else None
+        reused_xkt_path = source_model.xkt_path if source_model and source_model.xkt_path and ensure_file_exists(source_model.xkt_path) else None
+        
         # Create IFC model record
         ifc_model = IFCModel(
             project_id=project_id,
             filename=file.filename,
             file_path=file_path,
+            content_sha256=content_sha256,
+            gltf_path=reused_gltf_path,
+            xkt_path=reused_xkt_path,
             status="uploaded"
         )
         db.add(ifc_model)
-        db.commit()
+        try:
+            db.commit()
+        except IntegrityError:
+            # A concurrent upload of the same content committed first
+            db.rollback()
+            duplicate_model = _find_project_model_by_hash(db, project_id, content_sha256)
+            if not duplicate_model:
+                raise
+            return _duplicate_upload_response(duplicate_model, file_path, file.filename, file_size,
+                                              current_user, request)
         db.refresh(ifc_model)
         
-        # Generate paths for converted files
-        file_base = os.path.splitext(unique_filename)[0]
-        gltf_path = os.path.join(UPLOAD_DIR, "converted", f"{file_base}.gltf")
-        xkt_path = os.path.join(UPLOAD_DIR, "converted", f"{file_base}.xkt")
-        
         # Invalidate cache for project when new model is uploaded
         invalidate_project_cache(project_id)
         
@@ -275,15 +532,19 @@ async def upload_ifc_model(
                     detail="File was removed before processing could begin"
                 )
             
-            task = process_ifc_task.delay(project_id, file_path)
-            gltf_task = convert_ifc_to_gltf.delay(file_path, gltf_path, project_id)
-            xkt_task = convert_ifc_to_xkt.delay(file_path, xkt_path, project_id)
+            # Publish all tasks over one pooled producer; conversions are skipped
+            # when identical content was already converted
+            task, gltf_task, xkt_task = enqueue_many([
+                process_ifc_task.s(project_id, file_path),
+                convert_ifc_to_gltf.s(file_path, gltf_path, project_id) if not reused_gltf_path else None,
+                convert_ifc_to_xkt.s(file_path, xkt_path, project_id) if not reused_xkt_path else None
+            ])
             
             # Log successful file upload
             log_file_upload(
                 user_id=current_user.id,
                 filename=file.filename,
-                file_size=len(file_content),
+                file_size=file_size,
                 success=True,
                 request=request
             )
@@ -291,20 +552,20 @@ async def upload_ifc_model(
             return {
                 "message": "IFC file uploaded successfully",
                 "task_id": task.id,
-                "gltf_task_id": gltf_task.id,
-                "xkt_task_id": xkt_task.id,
+                "gltf_task_id": gltf_task.id if gltf_task else None,
+                "xkt_task_id": xkt_task.id if xkt_task else None,
                 "model_id": ifc_model.id,
                 "file_path": file_path
             }
         except Exception as task_err:
             # If background tasks fail, still return success but note the issue
-            print(f"Warning: Background task start failed: {task_err}")
+            logger.warning("Background task start failed: %s", task_err)
             
             # Log successful file upload (even if background processing failed)
             log_file_upload(
                 user_id=current_user.id,
                 filename=file.filename,
-                file_size=len(file_content),
+                file_size=file_size,
                 success=True,
                 request=request
             )
@@ -326,86 +587,138 @@ async def upload_ifc_model(
         # Clean up file if it exists and return error
         if 'file_path' in locals():
             if safe_file_cleanup(file_path):
-                print(f"Cleaned up file after error: {file_path}")
+                logger.info("Cleaned up file after error: %s", file_path)
             else:
-                print(f"Failed to clean up file: {file_path}")
+                logger.warning("Failed to clean up file: %s", file_path)
         
         # Clean up database record if it was created
         if 'ifc_model' in locals():
             try:
                 db.delete(ifc_model)
                 db.commit()
-                print(f"Cleaned up database record for failed upload")
+                logger.info("Cleaned up database record for failed upload")
             except Exception as db_cleanup_err:
-                print(f"Failed to clean up database record: {db_cleanup_err}")
+                logger.warning("Failed to clean up database record: %s", db_cleanup_err)
         
         # Handle as file error
-        raise handle_file_error("IFC file upload", e, len(file_content) if 'file_content' in locals() else None)
+        raise handle_file_error("IFC file upload", e, file_size if 'file_size' in locals() else None)
+
+
+def serialize_conflict(c, elements) -> dict:
+    """Build the API representation of a conflict row and its element rows"""
+    return {
+        "id": c.id,
+        "type": c.conflict_type or "Unknown",
+        "description": c.description or "No description",
+        "severity": c.severity or "medium",
+        "elements": [
+            {
+                "id": e.id,
+                "ifc_id": e.ifc_id,
+                "type": e.element_type or "Unknown",
+                "name": e.name or "Unnamed"
+            }
+            for e in elements
+        ],
+        "status": c.status or "detected",
+        "created_at": c.created_at.isoformat() if c.created_at else None
+    }
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def iter_serialized_conflicts(db: Session, project_id: int, cursor: int = 0,
+                              limit: Optional[int] = None) -> Iterator[bytes]:
+    """Serialize each conflict of a project with orjson, skipping ones that fail"""
+    for c, elements in get_conflicts_with_elements(db, project_id, cursor=cursor, limit=limit):
+        try:
+            yield orjson.dumps(serialize_conflict(c, elements))
+        except Exception as c_err:
+            # Log conflict error but continue
+            logger.warning("Error processing conflict %s: %s", c.id, c_err)
+
+
+def start_conflict_stream(items: Iterator[bytes]) -> Iterator[bytes]:
+    """
+    Advance the serialized conflicts once so the first batch query runs now.
+    
+    Errors from that query are raised before a StreamingResponse commits to a 200.
+    """
+    first = next(items, None)
+    if first is None:
+        return iter(())
+    return itertools.chain((first,), items)
+
+
+def generate_conflicts_json(project_id: int, items: Iterator[bytes]) -> Iterator[bytes]:
+    """Stream the conflicts response as JSON, one conflict at a time"""
+    yield b'{"project_id":%d,"conflicts":[' % project_id
+    
+    separator = b""
+    try:
+        for item in items:
+            yield separator + item
+            separator = b","
+    except Exception as e:
+        # The status line is already sent; abort rather than close a partial list
+        logger.error("Error streaming conflicts for project %s: %s", project_id, e)
+        raise
+    
+    yield b"]}"
+
+
+def generate_conflicts_ndjson(project_id: int, items: Iterator[bytes]) -> Iterator[bytes]:
+    """Stream conflicts as newline-delimited JSON, one conflict per line"""
+    try:
+        for item in items:
+            yield item + b"\n"
+    except Exception as e:
+        logger.error("Error streaming conflicts for project %s: %s", project_id, e)
+        raise
 
 
 @router.get("/{project_id}/conflicts")
 def get_project_conflicts(
     project_id: int,
+    cursor: int = Query(0, ge=0, description="Return conflicts with an id greater than this"),
+    limit: Optional[int] = Query(None, ge=1, description="Page size; all conflicts when omitted"),
     current_user: User = Depends(require_project_view),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    request: Request = None
 ):
-    """Get conflicts detected in project"""
-    try:
-        # Validate project_id
-        if project_id <= 0:
-            raise HTTPException(status_code=400, detail="Invalid project ID")
-        
-        # Permission check is handled by require_project_view dependency
-        # Get real conflicts from database with error handling - using optimized query
-        conflicts = get_conflicts_with_elements(db, project_id)
-        
-        conflict_list = []
-        for c in conflicts:
-            try:
-                # Safely access elements with error handling
-                elements = []
-                for e in c.elements:
-                    try:
-                        elements.append({
-                            "id": e.id,
-                            "ifc_id": e.ifc_id,
-                            "type": e.element_type or "Unknown",
-                            "name": e.name or "Unnamed"
-                        })
-                    except Exception as e_err:
-                        # Log element error but continue
-                        print(f"Error processing element: {e_err}")
-                        continue
-                
-                conflict_list.append({
-                    "id": c.id,
-                    "type": c.conflict_type or "Unknown",
-                    "description": c.description or "No description",
-                    "severity": c.severity or "medium",
-                    "elements": elements,
-                    "status": c.status or "detected",
-                    "created_at": c.created_at.isoformat() if c.created_at else None
-                })
-            except Exception as c_err:
-                # Log conflict error but continue
-                print(f"Error processing conflict {c.id}: {c_err}")
-                continue
-        
-        return {
-            "project_id": project_id,
-            "conflicts": conflict_list
-        }
+    """
+    Get conflicts detected in project, optionally paginated by conflict id.
     
-    except HTTPException:
-        # Re-raise HTTP exceptions
-        raise
+    Clients sending Accept: application/x-ndjson get one conflict per line
+    instead of the {"project_id", "conflicts"} object.
+    """
+    # Validate project_id
+    if project_id <= 0:
+        raise HTTPException(status_code=400, detail="Invalid project ID")
+    
+    # Permission check is handled by require_project_view dependency
+    # Conflicts are streamed in batches so memory stays flat for large projects
+    try:
+        items = start_conflict_stream(
+            iter_serialized_conflicts(db, project_id, cursor=cursor, limit=limit)
+        )
     except Exception as e:
-        # Log unexpected errors
-        print(f"Unexpected error in get_project_conflicts: {e}")
+        logger.error("Unexpected error in get_project_conflicts: %s", e)
         raise HTTPException(
-            status_code=500, 
+            status_code=500,
             detail="Internal server error while retrieving conflicts"
         )
+    
+    if request is not None and NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        return StreamingResponse(
+            generate_conflicts_ndjson(project_id, items),
+            media_type=NDJSON_MEDIA_TYPE
+        )
+    return StreamingResponse(
+        generate_conflicts_json(project_id, items),
+        media_type="application/json"
+    )
 
 
 @router.get("/{project_id}/conflicts/{conflict_id}/solutions")
@@ -417,12 +730,7 @@ def get_conflict_solutions(
 ):
     """Get solutions for a specific conflict"""
     # Verify project ownership
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.owner_id == current_user.id
-    ).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+    _assert_project_owner(db, project_id, current_user.id)
     
     # Get conflict and its solutions
     conflict = db.query(Conflict).filter(
@@ -471,12 +779,7 @@ def submit_solution_feedback(
 ):
     """Submit feedback about conflict solution"""
     # Verify project ownership
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.owner_id == current_user.id
-    ).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+    _assert_project_owner(db, project_id, current_user.id)
     
     # Verify conflict exists
     conflict = db.query(Conflict).filter(
@@ -498,38 +801,32 @@ def submit_solution_feedback(
     if feedback_type == "custom_solution" and not feedback_data.get("custom_solution_description"):
         raise HTTPException(status_code=400, detail="Custom solution description required")
     
-    # Check if feedback already exists for this conflict
-    existing_feedback = db.query(SolutionFeedback).filter(
-        SolutionFeedback.conflict_id == conflict_id,
-        SolutionFeedback.user_id == current_user.id
-    ).first()
+    # Insert or update in a single statement; the unique (conflict_id, user_id)
+    # constraint makes this safe under concurrent submissions
+    stmt = upsert_insert(db, SolutionFeedback).values(
+        conflict_id=conflict_id,
+        solution_id=solution_id,
+        user_id=current_user.id,
+        feedback_type=feedback_type,
+        custom_solution_description=feedback_data.get("custom_solution_description"),
+        implementation_notes=feedback_data.get("implementation_notes"),
+        effectiveness_rating=feedback_data.get("effectiveness_rating")
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["conflict_id", "user_id"],
+        set_={
+            "feedback_type": stmt.excluded.feedback_type,
+            "solution_id": stmt.excluded.solution_id,
+            "custom_solution_description": stmt.excluded.custom_solution_description,
+            "implementation_notes": stmt.excluded.implementation_notes,
+            "effectiveness_rating": stmt.excluded.effectiveness_rating,
+            "created_at": datetime.utcnow()
+        }
+    ).returning(SolutionFeedback)
     
-    if existing_feedback:
-        # Update existing feedback
-        existing_feedback.feedback_type = feedback_type
-        existing_feedback.solution_id = solution_id
-        existing_feedback.custom_solution_description = feedback_data.get("custom_solution_description")
-        existing_feedback.implementation_notes = feedback_data.get("implementation_notes")
-        existing_feedback.effectiveness_rating = feedback_data.get("effectiveness_rating")
-        existing_feedback.created_at = datetime.utcnow()
-        
-        db.commit()
-        feedback_id = existing_feedback.id
-    else:
-        # Create new feedback
-        feedback = SolutionFeedback(
-            conflict_id=conflict_id,
-            solution_id=solution_id,
-            user_id=current_user.id,
-            feedback_type=feedback_type,
-            custom_solution_description=feedback_data.get("custom_solution_description"),
-            implementation_notes=feedback_data.get("implementation_notes"),
-            effectiveness_rating=feedback_data.get("effectiveness_rating")
-        )
-        db.add(feedback)
-        db.commit()
-        db.refresh(feedback)
-        feedback_id = feedback.id
+    feedback = db.execute(stmt, execution_options={"populate_existing": True}).scalar_one()
+    feedback_id = feedback.id
+    db.commit()
     
     # Update solution confidence score based on feedback
     if solution_id and feedback_type == "selected_suggested":
@@ -548,12 +845,7 @@ def submit_solution_feedback(
     
     # Collect data for ML training
     feedback_collector = FeedbackDataCollector(db)
-    if existing_feedback:
-        feedback_collector.collect_feedback_data(existing_feedback)
-    else:
-        feedback_obj = db.query(SolutionFeedback).filter(SolutionFeedback.id == feedback_id).first()
-        if feedback_obj:
-            feedback_collector.collect_feedback_data(feedback_obj)
+    feedback_collector.collect_feedback_data(feedback)
     
     return {
         "message": "Feedback submitted successfully",
@@ -570,12 +862,7 @@ def get_project_costs(
     db: Session = Depends(get_db)
 ):
     """Get cost parameters for a project"""
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.owner_id == current_user.id
-    ).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+    _assert_project_owner(db, project_id, current_user.id)
     
     costs = db.query(ProjectCost).filter(ProjectCost.project_id == project_id).all()
     
@@ -602,12 +889,7 @@ def create_project_cost(
     db: Session = Depends(get_db)
 ):
     """Create or update a cost parameter for a project"""
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.owner_id == current_user.id
-    ).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+    _assert_project_owner(db, project_id, current_user.id)
     
     parameter_name = cost_data.get("parameter_name")
     cost = cost_data.get("cost")
@@ -615,40 +897,29 @@ def create_project_cost(
     if not parameter_name or cost is None:
         raise HTTPException(status_code=400, detail="parameter_name and cost are required")
     
-    # Check if cost parameter already exists
-    existing_cost = db.query(ProjectCost).filter(
-        ProjectCost.project_id == project_id,
-        ProjectCost.parameter_name == parameter_name
-    ).first()
+    # Insert or update in a single statement; the unique (project_id, parameter_name)
+    # constraint makes this safe under concurrent writers
+    stmt = upsert_insert(db, ProjectCost).values(
+        project_id=project_id,
+        parameter_name=parameter_name,
+        cost=cost
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["project_id", "parameter_name"],
+        set_={"cost": stmt.excluded.cost, "updated_at": datetime.utcnow()}
+    ).returning(ProjectCost)
     
-    if existing_cost:
-        # Update existing cost
-        existing_cost.cost = cost
-        existing_cost.updated_at = datetime.utcnow()
-        db.commit()
-        db.refresh(existing_cost)
-        return {
-            "id": existing_cost.id,
-            "parameter_name": existing_cost.parameter_name,
-            "cost": existing_cost.cost,
-            "updated_at": existing_cost.updated_at
-        }
-    else:
-        # Create new cost parameter
-        new_cost = ProjectCost(
-            project_id=project_id,
-            parameter_name=parameter_name,
-            cost=cost
-        )
-        db.add(new_cost)
-        db.commit()
-        db.refresh(new_cost)
-        return {
-            "id": new_cost.id,
-            "parameter_name": new_cost.parameter_name,
-            "cost": new_cost.cost,
-            "created_at": new_cost.created_at
-        }
+    project_cost = db.execute(stmt, execution_options={"populate_existing": True}).scalar_one()
+    response = {
+        "id": project_cost.id,
+        "parameter_name": project_cost.parameter_name,
+        "cost": project_cost.cost,
+        "created_at": project_cost.created_at,
+        "updated_at": project_cost.updated_at
+    }
+    db.commit()
+    
+    return response
 
 
 @router.put("/{project_id}/costs/{cost_id}")
@@ -660,12 +931,7 @@ def update_project_cost(
     db: Session = Depends(get_db)
 ):
     """Update a specific cost parameter"""
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.owner_id == current_user.id
-    ).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+    _assert_project_owner(db, project_id, current_user.id)
     
     cost = db.query(ProjectCost).filter(
         ProjectCost.id == cost_id,
@@ -699,12 +965,7 @@ def delete_project_cost(
     db: Session = Depends(get_db)
 ):
     """Delete a cost parameter"""
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.owner_id == current_user.id
-    ).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+    _assert_project_owner(db, project_id, current_user.id)
     
     cost = db.query(ProjectCost).filter(
         ProjectCost.id == cost_id,
@@ -722,35 +983,35 @@ def delete_project_cost(
 @router.get("/{project_id}/models")
 def get_project_models(
     project_id: int,
+    request: Request,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """Get all IFC models for a project with their converted file paths"""
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.owner_id == current_user.id
-    ).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-    
-    models = db.query(IFCModel).filter(IFCModel.project_id == project_id).all()
+    def build_payload():
+        _assert_project_owner(db, project_id, current_user.id)
+        
+        models = db.query(IFCModel).filter(IFCModel.project_id == project_id).all()
+        
+        return {
+            "project_id": project_id,
+            "models": [
+                {
+                    "id": model.id,
+                    "filename": model.filename,
+                    "status": model.status,
+                    "ifc_path": model.file_path,
+                    "gltf_path": model.gltf_path,
+                    "xkt_path": model.xkt_path,
+                    "processed_at": model.processed_at,
+                    "created_at": model.created_at
+                }
+                for model in models
+            ]
+        }
     
-    return {
-        "project_id": project_id,
-        "models": [
-            {
-                "id": model.id,
-                "filename": model.filename,
-                "status": model.status,
-                "ifc_path": model.file_path,
-                "gltf_path": model.gltf_path,
-                "xkt_path": model.xkt_path,
-                "processed_at": model.processed_at,
-                "created_at": model.created_at
-            }
-            for model in models
-        ]
-    }
+    cache_key = get_list_cache_key("models", current_user.id, project_id)
+    return cached_json_response(request, cache_key, build_payload)
 
 
 @router.get("/{project_id}/models/{model_id}/gltf")
@@ -761,12 +1022,7 @@ def get_model_gltf(
     db: Session = Depends(get_db)
 ):
     """Get glTF file URL for a specific model"""
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.owner_id == current_user.id
-    ).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+    _assert_project_owner(db, project_id, current_user.id)
     
     model = db.query(IFCModel).filter(
         IFCModel.id == model_id,
@@ -780,11 +1036,38 @@ def get_model_gltf(
     
     return {
         "model_id": model_id,
-        "gltf_url": f"/static/models/{os.path.basename(model.gltf_path)}",
+        "gltf_url": f"/api/projects/{project_id}/models/{model_id}/gltf/file",
         "status": model.status
     }
 
 
+@router.get("/{project_id}/models/{model_id}/gltf/file")
+def get_model_gltf_file(
+    project_id: int,
+    model_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Serve the converted glTF file of a model to the project owner
+    
+    FileResponse hands the path to the server (ASGI pathsend) when supported,
+    so the file is sent without copying it through Python buffers.
+    """
+    _assert_project_owner(db, project_id, current_user.id)
+    
+    model = db.query(IFCModel).filter(
+        IFCModel.id == model_id,
+        IFCModel.project_id == project_id
+    ).first()
+    if not model:
+        raise HTTPException(status_code=404, detail="Model not found")
+    
+    if not model.gltf_path or not os.path.isfile(model.gltf_path):
+        raise HTTPException(status_code=404, detail="glTF file not available")
+    
+    return FileResponse(model.gltf_path, media_type="model/gltf+json")
+
+
 @router.post("/{project_id}/run-inter-model-clash-detection")
 def run_inter_model_clash_detection_endpoint(
     project_id: int,
@@ -792,12 +1075,7 @@ def run_inter_model_clash_detection_endpoint(
     db: Session = Depends(get_db)
 ):
     """Run clash detection between multiple IFC models in a project"""
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.owner_id == current_user.id
-    ).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+    _assert_project_owner(db, project_id, current_user.id)
     
     # Check if project has multiple models
     models_count = db.query(IFCModel).filter(IFCModel.project_id == project_id).count()
@@ -805,7 +1083,7 @@ def run_inter_model_clash_detection_endpoint(
         raise HTTPException(status_code=400, detail="Project must have at least 2 IFC models for inter-model clash detection")
     
     # Start the clash detection task
-    task = run_inter_model_clash_detection.delay(project_id)
+    task = enqueue(run_inter_model_clash_detection, project_id)
     
     return {
         "message": "Inter-model clash detection started",
@@ -822,12 +1100,7 @@ def predict_project_risk(
 ):
     """Get AI-powered risk prediction for a project"""
     # Verify project ownership
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.owner_id == current_user.id
-    ).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+    _assert_project_owner(db, project_id, current_user.id)
     
     # Use ML predictor to get risk assessment
     predictor = Predictor()
@@ -849,7 +1122,7 @@ def trigger_model_training(
         raise HTTPException(status_code=403, detail="Only administrators can trigger model training")
     
     # Start async model training task
-    task = train_risk_prediction_model.delay()
+    task = enqueue(train_risk_prediction_model)
     
     return {
         "message": "ML model training started",
@@ -857,28 +1130,62 @@ def trigger_model_training(
     }
 
 
+MODEL_STATUS_TTL = 5  # seconds a directory listing is reused
+ROW_ESTIMATE_THRESHOLD = 10000  # below this, an exact count is cheap enough
+
+
+@lru_cache(maxsize=32)
+def _list_dir(path: str, time_bucket: int) -> frozenset:
+    try:
+        with os.scandir(path) as entries:
+            return frozenset(entry.name for entry in entries)
+    except FileNotFoundError:
+        return frozenset()
+
+
+def list_dir_cached(path: str) -> frozenset:
+    """Names in a directory, read in one scandir pass and memoized for MODEL_STATUS_TTL seconds"""
+    return _list_dir(path, int(time.time() // MODEL_STATUS_TTL))
+
+
+def estimate_row_count(db: Session, model) -> int:
+    """
+    Row count for a table, using the planner estimate on PostgreSQL.
+    
+    Falls back to an exact COUNT(*) on other databases, and when the estimate
+    is small (or the table was never analyzed) so the exact count is cheap.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        estimate = db.execute(
+            text("SELECT reltuples::BIGINT FROM pg_class WHERE relname = :table"),
+            {"table": model.__tablename__}
+        ).scalar()
+        if estimate is not None and estimate >= ROW_ESTIMATE_THRESHOLD:
+            return estimate
+    return db.query(model).count()
+
+
 @router.get("/ml/model-status")
 def get_model_status(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """Get status of ML models"""
-    import os
-    
     model_path = "/app/models"
     risk_model_file = "risk_prediction_model.pkl"
     encoders_file = "label_encoders.pkl"
     scaler_file = "feature_scaler.pkl"
     
-    model_exists = os.path.exists(os.path.join(model_path, risk_model_file))
-    encoders_exist = os.path.exists(os.path.join(model_path, encoders_file))
-    scaler_exists = os.path.exists(os.path.join(model_path, scaler_file))
+    names = list_dir_cached(model_path)
+    model_exists = risk_model_file in names
+    encoders_exist = encoders_file in names
+    scaler_exists = scaler_file in names
     
     models_ready = model_exists and encoders_exist and scaler_exists
     
-    # Get training data count
+    # Get training data count (estimated on large tables, only used for readiness)
     from ..db.models.analytics import HistoricalConflict
-    training_data_count = db.query(HistoricalConflict).count()
+    training_data_count = estimate_row_count(db, HistoricalConflict)
     
     return {
         "models_ready": models_ready,
@@ -4,16 +4,79 @@
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
-from typing import Optional
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from typing import Optional, Set, Tuple
+from functools import lru_cache
+from cachetools import TTLCache
+import threading
+import time
 
 from ..db.database import get_db
 from ..db.models.project import User
-from ..services.rbac_service import get_rbac_service, AccessDecision
+from ..services.rbac_service import get_rbac_service
 from .auth import SECRET_KEY, ALGORITHM
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+USER_CACHE_TTL = 30  # seconds a user row is served without hitting the database
+
+# Columns kept in the cache: what authentication and the user-facing responses
+# read. Credentials and APS tokens stay in the database and load on access.
+USER_CACHE_COLUMNS = ("id", "email", "full_name", "is_active", "is_superuser")
+
+_user_cache = TTLCache(maxsize=4096, ttl=USER_CACHE_TTL)
+_user_cache_lock = threading.Lock()
+
+
+@lru_cache(maxsize=4096)
+def decode_token(token: str) -> Tuple[Optional[str], Optional[float]]:
+    """
+    Verify a JWT and return its (subject, expiry) claims.
+    
+    Claims of a given token string never change, so the signature check and
+    JSON parse run once per token. Invalid tokens raise JWTError and are not
+    cached.
+    """
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    return payload.get("sub"), payload.get("exp")
+
+
+def get_cached_user(db: Session, email: str) -> Optional[User]:
+    """Look up a user by email, reusing a recent snapshot of the row if present"""
+    with _user_cache_lock:
+        snapshot = _user_cache.get(email)
+    
+    if snapshot is None:
+        user = db.query(User).filter(User.email == email).first()
+        if user is not None:
+            snapshot = {column: getattr(user, column) for column in USER_CACHE_COLUMNS}
+            with _user_cache_lock:
+                _user_cache[email] = snapshot
+        return user
+    
+    # Attach a detached copy to this session without emitting a SELECT;
+    # columns outside the snapshot are loaded from the row if accessed
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+
+def invalidate_user_cache(email: str) -> None:
+    """Drop a cached user, e.g. on logout or when the account changes"""
+    with _user_cache_lock:
+        _user_cache.pop(email, None)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target):
+    """Any flushed change to a user row drops its cached snapshot, old email included"""
+    invalidate_user_cache(target.email)
+    for email in inspect(target).attrs.email.history.deleted:
+        invalidate_user_cache(email)
+
+
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
     """Get current authenticated user from JWT token"""
     credentials_exception = HTTPException(
@@ -23,14 +86,17 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     )
     
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
+        email, expires_at = decode_token(token)
         if email is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.email == email).first()
+    # Cached claims were verified earlier; expiry still has to be re-checked
+    if expires_at is not None and expires_at <= time.time():
+        raise credentials_exception
+    
+    user = get_cached_user(db, email)
     if user is None:
         raise credentials_exception
     
@@ -42,10 +108,40 @@ def get_current_active_user(current_user: User = Depends(get_current_user)) -> U
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
+def get_request_permissions(request: Optional[Request], rbac_service, user_id: int, project_id: int) -> Set[str]:
+    """
+    Permissions granted to a user on a project, loaded once per request
+    
+    The full permission set is fetched with a single bulk query and stored on
+    request.state.perm_cache, so further permission dependencies of the same
+    request are plain set lookups.
+    
+    Args:
+        request: Current request (None outside of a request, disables caching)
+        rbac_service: RBAC service bound to the request's session
+        user_id: ID of the user
+        project_id: ID of the project
+        
+    Returns:
+        Set of granted permission names
+    """
+    perm_cache = getattr(request.state, "perm_cache", None) if request else None
+    if perm_cache is None:
+        return rbac_service.check_permissions_bulk(user_id, project_id)
+    
+    key = (user_id, project_id)
+    if key not in perm_cache:
+        perm_cache[key] = rbac_service.check_permissions_bulk(user_id, project_id)
+    return perm_cache[key]
+
+@lru_cache(maxsize=None)
 def require_permission(permission: str):
     """
     Decorator to require specific permission for project access
     
+    Memoized so every caller gets the same checker for a permission, which
+    lets FastAPI resolve it once per request however many routes share it.
+    
     Args:
         permission: Permission name required
         
@@ -60,13 +156,13 @@ def require_permission(permission: str):
     ):
         rbac_service = get_rbac_service(db)
         
-        # Initialize RBAC system if not already done
+        # Normally done at startup; a no-op once the default roles exist
         rbac_service.initialize_rbac_system()
         
-        # Check permission
-        access_decision = rbac_service.check_permission(current_user.id, project_id, permission)
+        # Check permission against the request's cached permission set
+        granted = get_request_permissions(request, rbac_service, current_user.id, project_id)
         
-        if access_decision != AccessDecision.ALLOW:
+        if permission not in granted:
             # Audit log the denied access
             ip_address = getattr(request.client, 'host', None) if request else None
             user_agent = request.headers.get("user-agent") if request else None
@@ -111,6 +207,15 @@ class ProjectAccessChecker:
     def __init__(self, required_permissions: list):
         self.required_permissions = required_permissions
     
+    # FastAPI caches sub-dependencies by callable, so equal checkers share a result
+    def __eq__(self, other):
+        if not isinstance(other, ProjectAccessChecker):
+            return NotImplemented
+        return tuple(self.required_permissions) == tuple(other.required_permissions)
+    
+    def __hash__(self):
+        return hash(tuple(self.required_permissions))
+    
     def __call__(
         self,
         project_id: int,
@@ -120,18 +225,19 @@ class ProjectAccessChecker:
     ):
         rbac_service = get_rbac_service(db)
         
-        # Initialize RBAC system if not already done
+        # Normally done at startup; a no-op once the default roles exist
         rbac_service.initialize_rbac_system()
         
-        # Check all required permissions
-        for permission in self.required_permissions:
-            access_decision = rbac_service.check_permission(current_user.id, project_id, permission)
+        # Check all required permissions against the request's cached permission set
+        granted = get_request_permissions(request, rbac_service, current_user.id, project_id)
+        missing = [permission for permission in self.required_permissions if permission not in granted]
+        
+        if missing:
+            # Audit log the denied access
+            ip_address = getattr(request.client, 'host', None) if request else None
+            user_agent = request.headers.get("user-agent") if request else None
             
-            if access_decision != AccessDecision.ALLOW:
-                # Audit log the denied access
-                ip_address = getattr(request.client, 'host', None) if request else None
-                user_agent = request.headers.get("user-agent") if request else None
-                
+            for permission in missing:
                 rbac_service.audit_log(
                     user_id=current_user.id,
                     project_id=project_id,
@@ -142,11 +248,11 @@ class ProjectAccessChecker:
                     ip_address=ip_address,
                     user_agent=user_agent
                 )
-                
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail=f"Insufficient permissions. Required: {permission}"
-                )
+            
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Insufficient permissions. Required: {', '.join(missing)}"
+            )
         
         return current_user
 
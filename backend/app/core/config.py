@@ -1,11 +1,18 @@
 # Production use requires a separate commercial license from the Licensor.
 # For commercial licenses, please contact Tiago Sasaki at tiago@confenge.com.br.
 
-from pydantic_settings import BaseSettings
-from typing import Optional
+import json
+import os
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from typing import Dict, Optional
 
 
-class Settings(BaseSettings):
+ENV_FILE = ".env"
+
+
+@dataclass(slots=True, frozen=True)
+class Settings:
     """Application settings with environment variable support"""
     
     # Security
@@ -20,6 +27,11 @@ class Settings(BaseSettings):
     # Celery/Redis
     CELERY_BROKER_URL: str = "redis://localhost:6379/0"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/0"
+    CELERY_TASK_SERIALIZER: str = "msgpack"
+    CELERY_RESULT_SERIALIZER: str = "msgpack"
+    # json stays accepted so messages from not-yet-upgraded producers still decode
+    CELERY_ACCEPT_CONTENT: list[str] = field(default_factory=lambda: ["msgpack", "json"])
+    CELERY_TASK_COMPRESSION: Optional[str] = "zstd"
     
     # Application
     DEBUG: bool = False
@@ -27,7 +39,9 @@ class Settings(BaseSettings):
     PROJECT_NAME: str = "Vitruvius"
     
     # CORS
-    BACKEND_CORS_ORIGINS: list[str] = ["http://localhost:3000", "http://localhost:8000"]
+    BACKEND_CORS_ORIGINS: list[str] = field(
+        default_factory=lambda: ["http://localhost:3000", "http://localhost:8000"]
+    )
     
     # File uploads
     UPLOAD_DIR: str = "/app/uploads"
@@ -35,12 +49,59 @@ class Settings(BaseSettings):
     
     # External services
     REDIS_URL: Optional[str] = None
+
+
+def _read_env_file(path: str) -> Dict[str, str]:
+    """Parse KEY=VALUE lines of a dotenv file, ignoring comments and blanks"""
+    values = {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#") or "=" not in line:
+                    continue
+                key, value = line.split("=", 1)
+                key = key.strip()
+                if key.startswith("export "):
+                    key = key[len("export "):].strip()
+                values[key] = value.strip().strip("'\"")
+    except FileNotFoundError:
+        pass
+    return values
+
+
+def _coerce(raw: str, field_type):
+    """Convert a raw environment string to the declared field type"""
+    if field_type is bool:
+        return raw.strip().lower() in ("1", "true", "yes", "on")
+    if field_type is int:
+        return int(raw)
+    if field_type == list[str]:
+        raw = raw.strip()
+        if raw.startswith("["):
+            return json.loads(raw)
+        return [item.strip() for item in raw.split(",") if item.strip()]
+    return raw
+
+
+@lru_cache()
+def get_settings() -> Settings:
+    """
+    Build settings from the environment in a single pass.
+    
+    Environment variables take precedence over values from the .env file;
+    unset fields keep their defaults. Names are case sensitive.
+    """
+    env = _read_env_file(ENV_FILE)
+    env.update(os.environ)
     
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = True
+    values = {}
+    for settings_field in fields(Settings):
+        raw = env.get(settings_field.name)
+        if raw is not None:
+            values[settings_field.name] = _coerce(raw, settings_field.type)
+    return Settings(**values)
 
 
 # Global settings instance
-settings = Settings()
+settings = get_settings()
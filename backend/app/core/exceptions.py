@@ -1,14 +1,14 @@
 # Production use requires a separate commercial license from the Licensor.
 # For commercial licenses, please contact Tiago Sasaki at tiago@confenge.com.br.
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, Mapping
 from fastapi import HTTPException, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 import logging
-import traceback
-import uuid
+import orjson
 from datetime import datetime
 from enum import Enum
+from types import MappingProxyType
 
 logger = logging.getLogger(__name__)
 
@@ -59,130 +59,229 @@ class ErrorCode(Enum):
     SERVICE_UNAVAILABLE = "SERVICE_UNAVAILABLE"
 
 
+def _new_error_id() -> str:
+    """Random id correlating an error response with its log entry (32 hex chars)"""
+    import uuid  # only needed once an error is actually reported
+    return uuid.uuid4().hex
+
+
+# User-facing message per error code, built once at import
+_USER_MESSAGES: Dict[ErrorCode, str] = {
+    ErrorCode.INVALID_CREDENTIALS: "Invalid email or password",
+    ErrorCode.ACCESS_DENIED: "Access denied",
+    ErrorCode.TOKEN_EXPIRED: "Your session has expired. Please login again",
+    ErrorCode.INSUFFICIENT_PERMISSIONS: "You don't have permission to perform this action",
+    ErrorCode.VALIDATION_ERROR: "Please check your input and try again",
+    ErrorCode.INVALID_INPUT: "The provided input is invalid",
+    ErrorCode.MISSING_REQUIRED_FIELD: "Required information is missing",
+    ErrorCode.RESOURCE_NOT_FOUND: "The requested resource was not found",
+    ErrorCode.RESOURCE_ALREADY_EXISTS: "This resource already exists",
+    ErrorCode.RESOURCE_CONFLICT: "There was a conflict with the requested operation",
+    ErrorCode.FILE_NOT_FOUND: "File not found",
+    ErrorCode.FILE_TOO_LARGE: "File is too large",
+    ErrorCode.INVALID_FILE_TYPE: "Invalid file type",
+    ErrorCode.UPLOAD_FAILED: "File upload failed",
+    ErrorCode.PROCESSING_ERROR: "There was an error processing your request",
+    ErrorCode.PROCESSING_TIMEOUT: "Request processing timed out",
+    ErrorCode.PROCESSING_FAILED: "Processing failed",
+    ErrorCode.DATABASE_ERROR: "A database error occurred",
+    ErrorCode.DATABASE_CONNECTION_ERROR: "Database connection failed",
+    ErrorCode.EXTERNAL_SERVICE_ERROR: "External service error",
+    ErrorCode.EXTERNAL_SERVICE_UNAVAILABLE: "External service is unavailable",
+    ErrorCode.RATE_LIMIT_EXCEEDED: "Too many requests. Please try again later",
+    ErrorCode.INTERNAL_ERROR: "An internal error occurred",
+    ErrorCode.SERVICE_UNAVAILABLE: "Service is temporarily unavailable"
+}
+
+
+# Error code reported for HTTPExceptions raised with these status codes
+_STATUS_TO_ERROR_CODE: Dict[int, ErrorCode] = {
+    401: ErrorCode.INVALID_CREDENTIALS,
+    403: ErrorCode.ACCESS_DENIED,
+    404: ErrorCode.RESOURCE_NOT_FOUND,
+    409: ErrorCode.RESOURCE_CONFLICT,
+    422: ErrorCode.VALIDATION_ERROR,
+    429: ErrorCode.RATE_LIMIT_EXCEEDED
+}
+
+
+# Read-only stand-in returned by VitruviusException.details when none were given
+_EMPTY_DETAILS: Mapping[str, Any] = MappingProxyType({})
+
+# Response body for exceptions without details, same shape as to_dict()
+_ERROR_JSON_TEMPLATE = (
+    b'{"error_code":"%s","message":%s,"error_id":"%s","timestamp":"%s","details":null}'
+)
+
+# Pre-encoded bodies for detail-less errors carrying their code's default message
+_RESPONSE_TEMPLATES: Dict[ErrorCode, bytes] = {
+    error_code: (
+        b'{"error_code":"' + error_code.value.encode() + b'","message":' + orjson.dumps(message)
+        + b',"error_id":"%b","timestamp":"%b","details":null}'
+    )
+    for error_code, message in _USER_MESSAGES.items()
+}
+
+
 class VitruviusException(Exception):
     """Base exception class for Vitruvius application"""
     
+    # Attributes live in slots rather than the instance dict; subclasses declare empty slots
+    __slots__ = (
+        "error_code", "_error_code_value", "message", "_details",
+        "http_status", "user_message", "_error_id", "_timestamp", "__weakref__"
+    )
+    
     def __init__(self, 
                  error_code: ErrorCode,
                  message: str,
                  details: Optional[Dict[str, Any]] = None,
                  http_status: int = status.HTTP_500_INTERNAL_SERVER_ERROR,
-                 user_message: Optional[str] = None):
+                 user_message: Optional[str] = None,
+                 error_id: Optional[str] = None):
         self.error_code = error_code
+        self._error_code_value = error_code.value
         self.message = message
-        self.details = details or {}
+        self._details = details
         self.http_status = http_status
         self.user_message = user_message or self._get_user_friendly_message()
-        self.error_id = str(uuid.uuid4())
-        self.timestamp = datetime.utcnow()
+        # error_id (unless given) and timestamp are generated on first access,
+        # so exceptions that are caught internally never pay for them
+        self._error_id = error_id
+        self._timestamp = None
         
         super().__init__(self.message)
     
+    def __init_subclass__(cls, error_code: Optional[ErrorCode] = None,
+                          http_status: Optional[int] = None, **kwargs):
+        """
+        Subclasses declared with a fixed error_code and http_status get a
+        (message, details) constructor that fills the slots directly, with
+        the code's value and user message resolved once per class.
+        """
+        super().__init_subclass__(**kwargs)
+        if error_code is None:
+            return
+        
+        code_value = error_code.value
+        user_message = _USER_MESSAGES.get(error_code, "An unexpected error occurred")
+        
+        def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
+            self.error_code = error_code
+            self._error_code_value = code_value
+            self.message = message
+            self._details = details
+            self.http_status = http_status
+            self.user_message = user_message
+            self._error_id = None
+            self._timestamp = None
+            
+            Exception.__init__(self, message)
+        
+        __init__.__qualname__ = f"{cls.__qualname__}.__init__"
+        cls.__init__ = __init__
+    
+    @property
+    def error_id(self) -> str:
+        if self._error_id is None:
+            self._error_id = _new_error_id()
+        return self._error_id
+    
+    @error_id.setter
+    def error_id(self, value: str):
+        self._error_id = value
+    
+    @property
+    def details(self) -> Mapping[str, Any]:
+        # No dict is allocated for exceptions raised without details
+        return self._details if self._details is not None else _EMPTY_DETAILS
+    
+    @details.setter
+    def details(self, value: Optional[Dict[str, Any]]):
+        self._details = value
+    
+    @property
+    def timestamp(self) -> datetime:
+        if self._timestamp is None:
+            self._timestamp = datetime.utcnow()
+        return self._timestamp
+    
+    @timestamp.setter
+    def timestamp(self, value: datetime):
+        self._timestamp = value
+    
     def _get_user_friendly_message(self) -> str:
         """Get user-friendly error message"""
-        user_messages = {
-            ErrorCode.INVALID_CREDENTIALS: "Invalid email or password",
-            ErrorCode.ACCESS_DENIED: "Access denied",
-            ErrorCode.TOKEN_EXPIRED: "Your session has expired. Please login again",
-            ErrorCode.INSUFFICIENT_PERMISSIONS: "You don't have permission to perform this action",
-            ErrorCode.VALIDATION_ERROR: "Please check your input and try again",
-            ErrorCode.INVALID_INPUT: "The provided input is invalid",
-            ErrorCode.MISSING_REQUIRED_FIELD: "Required information is missing",
-            ErrorCode.RESOURCE_NOT_FOUND: "The requested resource was not found",
-            ErrorCode.RESOURCE_ALREADY_EXISTS: "This resource already exists",
-            ErrorCode.RESOURCE_CONFLICT: "There was a conflict with the requested operation",
-            ErrorCode.FILE_NOT_FOUND: "File not found",
-            ErrorCode.FILE_TOO_LARGE: "File is too large",
-            ErrorCode.INVALID_FILE_TYPE: "Invalid file type",
-            ErrorCode.UPLOAD_FAILED: "File upload failed",
-            ErrorCode.PROCESSING_ERROR: "There was an error processing your request",
-            ErrorCode.PROCESSING_TIMEOUT: "Request processing timed out",
-            ErrorCode.PROCESSING_FAILED: "Processing failed",
-            ErrorCode.DATABASE_ERROR: "A database error occurred",
-            ErrorCode.DATABASE_CONNECTION_ERROR: "Database connection failed",
-            ErrorCode.EXTERNAL_SERVICE_ERROR: "External service error",
-            ErrorCode.EXTERNAL_SERVICE_UNAVAILABLE: "External service is unavailable",
-            ErrorCode.RATE_LIMIT_EXCEEDED: "Too many requests. Please try again later",
-            ErrorCode.INTERNAL_ERROR: "An internal error occurred",
-            ErrorCode.SERVICE_UNAVAILABLE: "Service is temporarily unavailable"
-        }
-        
-        return user_messages.get(self.error_code, "An unexpected error occurred")
+        return _USER_MESSAGES.get(self.error_code, "An unexpected error occurred")
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert exception to dictionary for JSON response"""
+        """Convert exception to dictionary for JSON response (timestamp left for orjson to encode)"""
         return {
-            "error_code": self.error_code.value,
+            "error_code": self._error_code_value,
             "message": self.user_message,
             "error_id": self.error_id,
-            "timestamp": self.timestamp.isoformat(),
-            "details": self.details if self.details else None
+            "timestamp": self.timestamp,
+            "details": self._details if self._details else None
         }
+    
+    def to_json_bytes(self) -> bytes:
+        """Serialize the to_dict() payload straight to JSON bytes"""
+        if self._details:
+            return orjson.dumps(self.to_dict(), default=str)
+        # Default message for the code: only the id and timestamp vary
+        template = _RESPONSE_TEMPLATES.get(self.error_code)
+        if template is not None and self.user_message == _USER_MESSAGES[self.error_code]:
+            return template % (self.error_id.encode(), self.timestamp.isoformat().encode())
+        # Without details only the message needs escaping; the other fields
+        # are identifiers, hex ids and ISO timestamps
+        return _ERROR_JSON_TEMPLATE % (
+            self._error_code_value.encode(),
+            orjson.dumps(self.user_message),
+            self.error_id.encode(),
+            self.timestamp.isoformat().encode()
+        )
 
 
-class AuthenticationError(VitruviusException):
+class AuthenticationError(VitruviusException, error_code=ErrorCode.INVALID_CREDENTIALS,
+                          http_status=status.HTTP_401_UNAUTHORIZED):
     """Authentication related errors"""
     
-    def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
-        super().__init__(
-            error_code=ErrorCode.INVALID_CREDENTIALS,
-            message=message,
-            details=details,
-            http_status=status.HTTP_401_UNAUTHORIZED
-        )
+    __slots__ = ()
 
 
-class AuthorizationError(VitruviusException):
+class AuthorizationError(VitruviusException, error_code=ErrorCode.ACCESS_DENIED,
+                         http_status=status.HTTP_403_FORBIDDEN):
     """Authorization related errors"""
     
-    def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
-        super().__init__(
-            error_code=ErrorCode.ACCESS_DENIED,
-            message=message,
-            details=details,
-            http_status=status.HTTP_403_FORBIDDEN
-        )
+    __slots__ = ()
 
 
-class ValidationError(VitruviusException):
+class ValidationError(VitruviusException, error_code=ErrorCode.VALIDATION_ERROR,
+                      http_status=status.HTTP_400_BAD_REQUEST):
     """Validation related errors"""
     
-    def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
-        super().__init__(
-            error_code=ErrorCode.VALIDATION_ERROR,
-            message=message,
-            details=details,
-            http_status=status.HTTP_400_BAD_REQUEST
-        )
+    __slots__ = ()
 
 
-class ResourceNotFoundError(VitruviusException):
+class ResourceNotFoundError(VitruviusException, error_code=ErrorCode.RESOURCE_NOT_FOUND,
+                            http_status=status.HTTP_404_NOT_FOUND):
     """Resource not found errors"""
     
-    def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
-        super().__init__(
-            error_code=ErrorCode.RESOURCE_NOT_FOUND,
-            message=message,
-            details=details,
-            http_status=status.HTTP_404_NOT_FOUND
-        )
+    __slots__ = ()
 
 
-class ResourceConflictError(VitruviusException):
+class ResourceConflictError(VitruviusException, error_code=ErrorCode.RESOURCE_CONFLICT,
+                            http_status=status.HTTP_409_CONFLICT):
     """Resource conflict errors"""
     
-    def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
-        super().__init__(
-            error_code=ErrorCode.RESOURCE_CONFLICT,
-            message=message,
-            details=details,
-            http_status=status.HTTP_409_CONFLICT
-        )
+    __slots__ = ()
 
 
 class FileError(VitruviusException):
     """File related errors"""
     
+    __slots__ = ()
+    
     def __init__(self, error_code: ErrorCode, message: str, details: Optional[Dict[str, Any]] = None):
         http_status = status.HTTP_400_BAD_REQUEST
         if error_code == ErrorCode.FILE_TOO_LARGE:
@@ -199,6 +298,8 @@ class FileError(VitruviusException):
 class ProcessingError(VitruviusException):
     """Processing related errors"""
     
+    __slots__ = ()
+    
     def __init__(self, error_code: ErrorCode, message: str, details: Optional[Dict[str, Any]] = None):
         super().__init__(
             error_code=error_code,
@@ -208,21 +309,18 @@ class ProcessingError(VitruviusException):
         )
 
 
-class DatabaseError(VitruviusException):
+class DatabaseError(VitruviusException, error_code=ErrorCode.DATABASE_ERROR,
+                    http_status=status.HTTP_500_INTERNAL_SERVER_ERROR):
     """Database related errors"""
     
-    def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
-        super().__init__(
-            error_code=ErrorCode.DATABASE_ERROR,
-            message=message,
-            details=details,
-            http_status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    __slots__ = ()
 
 
 class ExternalServiceError(VitruviusException):
     """External service related errors"""
     
+    __slots__ = ()
+    
     def __init__(self, error_code: ErrorCode, message: str, details: Optional[Dict[str, Any]] = None):
         super().__init__(
             error_code=error_code,
@@ -232,113 +330,127 @@ class ExternalServiceError(VitruviusException):
         )
 
 
-class RateLimitError(VitruviusException):
+class RateLimitError(VitruviusException, error_code=ErrorCode.RATE_LIMIT_EXCEEDED,
+                     http_status=status.HTTP_429_TOO_MANY_REQUESTS):
     """Rate limiting errors"""
     
-    def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
-        super().__init__(
-            error_code=ErrorCode.RATE_LIMIT_EXCEEDED,
-            message=message,
-            details=details,
-            http_status=status.HTTP_429_TOO_MANY_REQUESTS
-        )
+    __slots__ = ()
+
+
+def _format_traceback() -> Optional[str]:
+    """Current traceback for structured logs, skipped when errors are not logged"""
+    if not logger.isEnabledFor(logging.ERROR):
+        return None
+    import traceback  # only needed once an error is actually logged
+    return traceback.format_exc()
 
 
 def create_error_handler():
     """Create standardized error handler for FastAPI"""
     
-    async def vitruvius_exception_handler(request: Request, exc: VitruviusException) -> JSONResponse:
+    async def vitruvius_exception_handler(request: Request, exc: VitruviusException) -> Response:
         """Handle VitruviusException"""
         
-        # Log the error with full details
-        logger.error(
-            f"VitruviusException: {exc.error_code.value} - {exc.message}",
-            extra={
-                "error_id": exc.error_id,
-                "error_code": exc.error_code.value,
-                "http_status": exc.http_status,
-                "details": exc.details,
-                "path": request.url.path,
-                "method": request.method,
-                "user_agent": request.headers.get("User-Agent"),
-                "client_ip": request.client.host
-            }
-        )
+        # Log the error with full details (skip building them if it wouldn't be emitted)
+        if logger.isEnabledFor(logging.ERROR):
+            logger.error(
+                f"VitruviusException: {exc._error_code_value} - {exc.message}",
+                extra={
+                    "error_id": exc.error_id,
+                    "error_code": exc._error_code_value,
+                    "http_status": exc.http_status,
+                    "details": exc.details,
+                    "path": request.url.path,
+                    "method": request.method,
+                    "user_agent": request.headers.get("User-Agent"),
+                    "client_ip": request.client.host
+                }
+            )
         
-        return JSONResponse(
+        return Response(
+            content=exc.to_json_bytes(),
             status_code=exc.http_status,
-            content=exc.to_dict()
+            media_type="application/json"
         )
     
-    async def http_exception_handler(request: Request, exc: HTTPException) -> JSONResponse:
+    async def http_exception_handler(request: Request, exc: HTTPException) -> Response:
         """Handle FastAPI HTTPException"""
         
         # Convert HTTPException to VitruviusException
-        error_code = ErrorCode.INTERNAL_ERROR
-        if exc.status_code == 401:
-            error_code = ErrorCode.INVALID_CREDENTIALS
-        elif exc.status_code == 403:
-            error_code = ErrorCode.ACCESS_DENIED
-        elif exc.status_code == 404:
-            error_code = ErrorCode.RESOURCE_NOT_FOUND
-        elif exc.status_code == 409:
-            error_code = ErrorCode.RESOURCE_CONFLICT
-        elif exc.status_code == 422:
-            error_code = ErrorCode.VALIDATION_ERROR
-        elif exc.status_code == 429:
-            error_code = ErrorCode.RATE_LIMIT_EXCEEDED
+        error_code = _STATUS_TO_ERROR_CODE.get(exc.status_code, ErrorCode.INTERNAL_ERROR)
+        
+        # detail is nearly always a string; structured details are kept as JSON
+        detail = exc.detail
+        message = detail if isinstance(detail, str) else orjson.dumps(detail, default=str).decode()
         
         vitruvius_exc = VitruviusException(
             error_code=error_code,
-            message=str(exc.detail),
+            message=message,
             http_status=exc.status_code
         )
         
         return await vitruvius_exception_handler(request, vitruvius_exc)
     
-    async def general_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+    async def general_exception_handler(request: Request, exc: Exception) -> Response:
         """Handle all other exceptions"""
         
-        error_id = str(uuid.uuid4())
+        error_id = _new_error_id()
         
         # Log the full exception with traceback
-        logger.error(
-            f"Unhandled exception: {type(exc).__name__} - {str(exc)}",
-            extra={
-                "error_id": error_id,
-                "exception_type": type(exc).__name__,
-                "path": request.url.path,
-                "method": request.method,
-                "user_agent": request.headers.get("User-Agent"),
-                "client_ip": request.client.host,
-                "traceback": traceback.format_exc()
-            }
-        )
+        if logger.isEnabledFor(logging.ERROR):
+            logger.error(
+                f"Unhandled exception: {type(exc).__name__} - {str(exc)}",
+                extra={
+                    "error_id": error_id,
+                    "exception_type": type(exc).__name__,
+                    "path": request.url.path,
+                    "method": request.method,
+                    "user_agent": request.headers.get("User-Agent"),
+                    "client_ip": request.client.host,
+                    "traceback": _format_traceback()
+                }
+            )
         
         # Create a safe error response
         vitruvius_exc = VitruviusException(
             error_code=ErrorCode.INTERNAL_ERROR,
             message=f"Internal server error: {error_id}",
-            http_status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            http_status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            error_id=error_id
         )
-        vitruvius_exc.error_id = error_id
         
-        return JSONResponse(
+        return Response(
+            content=vitruvius_exc.to_json_bytes(),
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content=vitruvius_exc.to_dict()
+            media_type="application/json"
         )
     
-    return {
+    handlers = {
         VitruviusException: vitruvius_exception_handler,
         HTTPException: http_exception_handler,
         Exception: general_exception_handler
     }
+    # Handler per concrete exception type, resolved through the MRO once
+    handler_cache: Dict[type, Callable] = {}
+    
+    async def dispatch_exception(request: Request, exc: Exception) -> Response:
+        """Route an exception to its handler with one dict probe per known type"""
+        exc_type = type(exc)
+        handler = handler_cache.get(exc_type)
+        if handler is None:
+            handler = next(handlers[cls] for cls in exc_type.__mro__ if cls in handlers)
+            handler_cache[exc_type] = handler
+        return await handler(request, exc)
+    
+    # Starlette routes HTTPException and Exception through different middleware,
+    # so all three types stay registered, each with the shared dispatcher
+    return {exception_type: dispatch_exception for exception_type in handlers}
 
 
 # Helper functions for common error scenarios
 def handle_database_error(operation: str, original_error: Exception) -> DatabaseError:
     """Handle database errors consistently"""
-    error_id = str(uuid.uuid4())
+    error_id = _new_error_id()
     
     logger.error(
         f"Database error during {operation}: {str(original_error)}",
@@ -346,7 +458,7 @@ def handle_database_error(operation: str, original_error: Exception) -> Database
             "error_id": error_id,
             "operation": operation,
             "exception_type": type(original_error).__name__,
-            "traceback": traceback.format_exc()
+            "traceback": _format_traceback()
         }
     )
     
@@ -358,7 +470,7 @@ def handle_database_error(operation: str, original_error: Exception) -> Database
 
 def handle_processing_error(operation: str, original_error: Exception) -> ProcessingError:
     """Handle processing errors consistently"""
-    error_id = str(uuid.uuid4())
+    error_id = _new_error_id()
     
     logger.error(
         f"Processing error during {operation}: {str(original_error)}",
@@ -366,7 +478,7 @@ def handle_processing_error(operation: str, original_error: Exception) -> Proces
             "error_id": error_id,
             "operation": operation,
             "exception_type": type(original_error).__name__,
-            "traceback": traceback.format_exc()
+            "traceback": _format_traceback()
         }
     )
     
@@ -377,9 +489,16 @@ def handle_processing_error(operation: str, original_error: Exception) -> Proces
     )
 
 
+# Error codes for exception types whose meaning doesn't need the message
+_FILE_ERROR_TYPE_MAP: Dict[type, ErrorCode] = {
+    UnicodeDecodeError: ErrorCode.INVALID_FILE_TYPE,
+    MemoryError: ErrorCode.FILE_TOO_LARGE
+}
+
+
 def handle_file_error(operation: str, original_error: Exception, file_size: Optional[int] = None) -> FileError:
     """Handle file errors consistently"""
-    error_id = str(uuid.uuid4())
+    error_id = _new_error_id()
     
     logger.error(
         f"File error during {operation}: {str(original_error)}",
@@ -388,16 +507,21 @@ def handle_file_error(operation: str, original_error: Exception, file_size: Opti
             "operation": operation,
             "file_size": file_size,
             "exception_type": type(original_error).__name__,
-            "traceback": traceback.format_exc()
+            "traceback": _format_traceback()
         }
     )
     
-    # Determine specific error code based on the error
-    error_code = ErrorCode.UPLOAD_FAILED
-    if "size" in str(original_error).lower():
-        error_code = ErrorCode.FILE_TOO_LARGE
-    elif "type" in str(original_error).lower() or "format" in str(original_error).lower():
-        error_code = ErrorCode.INVALID_FILE_TYPE
+    # Determine specific error code from the exception type, falling back to
+    # keywords in its message
+    error_code = _FILE_ERROR_TYPE_MAP.get(type(original_error))
+    if error_code is None:
+        error_text = str(original_error).lower()
+        if "size" in error_text:
+            error_code = ErrorCode.FILE_TOO_LARGE
+        elif any(keyword in error_text for keyword in ("type", "format")):
+            error_code = ErrorCode.INVALID_FILE_TYPE
+        else:
+            error_code = ErrorCode.UPLOAD_FAILED
     
     return FileError(
         error_code=error_code,
@@ -1,14 +1,46 @@
 # Production use requires a separate commercial license from the Licensor.
 # For commercial licenses, please contact Tiago Sasaki at tiago@confenge.com.br.
 
+from functools import lru_cache
 from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 from ..core.config import settings
 
 DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(DATABASE_URL)
+# INSERT executemany goes out as multi-row VALUES pages; UPDATE/DELETE
+# executemany (ORM flushes of many dirty rows) through psycopg2's execute_batch
+PSYCOPG2_EXECUTEMANY_OPTIONS = {
+    "executemany_mode": "values_plus_batch",
+    "insertmanyvalues_page_size": 1000,
+    "executemany_batch_page_size": 500,
+}
+
+def engine_args(url):
+    """URL and dialect options shared by every engine this module creates"""
+    url = make_url(url)
+    # Bare postgresql:// URLs would pick psycopg 3 on SQLAlchemy 2.1; we ship psycopg2
+    if url.drivername == "postgresql":
+        url = url.set(drivername="postgresql+psycopg2")
+    options = PSYCOPG2_EXECUTEMANY_OPTIONS if url.get_driver_name() == "psycopg2" else {}
+    return url, options
+
+@lru_cache(maxsize=1)
+def get_engine(url=DATABASE_URL):
+    """Process-wide engine, so callers share one connection pool"""
+    url, options = engine_args(url)
+    return create_engine(url, pool_pre_ping=True, pool_size=10, **options)
+
+def create_script_engine(url=DATABASE_URL):
+    """Engine for one-shot scripts: no pool, connections close as soon as they're released"""
+    url, options = engine_args(url)
+    return create_engine(url, poolclass=NullPool, **options)
+
+engine = get_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -18,4 +50,10 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def upsert_insert(db: Session, model):
+    """Dialect-specific INSERT construct supporting ON CONFLICT clauses"""
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite.insert(model)
+    return postgresql.insert(model)
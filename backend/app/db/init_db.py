@@ -6,20 +6,84 @@ Database initialization script.
 Creates all tables and indexes without requiring Alembic migrations.
 """
 
-from sqlalchemy import create_engine, text
-from .database import Base, SessionLocal, SQLALCHEMY_DATABASE_URL
-from .models import project, collaboration
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from functools import lru_cache
+from sqlalchemy import MetaData, inspect, text
+from sqlalchemy.schema import CreateIndex
+from .database import SessionLocal, get_engine
+from .models import analytics, project, collaboration, rbac  # noqa: F401 - rbac tables live in project.Base
 import logging
 
 logger = logging.getLogger(__name__)
 
-def create_database_tables():
+# Models whose tables and indexes are managed here
+MODEL_METADATA = (project.Base.metadata, collaboration.Base.metadata, analytics.Base.metadata)
+
+INDEX_BUILD_WORKERS = 4  # tables indexed concurrently on PostgreSQL
+# Per-session settings for PostgreSQL's parallel B-tree builds (PG 11+)
+MAINTENANCE_WORK_MEM = "256MB"
+MAX_PARALLEL_MAINTENANCE_WORKERS = 4
+
+# Indexes removed from the models because a composite index leading with the
+# same column, the primary key or a partial index already covers them; they
+# only cost write time and memory on databases that still have them
+OBSOLETE_INDEXES = (
+    'idx_conflict_elements_conflict', 'idx_users_is_active', 'ix_users_id', 'ix_projects_id',
+    'ix_projects_owner_id', 'ix_project_costs_id', 'ix_ifc_models_id', 'ix_ifc_models_project_id',
+    'ix_elements_id', 'ix_elements_ifc_model_id', 'ix_conflicts_id', 'ix_conflicts_project_id',
+    'ix_solutions_conflict_id', 'ix_solutions_id', 'ix_solution_feedback_id',
+    'ix_comments_conflict_id', 'ix_comments_id', 'ix_comments_is_internal', 'ix_comments_user_id',
+    'ix_comment_attachments_id', 'idx_annotations_conflict_resolved', 'ix_annotations_id',
+    'ix_annotations_is_resolved', 'ix_activity_logs_entity_type', 'ix_activity_logs_id',
+    'ix_activity_logs_project_id', 'ix_activity_logs_user_id', 'ix_activity_logs_conflict_id',
+    'ix_conflict_assignments_assigned_to_id', 'ix_conflict_assignments_id',
+    'ix_workflow_states_conflict_id', 'ix_workflow_states_id', 'idx_notifications_user_read',
+    'ix_notifications_id', 'ix_notifications_is_read', 'ix_notifications_notification_type',
+    'ix_notifications_user_id', 'ix_conflict_watches_id', 'idx_notifications_unread',
+    'idx_notifications_unread_created', 'ix_solutions_confidence_score',
+)
+
+# Append-only log tables range-partitioned by month on created_at (PostgreSQL,
+# converted by migration_partition_collaboration_logs); partitions for the
+# coming months are created ahead of time on every start, see
+# create_upcoming_partitions
+PARTITIONED_TABLES = ("activity_logs", "notifications")
+PARTITION_MONTHS_AHEAD = 3
+
+@lru_cache(maxsize=None)
+def combined_model_metadata():
+    """
+    Copy of every model table in one MetaData, for create_all
+    
+    The models are split across several declarative bases, and a foreign key
+    such as comments.user_id -> users.id only resolves against tables in its
+    own MetaData, so create_all can't run on the collaboration or analytics
+    metadata by itself.
+    """
+    combined = MetaData()
+    for metadata in MODEL_METADATA:
+        for table in metadata.tables.values():
+            copy = table.to_metadata(combined)
+            # to_metadata drops Index.ddl_if(); keep PostgreSQL-only indexes off other dialects
+            ddl_ifs = {index.name: index._ddl_if for index in table.indexes}
+            for index in copy.indexes:
+                index._ddl_if = ddl_ifs.get(index.name)
+    return combined
+
+def create_database_tables(engine):
     """Create all database tables"""
     try:
-        engine = create_engine(SQLALCHEMY_DATABASE_URL)
+        # Fast path for warm databases: one catalog query instead of create_all
+        # probing every table individually
+        existing_tables = set(inspect(engine).get_table_names())
+        if all(existing_tables.issuperset(metadata.tables) for metadata in MODEL_METADATA):
+            logger.info("Tables already present, skipping create_all")
+            return True
         
-        # Create all tables
-        Base.metadata.create_all(bind=engine)
+        # Create the missing tables with their indexes
+        combined_model_metadata().create_all(bind=engine)
         
         logger.info("✅ Database tables created successfully")
         return True
@@ -28,129 +92,246 @@ def create_database_tables():
         logger.error(f"❌ Error creating database tables: {e}")
         return False
 
-def create_indexes():
-    """Create additional indexes for performance"""
+def _execute_index_batch(conn, index_sqls):
+    """Run index DDL in one round trip, falling back to one statement at a time"""
     try:
-        engine = create_engine(SQLALCHEMY_DATABASE_URL)
+        with conn.begin_nested():
+            conn.exec_driver_sql("\n".join(index_sqls))
+        logger.debug(f"Created {len(index_sqls)} indexes in one batch")
+    except Exception as e:
+        # Some statement failed (or the driver rejects multi-statement
+        # strings): retry one by one so the valid indexes still get created
+        logger.debug(f"Batched index creation failed, retrying individually: {getattr(e, 'orig', e)}")
+        for index_sql in index_sqls:
+            try:
+                with conn.begin_nested():
+                    conn.execute(text(index_sql))
+                logger.debug(f"Created index: {index_sql.split()[5]}")
+            except Exception as e:
+                logger.warning(f"Index creation warning for {index_sql}: {e}")
+
+def _create_index_group(engine, index_sqls):
+    """Create a group of indexes in one transaction on its own connection"""
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            # Let each CREATE INDEX use parallel workers for the table scan
+            conn.exec_driver_sql(f"SET LOCAL maintenance_work_mem = '{MAINTENANCE_WORK_MEM}'")
+            conn.exec_driver_sql(f"SET LOCAL max_parallel_maintenance_workers = {MAX_PARALLEL_MAINTENANCE_WORKERS}")
+        _execute_index_batch(conn, index_sqls)
+
+def _create_indexes_concurrently(engine, indexes):
+    """
+    Build a table's indexes with CREATE INDEX CONCURRENTLY on an autocommit connection
+    
+    Concurrent builds only take a SHARE UPDATE EXCLUSIVE lock, so init can
+    run against a live database without blocking writes; they can't run
+    inside a transaction block, hence one autocommit statement per index.
+    """
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        # Session-level settings (SET LOCAL needs a transaction); reset below
+        # so the pooled connection doesn't keep them
+        conn.exec_driver_sql(f"SET maintenance_work_mem = '{MAINTENANCE_WORK_MEM}'")
+        conn.exec_driver_sql(f"SET max_parallel_maintenance_workers = {MAX_PARALLEL_MAINTENANCE_WORKERS}")
+        try:
+            for index_name, index_sql in indexes:
+                try:
+                    conn.exec_driver_sql(index_sql)
+                    logger.debug(f"Created index: {index_name}")
+                except Exception as e:
+                    logger.warning(f"Index creation warning for {index_sql}: {getattr(e, 'orig', e)}")
+                    # A failed concurrent build leaves an INVALID index behind,
+                    # which IF NOT EXISTS would then skip on every later run
+                    conn.exec_driver_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
+        finally:
+            conn.exec_driver_sql("RESET maintenance_work_mem")
+            conn.exec_driver_sql("RESET max_parallel_maintenance_workers")
+
+def model_index_statements(engine, concurrently=False):
+    """
+    (name, CREATE INDEX IF NOT EXISTS statement) for every index declared on the models, by table
+    
+    With concurrently=True the statements use CREATE INDEX CONCURRENTLY (PostgreSQL).
+    """
+    return _compile_index_statements(engine.dialect, concurrently)
+
+def _index_applies_to(index, dialect):
+    # Honour Index.ddl_if(dialect=...) the way create_all does
+    ddl_if = index._ddl_if
+    if ddl_if is None or ddl_if.dialect is None:
+        return True
+    if isinstance(ddl_if.dialect, str):
+        return ddl_if.dialect == dialect.name
+    return dialect.name in ddl_if.dialect
+
+@lru_cache(maxsize=None)
+def _compile_index_statements(dialect, concurrently):
+    # Compiled once per dialect; the models don't change at runtime
+    statements = defaultdict(list)
+    for metadata in MODEL_METADATA:
+        for table in metadata.tables.values():
+            for index in sorted(table.indexes, key=lambda index: index.name):
+                if not _index_applies_to(index, dialect):
+                    continue
+                ddl = str(CreateIndex(index, if_not_exists=True).compile(dialect=dialect))
+                if concurrently:
+                    ddl = ddl.replace(" INDEX IF NOT EXISTS ", " INDEX CONCURRENTLY IF NOT EXISTS ", 1)
+                statements[table.name].append((index.name, f"{ddl};"))
+    return statements
+
+def existing_index_names(engine):
+    """Names of the indexes present in the database, from a single catalog query where possible"""
+    with engine.connect() as conn:
+        if conn.dialect.name == "postgresql":
+            return set(conn.exec_driver_sql(
+                "SELECT indexname FROM pg_indexes WHERE schemaname = current_schema()"
+            ).scalars())
+        if conn.dialect.name == "sqlite":
+            return set(conn.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE type = 'index'"
+            ).scalars())
+    
+    inspector = inspect(engine)
+    return {
+        index["name"]
+        for table_name in inspector.get_table_names()
+        for index in inspector.get_indexes(table_name)
+    }
+
+def partitioned_table_names(engine):
+    """The PARTITIONED_TABLES that are actually partitioned in this database"""
+    if engine.dialect.name != "postgresql":
+        return set()
+    with engine.connect() as conn:
+        partitioned = set(conn.exec_driver_sql(
+            "SELECT c.relname FROM pg_partitioned_table p "
+            "JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relnamespace = current_schema()::regnamespace"
+        ).scalars())
+    return partitioned.intersection(PARTITIONED_TABLES)
+
+def _add_months(month_start, months):
+    month_index = month_start.year * 12 + month_start.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+def monthly_partition_ddl(table_name, month_start):
+    """CREATE TABLE IF NOT EXISTS statement for the partition holding month_start's month"""
+    month_end = _add_months(month_start, 1)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {table_name}_{month_start:%Y_%m} PARTITION OF {table_name} "
+        f"FOR VALUES FROM ('{month_start:%Y-%m-%d}') TO ('{month_end:%Y-%m-%d}')"
+    )
+
+def create_monthly_partition(conn, table_name, month_start):
+    """
+    Create the partition for month_start's month, moving its rows out of the default partition
+    
+    PostgreSQL refuses to create a partition while the default partition holds
+    rows in its range, so the default partition is detached, the matching rows
+    are re-inserted through the parent once the new partition exists, and the
+    default partition is attached again.
+    """
+    partition_name = f"{table_name}_{month_start:%Y_%m}"
+    if conn.exec_driver_sql("SELECT to_regclass(%(name)s)", {"name": partition_name}).scalar():
+        return
+    
+    default_name = f"{table_name}_default"
+    month_end = _add_months(month_start, 1)
+    in_month = f"created_at >= '{month_start:%Y-%m-%d}' AND created_at < '{month_end:%Y-%m-%d}'"
+    has_default = conn.exec_driver_sql("SELECT to_regclass(%(name)s)", {"name": default_name}).scalar()
+    stray_rows = has_default and conn.exec_driver_sql(
+        f"SELECT EXISTS (SELECT 1 FROM {default_name} WHERE {in_month})"
+    ).scalar()
+    if not stray_rows:
+        conn.exec_driver_sql(monthly_partition_ddl(table_name, month_start))
+        return
+    
+    conn.exec_driver_sql(f"ALTER TABLE {table_name} DETACH PARTITION {default_name}")
+    conn.exec_driver_sql(monthly_partition_ddl(table_name, month_start))
+    conn.exec_driver_sql(f"INSERT INTO {table_name} SELECT * FROM {default_name} WHERE {in_month}")
+    conn.exec_driver_sql(f"DELETE FROM {default_name} WHERE {in_month}")
+    conn.exec_driver_sql(f"ALTER TABLE {table_name} ATTACH PARTITION {default_name} DEFAULT")
+    logger.info(f"Moved {partition_name} rows out of {default_name}")
+
+def create_upcoming_partitions(engine, months_ahead=PARTITION_MONTHS_AHEAD):
+    """
+    Create this month's and the next months_ahead months' partitions of the partitioned tables
+    
+    Partitions only exist months_ahead months out from the last run, so this
+    has to run at least that often: it runs on every init_database(), and
+    deployments that go longer between starts should run
+    `python -m app.db.init_db` monthly (e.g. from cron) or hand the tables
+    to pg_partman.
+    """
+    try:
+        partitioned = partitioned_table_names(engine)
+        if not partitioned:
+            return True
         
-        with engine.connect() as conn:
-            # Create comprehensive indexes for performance optimization
-            indexes = [
-                # Primary foreign key indexes
-                "CREATE INDEX IF NOT EXISTS idx_projects_owner_id ON projects (owner_id);",
-                "CREATE INDEX IF NOT EXISTS idx_ifc_models_project_id ON ifc_models (project_id);",
-                "CREATE INDEX IF NOT EXISTS idx_elements_ifc_model_id ON elements (ifc_model_id);",
-                "CREATE INDEX IF NOT EXISTS idx_conflicts_project_id ON conflicts (project_id);",
-                "CREATE INDEX IF NOT EXISTS idx_solutions_conflict_id ON solutions (conflict_id);",
-                "CREATE INDEX IF NOT EXISTS idx_project_costs_project_id ON project_costs (project_id);",
-                "CREATE INDEX IF NOT EXISTS idx_solution_feedback_conflict_id ON solution_feedback (conflict_id);",
-                "CREATE INDEX IF NOT EXISTS idx_solution_feedback_solution_id ON solution_feedback (solution_id);",
-                "CREATE INDEX IF NOT EXISTS idx_solution_feedback_user_id ON solution_feedback (user_id);",
-                
-                # Collaboration foreign key indexes
-                "CREATE INDEX IF NOT EXISTS idx_comments_conflict_id ON comments (conflict_id);",
-                "CREATE INDEX IF NOT EXISTS idx_comments_user_id ON comments (user_id);",
-                "CREATE INDEX IF NOT EXISTS idx_comments_parent_id ON comments (parent_comment_id);",
-                "CREATE INDEX IF NOT EXISTS idx_comment_attachments_comment_id ON comment_attachments (comment_id);",
-                "CREATE INDEX IF NOT EXISTS idx_annotations_conflict_id ON annotations (conflict_id);",
-                "CREATE INDEX IF NOT EXISTS idx_annotations_element_id ON annotations (element_id);",
-                "CREATE INDEX IF NOT EXISTS idx_annotations_user_id ON annotations (user_id);",
-                "CREATE INDEX IF NOT EXISTS idx_annotations_resolved_by_id ON annotations (resolved_by_id);",
-                "CREATE INDEX IF NOT EXISTS idx_activity_logs_project_id ON activity_logs (project_id);",
-                "CREATE INDEX IF NOT EXISTS idx_activity_logs_conflict_id ON activity_logs (conflict_id);",
-                "CREATE INDEX IF NOT EXISTS idx_activity_logs_user_id ON activity_logs (user_id);",
-                "CREATE INDEX IF NOT EXISTS idx_conflict_assignments_conflict_id ON conflict_assignments (conflict_id);",
-                "CREATE INDEX IF NOT EXISTS idx_conflict_assignments_assigned_to_id ON conflict_assignments (assigned_to_id);",
-                "CREATE INDEX IF NOT EXISTS idx_conflict_assignments_assigned_by_id ON conflict_assignments (assigned_by_id);",
-                "CREATE INDEX IF NOT EXISTS idx_workflow_states_conflict_id ON workflow_states (conflict_id);",
-                "CREATE INDEX IF NOT EXISTS idx_workflow_states_changed_by_id ON workflow_states (changed_by_id);",
-                "CREATE INDEX IF NOT EXISTS idx_workflow_states_approved_by_id ON workflow_states (approved_by_id);",
-                "CREATE INDEX IF NOT EXISTS idx_notifications_user_id ON notifications (user_id);",
-                "CREATE INDEX IF NOT EXISTS idx_notifications_project_id ON notifications (project_id);",
-                "CREATE INDEX IF NOT EXISTS idx_notifications_conflict_id ON notifications (conflict_id);",
-                "CREATE INDEX IF NOT EXISTS idx_conflict_watches_conflict_id ON conflict_watches (conflict_id);",
-                "CREATE INDEX IF NOT EXISTS idx_conflict_watches_user_id ON conflict_watches (user_id);",
-                
-                # Frequently queried columns
-                "CREATE INDEX IF NOT EXISTS idx_users_email ON users (email);",
-                "CREATE INDEX IF NOT EXISTS idx_users_is_active ON users (is_active);",
-                "CREATE INDEX IF NOT EXISTS idx_projects_status ON projects (status);",
-                "CREATE INDEX IF NOT EXISTS idx_projects_sync_status ON projects (sync_status);",
-                "CREATE INDEX IF NOT EXISTS idx_ifc_models_status ON ifc_models (status);",
-                "CREATE INDEX IF NOT EXISTS idx_elements_ifc_id ON elements (ifc_id);",
-                "CREATE INDEX IF NOT EXISTS idx_elements_element_type ON elements (element_type);",
-                "CREATE INDEX IF NOT EXISTS idx_conflicts_status ON conflicts (status);",
-                "CREATE INDEX IF NOT EXISTS idx_conflicts_severity ON conflicts (severity);",
-                "CREATE INDEX IF NOT EXISTS idx_conflicts_type ON conflicts (conflict_type);",
-                "CREATE INDEX IF NOT EXISTS idx_solutions_status ON solutions (status);",
-                "CREATE INDEX IF NOT EXISTS idx_solutions_solution_type ON solutions (solution_type);",
-                "CREATE INDEX IF NOT EXISTS idx_comments_type ON comments (comment_type);",
-                "CREATE INDEX IF NOT EXISTS idx_comments_is_internal ON comments (is_internal);",
-                "CREATE INDEX IF NOT EXISTS idx_annotations_type ON annotations (annotation_type);",
-                "CREATE INDEX IF NOT EXISTS idx_annotations_is_resolved ON annotations (is_resolved);",
-                "CREATE INDEX IF NOT EXISTS idx_annotations_priority ON annotations (priority);",
-                "CREATE INDEX IF NOT EXISTS idx_activity_logs_activity_type ON activity_logs (activity_type);",
-                "CREATE INDEX IF NOT EXISTS idx_activity_logs_entity_type ON activity_logs (entity_type);",
-                "CREATE INDEX IF NOT EXISTS idx_conflict_assignments_status ON conflict_assignments (status);",
-                "CREATE INDEX IF NOT EXISTS idx_workflow_states_state ON workflow_states (state);",
-                "CREATE INDEX IF NOT EXISTS idx_notifications_type ON notifications (notification_type);",
-                "CREATE INDEX IF NOT EXISTS idx_notifications_is_read ON notifications (is_read);",
-                "CREATE INDEX IF NOT EXISTS idx_notifications_priority ON notifications (priority);",
-                
-                # Timestamp indexes for time-based queries
-                "CREATE INDEX IF NOT EXISTS idx_users_created_at ON users (created_at);",
-                "CREATE INDEX IF NOT EXISTS idx_projects_created_at ON projects (created_at);",
-                "CREATE INDEX IF NOT EXISTS idx_projects_last_sync_at ON projects (last_sync_at);",
-                "CREATE INDEX IF NOT EXISTS idx_ifc_models_created_at ON ifc_models (created_at);",
-                "CREATE INDEX IF NOT EXISTS idx_ifc_models_processed_at ON ifc_models (processed_at);",
-                "CREATE INDEX IF NOT EXISTS idx_conflicts_created_at ON conflicts (created_at);",
-                "CREATE INDEX IF NOT EXISTS idx_solutions_created_at ON solutions (created_at);",
-                "CREATE INDEX IF NOT EXISTS idx_comments_created_at ON comments (created_at);",
-                "CREATE INDEX IF NOT EXISTS idx_annotations_created_at ON annotations (created_at);",
-                "CREATE INDEX IF NOT EXISTS idx_annotations_resolved_at ON annotations (resolved_at);",
-                "CREATE INDEX IF NOT EXISTS idx_activity_logs_created_at ON activity_logs (created_at);",
-                "CREATE INDEX IF NOT EXISTS idx_conflict_assignments_due_date ON conflict_assignments (due_date);",
-                "CREATE INDEX IF NOT EXISTS idx_conflict_assignments_completed_at ON conflict_assignments (completed_at);",
-                "CREATE INDEX IF NOT EXISTS idx_workflow_states_created_at ON workflow_states (created_at);",
-                "CREATE INDEX IF NOT EXISTS idx_notifications_created_at ON notifications (created_at);",
-                "CREATE INDEX IF NOT EXISTS idx_notifications_read_at ON notifications (read_at);",
-                
-                # Composite indexes for common query patterns
-                "CREATE INDEX IF NOT EXISTS idx_conflicts_project_status ON conflicts (project_id, status);",
-                "CREATE INDEX IF NOT EXISTS idx_conflicts_project_severity ON conflicts (project_id, severity);",
-                "CREATE INDEX IF NOT EXISTS idx_conflicts_project_type ON conflicts (project_id, conflict_type);",
-                "CREATE INDEX IF NOT EXISTS idx_solutions_conflict_confidence ON solutions (conflict_id, confidence_score DESC);",
-                "CREATE INDEX IF NOT EXISTS idx_solutions_conflict_status ON solutions (conflict_id, status);",
-                "CREATE INDEX IF NOT EXISTS idx_comments_conflict_created ON comments (conflict_id, created_at DESC);",
-                "CREATE INDEX IF NOT EXISTS idx_comments_user_created ON comments (user_id, created_at DESC);",
-                "CREATE INDEX IF NOT EXISTS idx_annotations_conflict_resolved ON annotations (conflict_id, is_resolved);",
-                "CREATE INDEX IF NOT EXISTS idx_activity_logs_project_created ON activity_logs (project_id, created_at DESC);",
-                "CREATE INDEX IF NOT EXISTS idx_activity_logs_user_created ON activity_logs (user_id, created_at DESC);",
-                "CREATE INDEX IF NOT EXISTS idx_notifications_user_read ON notifications (user_id, is_read);",
-                "CREATE INDEX IF NOT EXISTS idx_notifications_user_created ON notifications (user_id, created_at DESC);",
-                "CREATE INDEX IF NOT EXISTS idx_project_costs_project_param ON project_costs (project_id, parameter_name);",
-                "CREATE INDEX IF NOT EXISTS idx_conflict_assignments_user_status ON conflict_assignments (assigned_to_id, status);",
-                "CREATE INDEX IF NOT EXISTS idx_workflow_states_conflict_created ON workflow_states (conflict_id, created_at DESC);",
-                
-                # Performance optimization indexes
-                "CREATE INDEX IF NOT EXISTS idx_elements_ifc_model_type ON elements (ifc_model_id, element_type);",
-                "CREATE INDEX IF NOT EXISTS idx_conflict_elements_conflict ON conflict_elements (conflict_id);",
-                "CREATE INDEX IF NOT EXISTS idx_conflict_elements_element ON conflict_elements (element_id);",
-                "CREATE INDEX IF NOT EXISTS idx_users_active_created ON users (is_active, created_at DESC);",
-                "CREATE INDEX IF NOT EXISTS idx_projects_owner_status ON projects (owner_id, status);",
-                "CREATE INDEX IF NOT EXISTS idx_ifc_models_project_status ON ifc_models (project_id, status);",
-                "CREATE INDEX IF NOT EXISTS idx_solutions_confidence_created ON solutions (confidence_score DESC, created_at DESC);",
-                "CREATE INDEX IF NOT EXISTS idx_activity_logs_entity_created ON activity_logs (entity_type, entity_id, created_at DESC);",
-                "CREATE INDEX IF NOT EXISTS idx_notifications_type_created ON notifications (notification_type, created_at DESC);"
-            ]
-            
-            for index_sql in indexes:
+        this_month = date.today().replace(day=1)
+        success = True
+        for table_name in sorted(partitioned):
+            for months in range(months_ahead + 1):
+                month_start = _add_months(this_month, months)
+                # One transaction per partition so one failure doesn't undo the others
                 try:
-                    conn.execute(text(index_sql))
-                    conn.commit()
-                    logger.debug(f"Created index: {index_sql.split()[5]}")
+                    with engine.begin() as conn:
+                        create_monthly_partition(conn, table_name, month_start)
                 except Exception as e:
-                    logger.warning(f"Index creation warning for {index_sql}: {e}")
+                    logger.error(f"❌ Error creating {table_name} partition for {month_start:%Y-%m}: {e}")
+                    success = False
+        
+        if success:
+            logger.info("✅ Table partitions created successfully")
+        return success
+        
+    except Exception as e:
+        logger.error(f"❌ Error creating table partitions: {e}")
+        return False
+
+def create_indexes(engine):
+    """
+    Create the model indexes missing from existing tables
+    
+    Fresh tables get their indexes from create_all; this covers indexes
+    added to the models after their table was created.
+    """
+    try:
+        concurrently = engine.dialect.name == "postgresql"
+        existing_tables = set(inspect(engine).get_table_names())
+        existing_indexes = existing_index_names(engine)
+        # Only the missing indexes; on a warm restart there's no DDL at all
+        statements = {
+            table_name: missing
+            for table_name, group in model_index_statements(engine, concurrently).items()
+            if table_name in existing_tables
+            and (missing := [(name, sql) for name, sql in group if name not in existing_indexes])
+        }
+        if not statements:
+            logger.info("Indexes already present, skipping index creation")
+            return True
+        
+        if not concurrently:
+            _create_index_group(engine, [sql for group in statements.values() for _, sql in group])
+        else:
+            # Partitioned tables don't support CREATE INDEX CONCURRENTLY; their
+            # parent index is built in one transaction across the partitions
+            partitioned = partitioned_table_names(engine)
+            plain_statements = model_index_statements(engine)
+            
+            # Index builds on different tables don't block each other, so each
+            # table's indexes are built by a separate worker and connection
+            workers = min(INDEX_BUILD_WORKERS, len(statements))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="create-index") as executor:
+                futures = []
+                for table_name, group in statements.items():
+                    if table_name in partitioned:
+                        missing_names = {name for name, _ in group}
+                        index_sqls = [sql for name, sql in plain_statements[table_name] if name in missing_names]
+                        futures.append(executor.submit(_create_index_group, engine, index_sqls))
+                    else:
+                        futures.append(executor.submit(_create_indexes_concurrently, engine, group))
+                for future in futures:
+                    future.result()
         
         logger.info("✅ Database indexes created successfully")
         return True
@@ -159,13 +340,48 @@ def create_indexes():
         logger.error(f"❌ Error creating indexes: {e}")
         return False
 
+def drop_obsolete_indexes(engine):
+    """Drop indexes that are no longer declared on the models"""
+    try:
+        obsolete_indexes = existing_index_names(engine).intersection(OBSOLETE_INDEXES)
+        if not obsolete_indexes:
+            return True
+        
+        if engine.dialect.name == "postgresql":
+            # Like the concurrent builds, avoid locking out writes on a live database
+            # (partitioned indexes can't be dropped concurrently)
+            with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                partitioned_indexes = set(conn.exec_driver_sql(
+                    "SELECT indexname FROM pg_indexes "
+                    "WHERE schemaname = current_schema() AND tablename = ANY(%(tables)s)",
+                    {"tables": sorted(partitioned_table_names(engine))}
+                ).scalars())
+                for index_name in sorted(obsolete_indexes):
+                    concurrently = "" if index_name in partitioned_indexes else " CONCURRENTLY"
+                    conn.exec_driver_sql(f"DROP INDEX{concurrently} IF EXISTS {index_name}")
+        else:
+            with engine.begin() as conn:
+                for index_name in sorted(obsolete_indexes):
+                    conn.exec_driver_sql(f"DROP INDEX IF EXISTS {index_name}")
+        
+        logger.info("✅ Obsolete indexes dropped successfully")
+        return True
+        
+    except Exception as e:
+        logger.error(f"❌ Error dropping obsolete indexes: {e}")
+        return False
+
 def init_database():
     """Initialize the complete database"""
     logger.info("🚀 Initializing database...")
     
+    # The application's engine (and connection pool) is shared by all steps
+    engine = get_engine()
     success = True
-    success &= create_database_tables()
-    success &= create_indexes()
+    success &= create_database_tables(engine)
+    success &= create_upcoming_partitions(engine)
+    success &= create_indexes(engine)
+    success &= drop_obsolete_indexes(engine)
     
     if success:
         logger.info("✅ Database initialization completed successfully")
@@ -5,112 +5,298 @@
 Migration script to convert elements_involved field to proper Many-to-Many relationship
 This script handles the migration from the old string-based approach to the new junction table
 """
-import json
-from sqlalchemy import create_engine, text
+import csv
+import io
+import logging
+from logging.handlers import MemoryHandler
+from datetime import datetime
+import orjson
+from sqlalchemy import Column, Integer, MetaData, Table, func, inspect, select, text
 from sqlalchemy.orm import sessionmaker
-from .database import get_database_url
-from .models.project import Base, Conflict, Element, IFCModel
+from .database import create_script_engine
+from .init_db import _create_index_group
+from .models.project import Base, Element, IFCModel, conflict_element_association
+
+logger = logging.getLogger(__name__)
+
+# Placeholder elements created for every IFC model (would come from the actual IFC data)
+SAMPLE_ELEMENTS = [
+    {"ifc_id": "elem_1", "element_type": "IfcWall", "name": "Wall-001"},
+    {"ifc_id": "elem_2", "element_type": "IfcWindow", "name": "Window-001"},
+    {"ifc_id": "elem_3", "element_type": "IfcDoor", "name": "Door-001"},
+    {"ifc_id": "elem_4", "element_type": "IfcBeam", "name": "Beam-001"},
+    {"ifc_id": "elem_5", "element_type": "IfcColumn", "name": "Column-001"},
+]
+
+ELEMENT_COPY_COLUMNS = (
+    "ifc_model_id", "ifc_id", "element_type", "name",
+    "description", "geometry_data", "properties", "created_at",
+)
+ELEMENT_JSON_COLUMNS = frozenset({"geometry_data", "properties"})
+
+def bulk_insert_elements(session, rows):
+    """
+    Insert element rows in bulk
+    
+    On PostgreSQL the rows are streamed with a single COPY FROM STDIN;
+    other dialects fall back to an executemany via bulk_insert_mappings.
+    """
+    if session.get_bind().dialect.name != "postgresql":
+        session.bulk_insert_mappings(Element, rows)
+        return
+    
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(
+            orjson.dumps(row[column]).decode() if column in ELEMENT_JSON_COLUMNS and row[column] is not None else row[column]
+            for column in ELEMENT_COPY_COLUMNS
+        )
+    buffer.seek(0)
+    
+    # COPY runs on the session's own DBAPI connection, inside its transaction
+    raw_conn = session.connection().connection
+    with raw_conn.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY elements ({', '.join(ELEMENT_COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+
+# Rows fetched per round trip when streaming, and conflicts flushed per batch
+MIGRATION_BATCH_SIZE = 1000
+
+# Tables bulk-loaded by the migration; their secondary indexes are rebuilt afterwards
+BULK_LOADED_TABLES = ("elements", "conflict_elements")
+
+def parse_elements_involved(value):
+    """Element ids from a legacy elements_involved value: a JSON array or a comma-separated list"""
+    if value.startswith('['):
+        # JSON array format
+        return orjson.loads(value)
+    # Comma-separated string format (int() tolerates surrounding whitespace)
+    return [int(item) for item in value.split(',') if item.strip()]
+
+def drop_secondary_indexes(engine, tables):
+    """
+    Drop the non-primary, non-unique indexes on the given PostgreSQL tables
+    
+    Returns their definitions so they can be recreated after the load.
+    """
+    with engine.begin() as conn:
+        indexes = conn.execute(text("""
+            SELECT i.schemaname, i.indexname, i.indexdef
+            FROM pg_indexes i
+            JOIN pg_index x
+              ON x.indexrelid = (quote_ident(i.schemaname) || '.' || quote_ident(i.indexname))::regclass
+            WHERE i.schemaname = current_schema()
+              AND i.tablename = ANY(:tables)
+              AND NOT x.indisprimary
+              AND NOT x.indisunique
+        """), {"tables": list(tables)}).all()
+        
+        for index in indexes:
+            conn.exec_driver_sql(f'DROP INDEX IF EXISTS "{index.schemaname}"."{index.indexname}"')
+    
+    logger.info(f"Dropped {len(indexes)} indexes before bulk load")
+    return [index.indexdef for index in indexes]
+
+def recreate_indexes(engine, index_definitions):
+    """Re-issue index definitions saved by drop_secondary_indexes"""
+    if not index_definitions:
+        return
+    statements = [
+        f"{definition.replace('CREATE INDEX ', 'CREATE INDEX IF NOT EXISTS ', 1)};"
+        for definition in index_definitions
+    ]
+    _create_index_group(engine, statements)
+    logger.info(f"Recreated {len(statements)} indexes")
+
+def conflict_counts_table():
+    """Session-local table holding how many legacy elements each conflict referenced"""
+    return Table(
+        "tmp_conflict_element_counts",
+        MetaData(),
+        Column("conflict_id", Integer, nullable=False),
+        Column("project_id", Integer, nullable=False),
+        Column("element_count", Integer, nullable=False),
+        prefixes=["TEMPORARY"],
+    )
+
+def bulk_insert_conflict_counts(session, table, rows):
+    """Load the parsed counts with one COPY on PostgreSQL, one executemany elsewhere"""
+    if not rows:
+        return
+    if session.get_bind().dialect.name != "postgresql":
+        session.execute(table.insert(), rows)
+        return
+    
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow((row["conflict_id"], row["project_id"], row["element_count"]))
+    buffer.seek(0)
+    
+    raw_conn = session.connection().connection
+    with raw_conn.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {table.name} (conflict_id, project_id, element_count) FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
 
 def migrate_conflict_elements():
     """
     Migrate existing conflict data from elements_involved string field to proper Many-to-Many relationship
     """
-    engine = create_engine(get_database_url())
+    engine = create_script_engine()
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     
     # Create new tables
     Base.metadata.create_all(bind=engine)
     
+    # Load without live secondary indexes: building them once after the load is
+    # much cheaper than maintaining them row by row
+    dropped_indexes = []
+    if engine.dialect.name == "postgresql":
+        dropped_indexes = drop_secondary_indexes(engine, BULK_LOADED_TABLES)
+    
     try:
         # Step 1: Create elements table and populate it with existing data
-        print("Creating elements table and populating with existing data...")
+        logger.info("Creating elements table and populating with existing data...")
         
         with SessionLocal() as session:
             # Get all IFC models
-            ifc_models = session.query(IFCModel).all()
+            ifc_models = (
+                session.query(IFCModel.id, IFCModel.filename)
+                .execution_options(stream_results=True)
+                .yield_per(MIGRATION_BATCH_SIZE)
+            )
             
-            for ifc_model in ifc_models:
+            # Element rows are loaded every MIGRATION_BATCH_SIZE models so the
+            # working set stays bounded while the models are streamed
+            created_at = datetime.utcnow()
+            element_rows = []
+            element_count = 0
+            for position, ifc_model in enumerate(ifc_models, 1):
                 # For now, we'll create placeholder elements
                 # In a real migration, you'd extract this from the actual IFC files
-                print(f"Processing IFC model: {ifc_model.filename}")
+                logger.debug(f"Processing IFC model: {ifc_model.filename}")
                 
-                # Create sample elements (this would be populated from actual IFC data)
-                sample_elements = [
-                    {"ifc_id": "elem_1", "element_type": "IfcWall", "name": "Wall-001"},
-                    {"ifc_id": "elem_2", "element_type": "IfcWindow", "name": "Window-001"},
-                    {"ifc_id": "elem_3", "element_type": "IfcDoor", "name": "Door-001"},
-                    {"ifc_id": "elem_4", "element_type": "IfcBeam", "name": "Beam-001"},
-                    {"ifc_id": "elem_5", "element_type": "IfcColumn", "name": "Column-001"},
-                ]
+                for elem_data in SAMPLE_ELEMENTS:
+                    element_rows.append({
+                        "ifc_model_id": ifc_model.id,
+                        "ifc_id": elem_data["ifc_id"],
+                        "element_type": elem_data["element_type"],
+                        "name": elem_data["name"],
+                        "description": f"Element {elem_data['name']} of type {elem_data['element_type']}",
+                        "geometry_data": {},  # Placeholder for geometry data
+                        "properties": {},  # Placeholder for properties
+                        "created_at": created_at,
+                    })
                 
-                for elem_data in sample_elements:
-                    element = Element(
-                        ifc_model_id=ifc_model.id,
-                        ifc_id=elem_data["ifc_id"],
-                        element_type=elem_data["element_type"],
-                        name=elem_data["name"],
-                        description=f"Element {elem_data['name']} of type {elem_data['element_type']}",
-                        geometry_data="{}",  # Placeholder for geometry data
-                        properties="{}"  # Placeholder for properties
-                    )
-                    session.add(element)
+                # No commit until the end, it would close the server-side cursor
+                if position % MIGRATION_BATCH_SIZE == 0:
+                    bulk_insert_elements(session, element_rows)
+                    element_count += len(element_rows)
+                    element_rows = []
+                    logger.info(f"Processed {position} IFC models")
+            
+            if element_rows:
+                bulk_insert_elements(session, element_rows)
+                element_count += len(element_rows)
             
             session.commit()
-            print("Elements table populated successfully.")
+            logger.info(f"Elements table populated with {element_count} elements.")
         
         # Step 2: Migrate existing conflicts
-        print("Migrating existing conflicts...")
+        logger.info("Migrating existing conflicts...")
+        
+        if "elements_involved" not in {column["name"] for column in inspect(engine).get_columns("conflicts")}:
+            logger.info("No elements_involved column, nothing to migrate.")
+            return
         
         with SessionLocal() as session:
-            # Get all conflicts with elements_involved data
-            conflicts = session.query(Conflict).all()
+            # Only parsing the legacy values happens in Python; the (conflict, count)
+            # pairs go to a temporary table and the links are built in one INSERT ... SELECT
+            connection = session.connection()
+            conflict_counts = conflict_counts_table()
+            conflict_counts.create(connection)
             
-            for conflict in conflicts:
-                if hasattr(conflict, 'elements_involved') and conflict.elements_involved:
-                    try:
-                        # Parse the elements_involved field
-                        if conflict.elements_involved.startswith('['):
-                            # JSON array format
-                            element_ids = json.loads(conflict.elements_involved)
-                        else:
-                            # Comma-separated string format
-                            element_ids = [int(x.strip()) for x in conflict.elements_involved.split(',') if x.strip()]
-                        
-                        # Map old element IDs to new Element records
-                        # For this migration, we'll create a mapping based on the order
-                        elements = session.query(Element).filter(
-                            Element.ifc_model_id.in_(
-                                session.query(IFCModel.id).filter(IFCModel.project_id == conflict.project_id)
-                            )
-                        ).all()
-                        
-                        # Associate elements with the conflict
-                        for i, old_id in enumerate(element_ids):
-                            if i < len(elements):
-                                conflict.elements.append(elements[i])
-                        
-                        print(f"Migrated conflict {conflict.id} with {len(element_ids)} elements")
-                        
-                    except (json.JSONDecodeError, ValueError) as e:
-                        print(f"Error parsing elements_involved for conflict {conflict.id}: {e}")
-                        continue
+            # The legacy column isn't mapped on Conflict: read the raw tuples in one
+            # streamed query instead of going through ORM attributes row by row
+            rows = session.execute(
+                text(
+                    "SELECT id, project_id, elements_involved FROM conflicts "
+                    "WHERE elements_involved IS NOT NULL AND elements_involved <> ''"
+                ).execution_options(stream_results=True, yield_per=MIGRATION_BATCH_SIZE)
+            )
             
+            counts = []
+            for position, (conflict_id, project_id, elements_involved) in enumerate(rows, 1):
+                try:
+                    element_ids = parse_elements_involved(elements_involved)
+                except ValueError as e:
+                    logger.warning(f"Error parsing elements_involved for conflict {conflict_id}: {e}")
+                    continue
+                
+                counts.append({"conflict_id": conflict_id, "project_id": project_id, "element_count": len(element_ids)})
+                
+                # Loaded batch by batch so the working set stays bounded; no commit
+                # until the end, it would close the server-side cursor
+                if len(counts) >= MIGRATION_BATCH_SIZE:
+                    bulk_insert_conflict_counts(session, conflict_counts, counts)
+                    counts = []
+                if position % MIGRATION_BATCH_SIZE == 0:
+                    logger.info(f"Parsed {position} conflicts")
+            
+            bulk_insert_conflict_counts(session, conflict_counts, counts)
+            
+            # Old element ids map to the project's elements in creation order: a
+            # conflict that involved n elements gets the project's first n
+            project_elements = (
+                select(
+                    IFCModel.project_id,
+                    Element.id.label("element_id"),
+                    func.row_number().over(partition_by=IFCModel.project_id, order_by=Element.id).label("position"),
+                )
+                .join(Element, Element.ifc_model_id == IFCModel.id)
+                .subquery()
+            )
+            links = select(conflict_counts.c.conflict_id, project_elements.c.element_id).join(
+                project_elements,
+                (project_elements.c.project_id == conflict_counts.c.project_id)
+                & (project_elements.c.position <= conflict_counts.c.element_count)
+            )
+            result = session.execute(
+                conflict_element_association.insert().from_select(["conflict_id", "element_id"], links)
+            )
+            conflict_counts.drop(connection)
             session.commit()
-            print("Conflicts migration completed successfully.")
+            logger.info(f"Conflicts migration completed successfully ({result.rowcount} links).")
         
         # Step 3: Drop the old elements_involved column
-        print("Dropping old elements_involved column...")
+        logger.info("Dropping old elements_involved column...")
         with SessionLocal() as session:
             session.execute(text("ALTER TABLE conflicts DROP COLUMN elements_involved"))
             session.commit()
-            print("Old column dropped successfully.")
+            logger.info("Old column dropped successfully.")
         
-        print("Migration completed successfully!")
+        logger.info("Migration completed successfully!")
         
     except Exception as e:
-        print(f"Migration failed: {e}")
+        logger.error(f"Migration failed: {e}")
         # Rollback will be handled automatically by the context manager
         raise
+    finally:
+        # Restore the indexes even if the load failed
+        recreate_indexes(engine, dropped_indexes)
+
+def configure_logging():
+    """Console logging for command-line runs, written out in batches rather than per record"""
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+    buffered = MemoryHandler(MIGRATION_BATCH_SIZE, flushLevel=logging.ERROR, target=console)
+    logging.basicConfig(level=logging.INFO, handlers=[buffered])
 
 if __name__ == "__main__":
+    configure_logging()
     migrate_conflict_elements()
\ No newline at end of file
@@ -1,13 +1,20 @@
 # Production use requires a separate commercial license from the Licensor.
 # For commercial licenses, please contact Tiago Sasaki at tiago@confenge.com.br.
 
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, ForeignKey, Enum, Index, func
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
-from datetime import datetime
 
 Base = declarative_base()
 
+# Closed value sets stored as native enums (4 bytes per value on PostgreSQL)
+# instead of variable-length strings; reads and writes still use the strings
+DISCIPLINES = ("Structural", "Architectural", "MEP", "Circulation", "Other")
+SEVERITIES = ("low", "medium", "high", "critical")
+
+discipline_enum = Enum(*DISCIPLINES, name="discipline")
+severity_enum = Enum(*SEVERITIES, name="conflict_severity")
+
 class HistoricalConflict(Base):
     __tablename__ = "historical_conflicts"
     
@@ -15,15 +22,24 @@ class HistoricalConflict(Base):
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
     element_category_1 = Column(String(100), nullable=False)
     element_category_2 = Column(String(100), nullable=False)
-    discipline_1 = Column(String(100), nullable=False)
-    discipline_2 = Column(String(100), nullable=False)
+    discipline_1 = Column(discipline_enum, nullable=False)
+    discipline_2 = Column(discipline_enum, nullable=False)
     conflict_type = Column(String(100), nullable=False)
-    severity = Column(String(20), nullable=False)
+    severity = Column(severity_enum, nullable=False)
     resolution_cost = Column(Float)  # Cost in currency units
     resolution_time_days = Column(Integer)  # Time in days
     solution_feedback_positive = Column(Boolean, nullable=False)  # True if positive feedback
     effectiveness_rating = Column(Integer)  # 1-5 rating from feedback
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)  # Stamped by the database
+    
+    __table_args__ = (
+        # Rows are append-only in created_at order, so a BRIN index is enough for
+        # time-range scans at a fraction of a B-tree's size
+        Index('idx_hist_created_at_brin', 'created_at', postgresql_using='brin'),
+        # Analytics aggregations filter by project and group by these columns
+        Index('idx_hist_grouping', 'project_id', 'discipline_1', 'discipline_2'),
+        Index('idx_hist_project_type', 'project_id', 'conflict_type'),
+    )
     
     # Relationships
     project = relationship("Project")
\ No newline at end of file
@@ -1,112 +1,268 @@
 # Production use requires a separate commercial license from the Licensor.
 # For commercial licenses, please contact Tiago Sasaki at tiago@confenge.com.br.
 
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Boolean, Float, Index
+from sqlalchemy import Column, Integer, BigInteger, SmallInteger, String, DateTime, Text, ForeignKey, Boolean, Float, Index, JSON, Enum, func, insert, literal, literal_column, select, text
+from sqlalchemy.dialects.postgresql import INET, JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
-from datetime import datetime
+from sqlalchemy.orm.attributes import set_committed_value
+from ..database import upsert_insert
 
 Base = declarative_base()
 
+# Loading relationships: many-to-one relationships that list endpoints would
+# otherwise fetch row by row are lazy="raise"/"raise_on_sql", so callers opt
+# in explicitly, e.g.
+#     db.query(ActivityLog).options(selectinload(ActivityLog.user), raiseload("*"))
+# raiseload("*") on list queries turns any unplanned lazy load (an N+1) into
+# an error instead of one extra SELECT per row.
+
+# JSON documents: binary JSONB on PostgreSQL (parsed once on write, indexable),
+# plain JSON elsewhere; None is stored as SQL NULL
+json_document = JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql")
+
+# Client addresses: native INET on PostgreSQL (fixed width, subnet operators),
+# text wide enough for IPv6 elsewhere
+ip_address_type = String(45).with_variant(INET(), "postgresql")
+
+# 64-bit surrogate keys for the high-write log tables; SQLite only
+# autoincrements an INTEGER PRIMARY KEY
+big_id_type = BigInteger().with_variant(Integer, "sqlite")
+small_id_type = SmallInteger().with_variant(Integer, "sqlite")
+
+# Closed value sets stored as native enums (4 bytes per value on PostgreSQL);
+# open-ended labels such as activity_type and notification_type stay strings
+COMMENT_TYPES = ("general", "solution_review", "annotation", "status_update")
+ANNOTATION_TYPES = ("highlight", "point", "area", "measurement")
+PRIORITIES = ("low", "medium", "high", "critical")
+ASSIGNMENT_ROLES = ("resolver", "reviewer", "observer")
+ASSIGNMENT_STATUSES = ("assigned", "accepted", "working", "completed", "declined")
+WORKFLOW_STATES = ("open", "investigating", "solution_proposed", "under_review", "resolved", "closed")
+NOTIFICATION_PRIORITIES = ("low", "normal", "high", "urgent")
+
+comment_type_enum = Enum(*COMMENT_TYPES, name="comment_type")
+annotation_type_enum = Enum(*ANNOTATION_TYPES, name="annotation_type")
+priority_enum = Enum(*PRIORITIES, name="collaboration_priority")
+assignment_role_enum = Enum(*ASSIGNMENT_ROLES, name="assignment_role")
+assignment_status_enum = Enum(*ASSIGNMENT_STATUSES, name="assignment_status")
+workflow_state_enum = Enum(*WORKFLOW_STATES, name="workflow_state")
+notification_priority_enum = Enum(*NOTIFICATION_PRIORITIES, name="notification_priority")
+
+
+def english_tsvector(column):
+    """Full-text document for a text column; the GIN indexes and the search filters must build the same expression"""
+    return func.to_tsvector(literal_column("'english'"), func.coalesce(column, literal_column("''")))
+
+
+def english_tsquery(search):
+    return func.plainto_tsquery(literal_column("'english'"), search)
+
 
 class Comment(Base):
     __tablename__ = "comments"
     
-    id = Column(Integer, primary_key=True, index=True)
-    conflict_id = Column(Integer, ForeignKey("conflicts.id"), nullable=False, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    id = Column(Integer, primary_key=True)
+    conflict_id = Column(Integer, ForeignKey("conflicts.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     parent_comment_id = Column(Integer, ForeignKey("comments.id"), nullable=True, index=True)  # For replies
     message = Column(Text, nullable=False)
-    comment_type = Column(String(50), default="general", index=True)  # 'general', 'solution_review', 'annotation', 'status_update'
-    is_internal = Column(Boolean, default=False, index=True)  # Internal comments for team only
+    comment_type = Column(comment_type_enum, default="general", index=True)
+    is_internal = Column(Boolean, default=False)  # Internal comments for team only
     is_edited = Column(Boolean, default=False)
     edited_at = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        Index('idx_comments_created_at', 'created_at'),
+        Index('idx_comments_conflict_created', 'conflict_id', created_at.desc()),
+        # Full-text search over messages (PostgreSQL only)
+        Index('idx_comments_message_fts', english_tsvector(message), postgresql_using='gin').ddl_if(dialect='postgresql'),
+        Index('idx_comments_user_created', 'user_id', created_at.desc()),
+    )
     
     # Relationships
-    conflict = relationship("Conflict", back_populates="comments")
-    user = relationship("User", back_populates="comments")
+    conflict = relationship("Conflict", back_populates="comments", lazy="raise")
+    user = relationship("User", back_populates="comments", lazy="raise")
     parent_comment = relationship("Comment", remote_side=[id], back_populates="replies")
-    replies = relationship("Comment", back_populates="parent_comment")
-    attachments = relationship("CommentAttachment", back_populates="comment")
+    # Threads are loaded whole through load_thread(); per-node loads are refused
+    replies = relationship("Comment", back_populates="parent_comment", lazy="raise_on_sql")
+    attachments = relationship("CommentAttachment", back_populates="comment", lazy="selectin")
+    
+    @classmethod
+    def matching(cls, search):
+        """Filter for comments whose message matches a plain-text search (uses idx_comments_message_fts)"""
+        return english_tsvector(cls.message).op("@@")(english_tsquery(search))
+    
+    @classmethod
+    def load_thread(cls, session, root_conflict_id):
+        """Load every comment thread of a conflict in one recursive query.
+        
+        Returns the top-level comments with ``replies`` and ``parent_comment``
+        populated for the whole subtree, so walking the tree issues no SQL.
+        """
+        thread = text("""
+            WITH RECURSIVE t AS (
+                SELECT * FROM comments
+                WHERE conflict_id = :conflict_id AND parent_comment_id IS NULL
+                UNION ALL
+                SELECT c.* FROM comments c JOIN t ON c.parent_comment_id = t.id
+            )
+            SELECT * FROM t ORDER BY created_at, id
+        """).bindparams(conflict_id=root_conflict_id)
+        comments = session.execute(
+            select(cls).from_statement(thread)
+        ).scalars().all()
+        
+        by_id = {comment.id: comment for comment in comments}
+        children = {comment_id: [] for comment_id in by_id}
+        roots = []
+        for comment in comments:
+            parent = by_id.get(comment.parent_comment_id)
+            if parent is None:
+                roots.append(comment)
+            else:
+                children[parent.id].append(comment)
+            set_committed_value(comment, "parent_comment", parent)
+        for comment_id, replies in children.items():
+            set_committed_value(by_id[comment_id], "replies", replies)
+        return roots
 
 
 class CommentAttachment(Base):
     __tablename__ = "comment_attachments"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     comment_id = Column(Integer, ForeignKey("comments.id"), nullable=False, index=True)
     filename = Column(String(255), nullable=False)
     file_path = Column(String(500), nullable=False)
-    file_size = Column(Integer)  # Size in bytes
-    file_type = Column(String(100))  # MIME type
-    created_at = Column(DateTime, default=datetime.utcnow)
+    file_size = Column(BigInteger)  # Size in bytes; IFC models can exceed 2 GiB
+    file_type_id = Column(SmallInteger, ForeignKey("mime_types.id"), nullable=True)
+    created_at = Column(DateTime, server_default=func.now())
     
     # Relationships
     comment = relationship("Comment", back_populates="attachments")
+    mime_type = relationship("MimeType", lazy="joined")
+    
+    @property
+    def file_type(self):
+        """MIME type name"""
+        return self.mime_type.name if self.mime_type else None
+
+
+class MimeType(Base):
+    """Lookup of attachment MIME types, so each attachment row stores a 2-byte id instead of the string"""
+    __tablename__ = "mime_types"
+    
+    id = Column(small_id_type, primary_key=True)
+    name = Column(String(100), nullable=False, unique=True)
+    
+    @classmethod
+    def id_for(cls, session, name):
+        """Id of the MIME type called name, registering it on first use"""
+        if not name:
+            return None
+        
+        mime_type_id = session.execute(select(cls.id).where(cls.name == name)).scalar()
+        if mime_type_id is None:
+            session.execute(
+                upsert_insert(session, cls).values(name=name).on_conflict_do_nothing(index_elements=["name"])
+            )
+            mime_type_id = session.execute(select(cls.id).where(cls.name == name)).scalar_one()
+        return mime_type_id
 
 
 class Annotation(Base):
     __tablename__ = "annotations"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     conflict_id = Column(Integer, ForeignKey("conflicts.id"), nullable=False, index=True)
     element_id = Column(Integer, ForeignKey("elements.id"), nullable=True, index=True)  # Optional element reference
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    annotation_type = Column(String(50), nullable=False, index=True)  # 'highlight', 'point', 'area', 'measurement'
+    annotation_type = Column(annotation_type_enum, nullable=False, index=True)
     title = Column(String(255))
     description = Column(Text)
     
     # 3D/2D positioning data (stored as JSON strings)
-    position_data = Column(Text)  # JSON: coordinates, camera position, etc.
-    visual_data = Column(Text)   # JSON: colors, styles, measurements
+    position_data = Column(json_document)  # coordinates, camera position, etc.
+    visual_data = Column(json_document)   # colors, styles, measurements
     
     # Status and visibility
-    is_resolved = Column(Boolean, default=False, index=True)
+    is_resolved = Column(Boolean, default=False)
     is_visible = Column(Boolean, default=True)
-    priority = Column(String(20), default="medium", index=True)  # 'low', 'medium', 'high', 'critical'
+    priority = Column(priority_enum, default="medium", index=True)
     
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     resolved_at = Column(DateTime, nullable=True)
     resolved_by_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
     
+    __table_args__ = (
+        Index('idx_annotations_created_at', 'created_at'),
+        Index('idx_annotations_resolved_at', 'resolved_at'),
+        # Open annotations only: resolved rows never enter the index
+        Index('idx_annotations_unresolved', 'conflict_id', postgresql_where=text('is_resolved = false')),
+        # Full-text search over descriptions (PostgreSQL only)
+        Index('idx_annotations_description_fts', english_tsvector(description), postgresql_using='gin').ddl_if(dialect='postgresql'),
+    )
+    
     # Relationships
     conflict = relationship("Conflict", back_populates="annotations")
-    element = relationship("Element", back_populates="annotations")
-    user = relationship("User", foreign_keys=[user_id])
-    resolved_by = relationship("User", foreign_keys=[resolved_by_id])
+    element = relationship("Element", back_populates="annotations", lazy="raise_on_sql")
+    user = relationship("User", foreign_keys=[user_id], lazy="raise")
+    resolved_by = relationship("User", foreign_keys=[resolved_by_id], lazy="raise")
+    
+    @classmethod
+    def matching(cls, search):
+        """Filter for annotations whose description matches a plain-text search (uses idx_annotations_description_fts)"""
+        return english_tsvector(cls.description).op("@@")(english_tsquery(search))
 
 
 class ActivityLog(Base):
     __tablename__ = "activity_logs"
     
-    id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False, index=True)
-    conflict_id = Column(Integer, ForeignKey("conflicts.id"), nullable=True, index=True)  # Optional conflict reference
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    id = Column(big_id_type, primary_key=True)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    conflict_id = Column(Integer, ForeignKey("conflicts.id"), nullable=True)  # Optional conflict reference
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     
     # Activity details
     activity_type = Column(String(100), nullable=False, index=True)  # 'conflict_created', 'solution_added', 'comment_posted', etc.
     action = Column(String(50), nullable=False)  # 'create', 'update', 'delete', 'resolve', 'assign'
-    entity_type = Column(String(50), nullable=False, index=True)  # 'conflict', 'solution', 'comment', 'annotation'
+    entity_type = Column(String(50), nullable=False)  # 'conflict', 'solution', 'comment', 'annotation'
     entity_id = Column(Integer, nullable=True)  # ID of the affected entity
     
     # Change tracking
-    old_values = Column(Text, nullable=True)  # JSON string of old values
-    new_values = Column(Text, nullable=True)  # JSON string of new values
+    old_values = Column(json_document, nullable=True)  # Old values
+    new_values = Column(json_document, nullable=True)  # New values
     
     # Context and metadata
     description = Column(Text)  # Human-readable description
-    metadata = Column(Text)  # Additional context as JSON
-    ip_address = Column(String(45))  # IPv4/IPv6 address
+    # Attribute renamed: 'metadata' is reserved for the declarative MetaData
+    context_metadata = Column('metadata', json_document)  # Additional context
+    ip_address = Column(ip_address_type)  # IPv4/IPv6 address
     user_agent = Column(String(500))  # Browser/client information
     
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
+    
+    __table_args__ = (
+        # On PostgreSQL the table is range-partitioned by month on created_at
+        # (see init_db.PARTITIONED_TABLES); these indexes are per partition
+        Index('idx_activity_logs_created_at', 'created_at'),
+        Index('idx_activity_logs_project_created', 'project_id', created_at.desc()),
+        Index('idx_activity_logs_conflict_created', 'conflict_id', created_at.desc()),
+        Index('idx_activity_logs_user_created', 'user_id', created_at.desc()),
+        Index('idx_activity_logs_entity_created', 'entity_type', 'entity_id', created_at.desc()),
+        # Containment (@>) lookups on the context; jsonb_path_ops keeps the GIN index small
+        Index('idx_activity_logs_metadata_gin', context_metadata, postgresql_using='gin',
+              postgresql_ops={'metadata': 'jsonb_path_ops'}),
+        # Subnet containment (<<=) lookups, e.g. all events from 10.0.0.0/8
+        Index('idx_activity_logs_ip_gist', 'ip_address', postgresql_using='gist',
+              postgresql_ops={'ip_address': 'inet_ops'}),
+    )
     
     # Relationships
-    project = relationship("Project", back_populates="activity_logs")
+    project = relationship("Project", back_populates="activity_logs", lazy="raise_on_sql")
     conflict = relationship("Conflict", back_populates="activity_logs")
     user = relationship("User", back_populates="activity_logs")
 
@@ -114,24 +270,33 @@ class ActivityLog(Base):
 class ConflictAssignment(Base):
     __tablename__ = "conflict_assignments"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     conflict_id = Column(Integer, ForeignKey("conflicts.id"), nullable=False, index=True)
-    assigned_to_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    assigned_to_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     assigned_by_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    role = Column(String(50), default="resolver")  # 'resolver', 'reviewer', 'observer'
+    role = Column(assignment_role_enum, default="resolver")
     
     # Assignment details
     due_date = Column(DateTime, nullable=True)
-    priority = Column(String(20), default="medium")
+    priority = Column(priority_enum, default="medium")
     notes = Column(Text)
     
     # Status tracking
-    status = Column(String(50), default="assigned", index=True)  # 'assigned', 'accepted', 'working', 'completed', 'declined'
+    status = Column(assignment_status_enum, default="assigned", index=True)
     accepted_at = Column(DateTime, nullable=True)
     completed_at = Column(DateTime, nullable=True)
     
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        Index('idx_conflict_assignments_due_date', 'due_date'),
+        Index('idx_conflict_assignments_completed_at', 'completed_at'),
+        Index('idx_conflict_assignments_user_status', 'assigned_to_id', 'status'),
+        # Open assignments only: completed and declined ones are never listed as work
+        Index('idx_conflict_assignments_open', 'assigned_to_id',
+              postgresql_where=text("status IN ('assigned', 'accepted', 'working')")),
+    )
     
     # Relationships
     conflict = relationship("Conflict", back_populates="assignments")
@@ -142,10 +307,10 @@ class ConflictAssignment(Base):
 class WorkflowState(Base):
     __tablename__ = "workflow_states"
     
-    id = Column(Integer, primary_key=True, index=True)
-    conflict_id = Column(Integer, ForeignKey("conflicts.id"), nullable=False, index=True)
-    state = Column(String(50), nullable=False, index=True)  # 'open', 'investigating', 'solution_proposed', 'under_review', 'resolved', 'closed'
-    previous_state = Column(String(50), nullable=True)
+    id = Column(Integer, primary_key=True)
+    conflict_id = Column(Integer, ForeignKey("conflicts.id"), nullable=False)
+    state = Column(workflow_state_enum, nullable=False, index=True)
+    previous_state = Column(workflow_state_enum, nullable=True)
     
     # State change details
     changed_by_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -153,12 +318,17 @@ class WorkflowState(Base):
     automatic = Column(Boolean, default=False)  # Whether change was automatic
     
     # Workflow metadata
-    workflow_data = Column(Text)  # JSON data for workflow-specific information
+    workflow_data = Column(json_document)  # Workflow-specific information
     approval_required = Column(Boolean, default=False)
     approved_by_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
     approved_at = Column(DateTime, nullable=True)
     
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
+    
+    __table_args__ = (
+        Index('idx_workflow_states_created_at', 'created_at'),
+        Index('idx_workflow_states_conflict_created', 'conflict_id', created_at.desc()),
+    )
     
     # Relationships
     conflict = relationship("Conflict", back_populates="workflow_states")
@@ -169,20 +339,20 @@ class WorkflowState(Base):
 class Notification(Base):
     __tablename__ = "notifications"
     
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    id = Column(big_id_type, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=True, index=True)
     conflict_id = Column(Integer, ForeignKey("conflicts.id"), nullable=True, index=True)
     
     # Notification details
-    notification_type = Column(String(100), nullable=False, index=True)  # 'comment_reply', 'conflict_assigned', 'solution_added', etc.
+    notification_type = Column(String(100), nullable=False)  # 'comment_reply', 'conflict_assigned', 'solution_added', etc.
     title = Column(String(255), nullable=False)
     message = Column(Text, nullable=False)
     
     # Status and metadata
-    is_read = Column(Boolean, default=False, index=True)
+    is_read = Column(Boolean, default=False)
     is_email_sent = Column(Boolean, default=False)
-    priority = Column(String(20), default="normal", index=True)  # 'low', 'normal', 'high', 'urgent'
+    priority = Column(notification_priority_enum, default="normal", index=True)
     
     # Related entity information
     related_entity_type = Column(String(50))  # 'comment', 'solution', 'annotation'
@@ -192,19 +362,66 @@ class Notification(Base):
     action_url = Column(String(500))  # URL to take action
     action_text = Column(String(100))  # Text for action button
     
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
     read_at = Column(DateTime, nullable=True)
     
+    __table_args__ = (
+        # Range-partitioned by month on PostgreSQL, like activity_logs
+        Index('idx_notifications_created_at', 'created_at'),
+        Index('idx_notifications_read_at', 'read_at'),
+        # Unread notifications only, for the unread list and badge count; the
+        # INCLUDE columns let the inbox page be served by an index-only scan (PG 11+)
+        Index('idx_notifications_unread_inbox', 'user_id', created_at.desc(),
+              postgresql_include=['id', 'title', 'priority'], postgresql_where=text('is_read = false')),
+        Index('idx_notifications_user_created', 'user_id', created_at.desc()),
+        Index('idx_notifications_type_created', 'notification_type', created_at.desc()),
+    )
+    
     # Relationships
-    user = relationship("User", back_populates="notifications")
-    project = relationship("Project")
-    conflict = relationship("Conflict")
+    user = relationship("User", back_populates="notifications", lazy="raise")
+    project = relationship("Project", lazy="raise")
+    conflict = relationship("Conflict", lazy="raise")
+    
+    @classmethod
+    def fanout_for_conflict(cls, session, conflict_id, notification_type, title, message,
+                            watch_column, exclude_user_id=None, **fields):
+        """
+        Notify every watcher of a conflict who opted in through watch_column
+        (e.g. "watch_solutions") and still accepts in-app notifications
+        
+        Runs as a single INSERT ... SELECT over conflict_watches, so the watcher
+        list never leaves the database. Extra keyword arguments (project_id,
+        priority, action_url, ...) are copied onto every row. The caller commits.
+        Returns the number of notifications created.
+        """
+        values = {
+            "conflict_id": conflict_id,
+            "notification_type": notification_type,
+            "title": title,
+            "message": message,
+            **fields,
+        }
+        watchers = select(
+            ConflictWatch.user_id,
+            *(literal(value, cls.__table__.c[name].type) for name, value in values.items())
+        ).where(
+            ConflictWatch.conflict_id == conflict_id,
+            getattr(ConflictWatch, watch_column) == True,
+            ConflictWatch.in_app_notifications == True
+        )
+        if exclude_user_id is not None:
+            watchers = watchers.where(ConflictWatch.user_id != exclude_user_id)
+        
+        result = session.execute(
+            insert(cls).from_select(["user_id", *values], watchers)
+        )
+        return result.rowcount
 
 
 class ConflictWatch(Base):
     __tablename__ = "conflict_watches"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     conflict_id = Column(Integer, ForeignKey("conflicts.id"), nullable=False, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     
@@ -218,8 +435,8 @@ class ConflictWatch(Base):
     email_notifications = Column(Boolean, default=True)
     in_app_notifications = Column(Boolean, default=True)
     
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
     # Relationships
     conflict = relationship("Conflict", back_populates="watchers")
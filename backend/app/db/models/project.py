@@ -1,25 +1,32 @@
 # Production use requires a separate commercial license from the Licensor.
 # For commercial licenses, please contact Tiago Sasaki at tiago@confenge.com.br.
 
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Table, Boolean, Float, Index
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Table, Boolean, Float, Index, JSON, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
 Base = declarative_base()
 
+# JSON documents: binary JSONB on PostgreSQL (parsed once on write, indexable),
+# plain JSON elsewhere; None is stored as SQL NULL
+json_document = JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql")
+
 # Junction table for Many-to-Many relationship between Conflicts and Elements
 conflict_element_association = Table(
     'conflict_elements',
     Base.metadata,
     Column('conflict_id', Integer, ForeignKey('conflicts.id'), primary_key=True),
-    Column('element_id', Integer, ForeignKey('elements.id'), primary_key=True)
+    Column('element_id', Integer, ForeignKey('elements.id'), primary_key=True),
+    # Covers element -> conflicts lookups with an index-only scan
+    Index('idx_conflict_elements_element_conflict', 'element_id', 'conflict_id')
 )
 
 class User(Base):
     __tablename__ = "users"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     email = Column(String(255), unique=True, index=True, nullable=False)
     hashed_password = Column(String(255), nullable=False)
     full_name = Column(String(255))
@@ -33,6 +40,11 @@ class User(Base):
     aps_refresh_token = Column(Text)  # APS refresh token
     aps_token_expires_at = Column(DateTime)  # Token expiration time
     
+    __table_args__ = (
+        Index('idx_users_created_at', 'created_at'),
+        Index('idx_users_active_created', 'is_active', created_at.desc()),
+    )
+    
     # Relationships
     projects = relationship("Project", back_populates="owner")
     solution_feedback = relationship("SolutionFeedback", back_populates="user")
@@ -41,8 +53,8 @@ class User(Base):
 class Project(Base):
     __tablename__ = "projects"
     
-    id = Column(Integer, primary_key=True, index=True)
-    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    id = Column(Integer, primary_key=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     name = Column(String(255), nullable=False)
     description = Column(Text)
     status = Column(String(50), default="created", index=True)
@@ -54,14 +66,14 @@ class Project(Base):
     planning_tool_api_key = Column(String(500))  # Encrypted API key for planning tool
     planning_tool_project_id = Column(String(255))  # Project ID in external planning tool
     planning_tool_base_url = Column(String(500))  # Base URL for planning tool API
-    planning_tool_config = Column(Text)  # JSON string for additional configuration
+    planning_tool_config = Column(json_document)  # Additional configuration
     
     # Budget Tool Integration Fields  
     budget_tool_connected = Column(String(50))  # 'sage', 'quickbooks', 'oracle_cost', etc.
     budget_tool_api_key = Column(String(500))  # Encrypted API key for budget tool
     budget_tool_project_id = Column(String(255))  # Project ID in external budget tool
     budget_tool_base_url = Column(String(500))  # Base URL for budget tool API
-    budget_tool_config = Column(Text)  # JSON string for additional configuration
+    budget_tool_config = Column(json_document)  # Additional configuration
     
     # Integration Status
     last_sync_at = Column(DateTime)  # Last successful synchronization
@@ -71,6 +83,14 @@ class Project(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        Index('idx_projects_sync_status', 'sync_status'),
+        Index('idx_projects_created_at', 'created_at'),
+        Index('idx_projects_last_sync_at', 'last_sync_at'),
+        Index('idx_projects_owner_id_id', 'owner_id', 'id'),
+        Index('idx_projects_owner_status', 'owner_id', 'status'),
+    )
+    
     # Relationships
     owner = relationship("User", back_populates="projects")
     ifc_models = relationship("IFCModel", back_populates="project")
@@ -80,29 +100,41 @@ class Project(Base):
 class ProjectCost(Base):
     __tablename__ = "project_costs"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False, index=True)
     parameter_name = Column(String(100), index=True, nullable=False)  # Ex: "CONCRETE_M3", "STEEL_KG", "LABOR_HOUR"
     cost = Column(Float, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # One value per parameter per project, also the conflict target for upserts
+    __table_args__ = (UniqueConstraint('project_id', 'parameter_name', name='uq_project_cost_parameter'),)
+    
     # Relationships
     project = relationship("Project", back_populates="costs")
 
 class IFCModel(Base):
     __tablename__ = "ifc_models"
     
-    id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False, index=True)
+    id = Column(Integer, primary_key=True)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
     filename = Column(String(255), nullable=False)
     file_path = Column(String(500))
     gltf_path = Column(String(500))  # Path to converted glTF file
     xkt_path = Column(String(500))   # Path to converted XKT file
+    content_sha256 = Column(String(64), index=True)  # SHA-256 of the uploaded IFC content
     status = Column(String(50), default="uploaded", index=True)
     processed_at = Column(DateTime)
     created_at = Column(DateTime, default=datetime.utcnow)
     
+    # The same content is only stored once per project
+    __table_args__ = (
+        UniqueConstraint('project_id', 'content_sha256', name='uq_ifc_model_project_content'),
+        Index('idx_ifc_models_created_at', 'created_at'),
+        Index('idx_ifc_models_processed_at', 'processed_at'),
+        Index('idx_ifc_models_project_status', 'project_id', 'status'),
+    )
+    
     # Relationships
     project = relationship("Project", back_populates="ifc_models")
     elements = relationship("Element", back_populates="ifc_model")
@@ -110,16 +142,23 @@ class IFCModel(Base):
 class Element(Base):
     __tablename__ = "elements"
     
-    id = Column(Integer, primary_key=True, index=True)
-    ifc_model_id = Column(Integer, ForeignKey("ifc_models.id"), nullable=False, index=True)
+    id = Column(Integer, primary_key=True)
+    ifc_model_id = Column(Integer, ForeignKey("ifc_models.id"), nullable=False)
     ifc_id = Column(String(255), nullable=False, index=True)  # Original IFC element ID
     element_type = Column(String(100), nullable=False, index=True)  # IfcWall, IfcWindow, etc.
     name = Column(String(255))
     description = Column(Text)
-    geometry_data = Column(Text)  # JSON string for geometry information
-    properties = Column(Text)  # JSON string for element properties
+    geometry_data = Column(json_document)  # Geometry information
+    properties = Column(json_document)  # Element property sets
     created_at = Column(DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        Index('idx_elements_ifc_model_type', 'ifc_model_id', 'element_type'),
+        # Containment (@>) lookups on property sets; jsonb_path_ops keeps the GIN index small
+        Index('idx_elements_properties_gin', properties, postgresql_using='gin',
+              postgresql_ops={'properties': 'jsonb_path_ops'}).ddl_if(dialect='postgresql'),
+    )
+    
     # Relationships
     ifc_model = relationship("IFCModel", back_populates="elements")
     conflicts = relationship("Conflict", secondary=conflict_element_association, back_populates="elements")
@@ -127,8 +166,8 @@ class Element(Base):
 class Conflict(Base):
     __tablename__ = "conflicts"
     
-    id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False, index=True)
+    id = Column(Integer, primary_key=True)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
     conflict_type = Column(String(100), nullable=False, index=True)
     severity = Column(String(20), default="medium", index=True)
     description = Column(Text)
@@ -136,6 +175,14 @@ class Conflict(Base):
     aps_issue_id = Column(String(255))  # APS issue ID for integration
     created_at = Column(DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        Index('idx_conflicts_created_at', 'created_at'),
+        Index('idx_conflicts_project_status', 'project_id', 'status'),
+        Index('idx_conflicts_project_severity', 'project_id', 'severity'),
+        Index('idx_conflicts_project_type', 'project_id', 'conflict_type'),
+        Index('idx_conflicts_project_id_id', 'project_id', 'id'),
+    )
+    
     # Relationships
     project = relationship("Project", back_populates="conflicts")
     solutions = relationship("Solution", back_populates="conflict")
@@ -145,16 +192,23 @@ class Conflict(Base):
 class Solution(Base):
     __tablename__ = "solutions"
     
-    id = Column(Integer, primary_key=True, index=True)
-    conflict_id = Column(Integer, ForeignKey("conflicts.id"), nullable=False, index=True)
+    id = Column(Integer, primary_key=True)
+    conflict_id = Column(Integer, ForeignKey("conflicts.id"), nullable=False)
     solution_type = Column(String(100), nullable=False, index=True)
     description = Column(Text)
     estimated_cost = Column(Integer)  # in cents
     estimated_time = Column(Integer)  # in days
-    confidence_score = Column(Float, default=1.0, nullable=False, index=True)  # 0.0-1.0
+    confidence_score = Column(Float, default=1.0, nullable=False)  # 0.0-1.0
     status = Column(String(50), default="proposed", index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        Index('idx_solutions_created_at', 'created_at'),
+        Index('idx_solutions_conflict_confidence', 'conflict_id', confidence_score.desc()),
+        Index('idx_solutions_conflict_status', 'conflict_id', 'status'),
+        Index('idx_solutions_confidence_created', confidence_score.desc(), created_at.desc()),
+    )
+    
     # Relationships
     conflict = relationship("Conflict", back_populates="solutions")
     feedback = relationship("SolutionFeedback", back_populates="solution", uselist=False)
@@ -162,7 +216,7 @@ class Solution(Base):
 class SolutionFeedback(Base):
     __tablename__ = "solution_feedback"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     conflict_id = Column(Integer, ForeignKey("conflicts.id"), nullable=False, index=True)
     solution_id = Column(Integer, ForeignKey("solutions.id"), nullable=True, index=True)  # Null if custom solution
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -172,6 +226,9 @@ class SolutionFeedback(Base):
     effectiveness_rating = Column(Integer)  # 1-5 rating of solution effectiveness
     created_at = Column(DateTime, default=datetime.utcnow)
     
+    # One feedback entry per user and conflict; resubmitting updates it
+    __table_args__ = (UniqueConstraint('conflict_id', 'user_id', name='uq_solution_feedback_conflict_user'),)
+    
     # Relationships
     conflict = relationship("Conflict")
     solution = relationship("Solution", back_populates="feedback")
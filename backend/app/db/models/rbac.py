@@ -1,13 +1,15 @@
 # Production use requires a separate commercial license from the Licensor.
 # For commercial licenses, please contact Tiago Sasaki at tiago@confenge.com.br.
 
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Enum, UniqueConstraint
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Enum, UniqueConstraint, select
+from sqlalchemy.orm import relationship, Session
 from datetime import datetime
 import enum
+from types import MappingProxyType
 
-Base = declarative_base()
+from ..database import upsert_insert
+# Shares the project models' registry: roles and audit rows reference User and Project
+from .project import Base
 
 
 class ProjectRole(enum.Enum):
@@ -149,45 +151,78 @@ class AuditLog(Base):
     project = relationship("Project")
 
 
+# Shared and read-only: built once at import rather than on every call
+_DEFAULT_ROLE_PERMISSIONS = MappingProxyType({
+    "owner": (
+        "view_project", "edit_project", "delete_project", "manage_project_users",
+        "view_conflicts", "edit_conflicts", "delete_conflicts",
+        "view_solutions", "edit_solutions", "delete_solutions",
+        "upload_files", "delete_files",
+        "view_comments", "add_comments", "edit_comments", "delete_comments"
+    ),
+    "admin": (
+        "view_project", "edit_project", "manage_project_users",
+        "view_conflicts", "edit_conflicts", "delete_conflicts",
+        "view_solutions", "edit_solutions", "delete_solutions",
+        "upload_files", "delete_files",
+        "view_comments", "add_comments", "edit_comments", "delete_comments"
+    ),
+    "collaborator": (
+        "view_project",
+        "view_conflicts", "edit_conflicts",
+        "view_solutions", "edit_solutions",
+        "upload_files",
+        "view_comments", "add_comments", "edit_comments"
+    ),
+    "viewer": (
+        "view_project",
+        "view_conflicts",
+        "view_solutions",
+        "view_comments"
+    ),
+})
+
+
 def create_default_roles_and_permissions():
     """
-    Create default roles and permissions for the system
+    Default permission and role rows for the system, as plain dicts ready
+    for a bulk INSERT
     """
     # Default permissions
     permissions = [
         # Project permissions
-        Permission(name="view_project", description="View project details", permission_type=PermissionType.READ, resource_type="project"),
-        Permission(name="edit_project", description="Edit project settings", permission_type=PermissionType.WRITE, resource_type="project"),
-        Permission(name="delete_project", description="Delete project", permission_type=PermissionType.DELETE, resource_type="project"),
-        Permission(name="manage_project_users", description="Manage project users", permission_type=PermissionType.MANAGE_USERS, resource_type="project"),
+        dict(name="view_project", description="View project details", permission_type=PermissionType.READ, resource_type="project"),
+        dict(name="edit_project", description="Edit project settings", permission_type=PermissionType.WRITE, resource_type="project"),
+        dict(name="delete_project", description="Delete project", permission_type=PermissionType.DELETE, resource_type="project"),
+        dict(name="manage_project_users", description="Manage project users", permission_type=PermissionType.MANAGE_USERS, resource_type="project"),
         
         # Conflict permissions
-        Permission(name="view_conflicts", description="View conflicts", permission_type=PermissionType.READ, resource_type="conflict"),
-        Permission(name="edit_conflicts", description="Edit conflict details", permission_type=PermissionType.WRITE, resource_type="conflict"),
-        Permission(name="delete_conflicts", description="Delete conflicts", permission_type=PermissionType.DELETE, resource_type="conflict"),
+        dict(name="view_conflicts", description="View conflicts", permission_type=PermissionType.READ, resource_type="conflict"),
+        dict(name="edit_conflicts", description="Edit conflict details", permission_type=PermissionType.WRITE, resource_type="conflict"),
+        dict(name="delete_conflicts", description="Delete conflicts", permission_type=PermissionType.DELETE, resource_type="conflict"),
         
         # Solution permissions
-        Permission(name="view_solutions", description="View solutions", permission_type=PermissionType.READ, resource_type="solution"),
-        Permission(name="edit_solutions", description="Edit solutions", permission_type=PermissionType.WRITE, resource_type="solution"),
-        Permission(name="delete_solutions", description="Delete solutions", permission_type=PermissionType.DELETE, resource_type="solution"),
+        dict(name="view_solutions", description="View solutions", permission_type=PermissionType.READ, resource_type="solution"),
+        dict(name="edit_solutions", description="Edit solutions", permission_type=PermissionType.WRITE, resource_type="solution"),
+        dict(name="delete_solutions", description="Delete solutions", permission_type=PermissionType.DELETE, resource_type="solution"),
         
         # File permissions
-        Permission(name="upload_files", description="Upload IFC files", permission_type=PermissionType.WRITE, resource_type="file"),
-        Permission(name="delete_files", description="Delete files", permission_type=PermissionType.DELETE, resource_type="file"),
+        dict(name="upload_files", description="Upload IFC files", permission_type=PermissionType.WRITE, resource_type="file"),
+        dict(name="delete_files", description="Delete files", permission_type=PermissionType.DELETE, resource_type="file"),
         
         # Comment permissions
-        Permission(name="view_comments", description="View comments", permission_type=PermissionType.READ, resource_type="comment"),
-        Permission(name="add_comments", description="Add comments", permission_type=PermissionType.WRITE, resource_type="comment"),
-        Permission(name="edit_comments", description="Edit comments", permission_type=PermissionType.WRITE, resource_type="comment"),
-        Permission(name="delete_comments", description="Delete comments", permission_type=PermissionType.DELETE, resource_type="comment"),
+        dict(name="view_comments", description="View comments", permission_type=PermissionType.READ, resource_type="comment"),
+        dict(name="add_comments", description="Add comments", permission_type=PermissionType.WRITE, resource_type="comment"),
+        dict(name="edit_comments", description="Edit comments", permission_type=PermissionType.WRITE, resource_type="comment"),
+        dict(name="delete_comments", description="Delete comments", permission_type=PermissionType.DELETE, resource_type="comment"),
     ]
     
     # Default roles
     roles = [
-        Role(name="owner", description="Project owner with full permissions", is_system_role=True),
-        Role(name="admin", description="Project administrator with most permissions", is_system_role=True),
-        Role(name="collaborator", description="Project collaborator with edit permissions", is_system_role=True),
-        Role(name="viewer", description="Project viewer with read-only permissions", is_system_role=True),
+        dict(name="owner", description="Project owner with full permissions", is_system_role=True),
+        dict(name="admin", description="Project administrator with most permissions", is_system_role=True),
+        dict(name="collaborator", description="Project collaborator with edit permissions", is_system_role=True),
+        dict(name="viewer", description="Project viewer with read-only permissions", is_system_role=True),
     ]
     
     return permissions, roles
@@ -195,34 +230,36 @@ def create_default_roles_and_permissions():
 
 def get_default_role_permissions():
     """
-    Define default permissions for each role
-    """
-    return {
-        "owner": [
-            "view_project", "edit_project", "delete_project", "manage_project_users",
-            "view_conflicts", "edit_conflicts", "delete_conflicts",
-            "view_solutions", "edit_solutions", "delete_solutions",
-            "upload_files", "delete_files",
-            "view_comments", "add_comments", "edit_comments", "delete_comments"
-        ],
-        "admin": [
-            "view_project", "edit_project", "manage_project_users",
-            "view_conflicts", "edit_conflicts", "delete_conflicts",
-            "view_solutions", "edit_solutions", "delete_solutions",
-            "upload_files", "delete_files",
-            "view_comments", "add_comments", "edit_comments", "delete_comments"
-        ],
-        "collaborator": [
-            "view_project",
-            "view_conflicts", "edit_conflicts",
-            "view_solutions", "edit_solutions",
-            "upload_files",
-            "view_comments", "add_comments", "edit_comments"
-        ],
-        "viewer": [
-            "view_project",
-            "view_conflicts",
-            "view_solutions",
-            "view_comments"
-        ]
-    }
\ No newline at end of file
+    Default permission names for each role, as a read-only mapping of tuples
+    """
+    return _DEFAULT_ROLE_PERMISSIONS
+
+
+def seed_default_roles_and_permissions(session: Session) -> None:
+    """
+    Insert the default permissions, roles and role-permission links in three
+    multi-row INSERTs; rows that already exist are left untouched, so this is
+    safe to run on every start. The caller commits.
+    """
+    permission_rows, role_rows = create_default_roles_and_permissions()
+    session.execute(
+        upsert_insert(session, Permission).values(permission_rows)
+        .on_conflict_do_nothing(index_elements=["name"])
+    )
+    session.execute(
+        upsert_insert(session, Role).values(role_rows)
+        .on_conflict_do_nothing(index_elements=["name"])
+    )
+    
+    # Resolve ids by name in one query per table instead of one per link
+    permission_ids = dict(session.execute(select(Permission.name, Permission.id)).all())
+    role_ids = dict(session.execute(select(Role.name, Role.id)).all())
+    links = [
+        {"role_id": role_ids[role_name], "permission_id": permission_ids[permission_name]}
+        for role_name, permission_names in get_default_role_permissions().items()
+        for permission_name in permission_names
+    ]
+    session.execute(
+        upsert_insert(session, RolePermission).values(links)
+        .on_conflict_do_nothing(index_elements=["role_id", "permission_id"])
+    )
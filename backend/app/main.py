@@ -1,16 +1,51 @@
 # Production use requires a separate commercial license from the Licensor.
 # For commercial licenses, please contact Tiago Sasaki at tiago@confenge.com.br.
 
-from fastapi import FastAPI
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from starlette.concurrency import run_in_threadpool
 from .api.v1.endpoints import projects, auth, analytics, integrations, collaboration
 from .middleware.rate_limiter import create_rate_limit_middleware
 from .core.exceptions import create_error_handler
+from .db.database import SessionLocal
+from .services.rbac_service import get_rbac_service
+from .services.activity_log_writer import activity_log_writer
+from .tasks.process_ifc import register_list_cache_invalidation
+
+logger = logging.getLogger(__name__)
+
+def initialize_rbac():
+    """Create default roles and permissions once, outside the request path"""
+    db = SessionLocal()
+    try:
+        get_rbac_service(db).initialize_rbac_system()
+    except Exception as e:
+        # Requests retry the initialization until it succeeds
+        logger.warning("RBAC initialization at startup failed: %s", e)
+    finally:
+        db.close()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Startup and shutdown work of the application"""
+    # Blocking database work, kept off the event loop
+    await run_in_threadpool(initialize_rbac)
+    await activity_log_writer.start()
+    try:
+        yield
+    finally:
+        # Flush the queued activity rows before exiting
+        await activity_log_writer.stop()
 
 app = FastAPI(
     title="Vitruvius API",
     description="AI-Powered SaaS Platform for BIM Project Coordination",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -25,6 +60,15 @@ app.add_middleware(
 # Add rate limiting middleware
 app.add_middleware(create_rate_limit_middleware)
 
+@app.middleware("http")
+async def permission_cache_middleware(request: Request, call_next):
+    """Give each request an empty RBAC cache, filled by the permission dependencies"""
+    request.state.perm_cache = {}
+    return await call_next(request)
+
+# Writes through the request sessions drop the cached project/model lists
+register_list_cache_invalidation(SessionLocal)
+
 # Add error handlers
 error_handlers = create_error_handler()
 for exception_type, handler in error_handlers.items():
@@ -0,0 +1,210 @@
+# Production use requires a separate commercial license from the Licensor.
+# For commercial licenses, please contact Tiago Sasaki at tiago@confenge.com.br.
+
+"""
+Buffered, fire-and-forget activity log writes.
+
+Rows are queued in memory and written by a background task every
+FLUSH_INTERVAL seconds or BATCH_SIZE rows, whichever comes first: one
+COPY FROM STDIN per batch on PostgreSQL, one bulk INSERT elsewhere. A crash
+loses at most the rows not yet flushed, which is acceptable for the audit
+trail; callers that need the stored row (and its id) use
+ActivityLogger.log_activity instead.
+"""
+
+import asyncio
+import csv
+import io
+import ipaddress
+import json
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from ..db.database import SessionLocal
+from ..db.models.collaboration import ActivityLog
+
+logger = logging.getLogger(__name__)
+
+QUEUE_SIZE = 10_000
+BATCH_SIZE = 1000
+FLUSH_INTERVAL = 0.5  # seconds
+
+COPY_COLUMNS = (
+    "project_id", "conflict_id", "user_id", "activity_type", "action", "entity_type",
+    "entity_id", "description", "old_values", "new_values", "metadata", "ip_address",
+    "user_agent", "created_at",
+)
+JSON_COLUMNS = frozenset({"old_values", "new_values", "metadata"})
+
+
+def normalize_ip_address(value: Optional[str]) -> Optional[str]:
+    """Return a canonical IP address, or None for hosts that are not one (the INET column rejects them)"""
+    if not value:
+        return None
+    try:
+        return str(ipaddress.ip_address(value))
+    except ValueError:
+        return None
+
+
+class ActivityLogWriter:
+    """
+    Queues activity rows and writes them in batches from a background task.
+    
+    submit() is safe to call from the event loop and from the threadpool
+    that runs sync routes; until start() is called (scripts, tests) rows are
+    written immediately instead.
+    """
+    
+    def __init__(
+        self,
+        session_factory: Callable = SessionLocal,
+        queue_size: int = QUEUE_SIZE,
+        batch_size: int = BATCH_SIZE,
+        flush_interval: float = FLUSH_INTERVAL
+    ):
+        self.session_factory = session_factory
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    async def start(self) -> None:
+        """Start the background flush task on the running loop"""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._task = asyncio.create_task(self._run(), name="activity-log-writer")
+    
+    async def stop(self) -> None:
+        """Flush everything queued so far and stop the background task"""
+        if self._task is None:
+            return
+        await self._queue.put(None)  # Sentinel: flush and exit
+        await self._task
+        self._loop = self._queue = self._task = None
+    
+    def submit(
+        self,
+        project_id: int,
+        user_id: int,
+        activity_type: str,
+        action: str,
+        entity_type: str,
+        entity_id: Optional[int] = None,
+        conflict_id: Optional[int] = None,
+        description: Optional[str] = None,
+        old_values: Optional[Dict[str, Any]] = None,
+        new_values: Optional[Dict[str, Any]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None
+    ) -> None:
+        """Queue an activity row (same fields as ActivityLogger.log_activity)"""
+        row = {
+            "project_id": project_id,
+            "conflict_id": conflict_id,
+            "user_id": user_id,
+            "activity_type": activity_type,
+            "action": action,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "description": description,
+            "old_values": old_values or None,
+            "new_values": new_values or None,
+            "metadata": metadata or None,
+            "ip_address": normalize_ip_address(ip_address),
+            "user_agent": user_agent,
+            # Stamped when the event happens, not when its batch is flushed
+            "created_at": datetime.utcnow(),
+        }
+        
+        loop = self._loop
+        if loop is None:
+            self._write_safely([row])
+            return
+        
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is loop:
+            self._enqueue(row)
+        else:
+            loop.call_soon_threadsafe(self._enqueue, row)
+    
+    def _enqueue(self, row: Dict[str, Any]) -> None:
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            logger.warning("Activity log queue full, dropping %s activity", row["activity_type"])
+    
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is None:
+                break
+            batch = [first]
+            deadline = loop.time() + self.flush_interval
+            
+            while len(batch) < self.batch_size:
+                try:
+                    row = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        row = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                if row is None:
+                    stopping = True
+                    break
+                batch.append(row)
+            
+            # The blocking write runs off the loop; the queue keeps filling meanwhile
+            await asyncio.to_thread(self._write_safely, batch)
+    
+    def _write_safely(self, rows: List[Dict[str, Any]]) -> None:
+        try:
+            self.write_batch(rows)
+        except Exception as e:
+            logger.error(f"Failed to write {len(rows)} activity log rows: {e}")
+    
+    def write_batch(self, rows: List[Dict[str, Any]]) -> None:
+        """Write rows in one COPY (PostgreSQL) or one bulk INSERT, in a single transaction"""
+        session = self.session_factory()
+        try:
+            if session.get_bind().dialect.name == "postgresql":
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                for row in rows:
+                    writer.writerow(
+                        json.dumps(row[column]) if column in JSON_COLUMNS and row[column] is not None else row[column]
+                        for column in COPY_COLUMNS
+                    )
+                buffer.seek(0)
+                
+                # COPY runs on the session's own DBAPI connection, inside its transaction
+                raw_conn = session.connection().connection
+                with raw_conn.cursor() as cursor:
+                    cursor.copy_expert(
+                        f"COPY activity_logs ({', '.join(COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                        buffer,
+                    )
+            else:
+                session.execute(ActivityLog.__table__.insert(), rows)
+            session.commit()
+        finally:
+            session.close()
+
+
+# Process-wide writer, started and stopped with the application
+activity_log_writer = ActivityLogWriter()
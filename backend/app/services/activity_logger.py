@@ -1,17 +1,22 @@
 # Production use requires a separate commercial license from the Licensor.
 # For commercial licenses, please contact Tiago Sasaki at tiago@confenge.com.br.
 
-import json
 from typing import Optional, Dict, Any, List
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, raiseload, selectinload
 from datetime import datetime
 
 from ..db.models.collaboration import ActivityLog, Notification
 from ..db.models.project import User, Project, Conflict
+from .activity_log_writer import activity_log_writer, normalize_ip_address
 
 
 class ActivityLogger:
-    """Service for logging user activities and creating audit trails"""
+    """
+    Service for logging user activities and creating audit trails
+    
+    log_activity stores the row before returning it; the log_* helpers are
+    fire-and-forget and queue their rows on the batched activity_log_writer.
+    """
     
     def __init__(self, db: Session):
         self.db = db
@@ -58,11 +63,11 @@ class ActivityLogger:
             action=action,
             entity_type=entity_type,
             entity_id=entity_id,
-            old_values=json.dumps(old_values) if old_values else None,
-            new_values=json.dumps(new_values) if new_values else None,
+            old_values=old_values or None,
+            new_values=new_values or None,
             description=description,
-            metadata=json.dumps(metadata) if metadata else None,
-            ip_address=ip_address,
+            context_metadata=metadata or None,
+            ip_address=normalize_ip_address(ip_address),
             user_agent=user_agent
         )
         
@@ -79,9 +84,9 @@ class ActivityLogger:
         conflict_id: int,
         conflict_data: Dict[str, Any],
         **kwargs
-    ) -> ActivityLog:
+    ) -> None:
         """Log conflict creation"""
-        return self.log_activity(
+        activity_log_writer.submit(
             project_id=project_id,
             user_id=user_id,
             conflict_id=conflict_id,
@@ -102,9 +107,9 @@ class ActivityLogger:
         old_values: Dict[str, Any],
         new_values: Dict[str, Any],
         **kwargs
-    ) -> ActivityLog:
+    ) -> None:
         """Log conflict update"""
-        return self.log_activity(
+        activity_log_writer.submit(
             project_id=project_id,
             user_id=user_id,
             conflict_id=conflict_id,
@@ -127,9 +132,9 @@ class ActivityLogger:
         new_status: str,
         reason: Optional[str] = None,
         **kwargs
-    ) -> ActivityLog:
+    ) -> None:
         """Log conflict status change"""
-        return self.log_activity(
+        activity_log_writer.submit(
             project_id=project_id,
             user_id=user_id,
             conflict_id=conflict_id,
@@ -151,9 +156,9 @@ class ActivityLogger:
         solution_id: int,
         solution_data: Dict[str, Any],
         **kwargs
-    ) -> ActivityLog:
+    ) -> None:
         """Log solution addition"""
-        return self.log_activity(
+        activity_log_writer.submit(
             project_id=project_id,
             user_id=user_id,
             conflict_id=conflict_id,
@@ -174,9 +179,9 @@ class ActivityLogger:
         comment_id: int,
         comment_type: str = "general",
         **kwargs
-    ) -> ActivityLog:
+    ) -> None:
         """Log comment addition"""
-        return self.log_activity(
+        activity_log_writer.submit(
             project_id=project_id,
             user_id=user_id,
             conflict_id=conflict_id,
@@ -197,9 +202,9 @@ class ActivityLogger:
         annotation_id: int,
         annotation_type: str,
         **kwargs
-    ) -> ActivityLog:
+    ) -> None:
         """Log annotation addition"""
-        return self.log_activity(
+        activity_log_writer.submit(
             project_id=project_id,
             user_id=user_id,
             conflict_id=conflict_id,
@@ -221,9 +226,9 @@ class ActivityLogger:
         feedback_type: str,
         effectiveness_rating: Optional[int] = None,
         **kwargs
-    ) -> ActivityLog:
+    ) -> None:
         """Log solution feedback submission"""
-        return self.log_activity(
+        activity_log_writer.submit(
             project_id=project_id,
             user_id=user_id,
             conflict_id=conflict_id,
@@ -247,9 +252,9 @@ class ActivityLogger:
         conflict_id: int,
         role: str,
         **kwargs
-    ) -> ActivityLog:
+    ) -> None:
         """Log user assignment to conflict"""
-        return self.log_activity(
+        activity_log_writer.submit(
             project_id=project_id,
             user_id=assigner_user_id,
             conflict_id=conflict_id,
@@ -275,9 +280,9 @@ class ActivityLogger:
         entity_id: Optional[int] = None,
         conflict_id: Optional[int] = None,
         **kwargs
-    ) -> ActivityLog:
+    ) -> None:
         """Log file upload"""
-        return self.log_activity(
+        activity_log_writer.submit(
             project_id=project_id,
             user_id=user_id,
             conflict_id=conflict_id,
@@ -302,9 +307,9 @@ class ActivityLogger:
         entity_count: int = 0,
         error_message: Optional[str] = None,
         **kwargs
-    ) -> ActivityLog:
+    ) -> None:
         """Log integration synchronization"""
-        return self.log_activity(
+        activity_log_writer.submit(
             project_id=project_id,
             user_id=user_id,
             activity_type="integration_sync",
@@ -333,7 +338,9 @@ class ActivityLogger:
         """
         Get project activity timeline with filtering options
         """
-        query = self.db.query(ActivityLog).filter(ActivityLog.project_id == project_id)
+        query = self.db.query(ActivityLog).options(
+            selectinload(ActivityLog.user), raiseload("*")
+        ).filter(ActivityLog.project_id == project_id)
         
         if activity_types:
             query = query.filter(ActivityLog.activity_type.in_(activity_types))
@@ -356,7 +363,9 @@ class ActivityLogger:
         offset: int = 0
     ) -> List[ActivityLog]:
         """Get activity timeline for a specific conflict"""
-        return self.db.query(ActivityLog).filter(
+        return self.db.query(ActivityLog).options(
+            selectinload(ActivityLog.user), raiseload("*")
+        ).filter(
             ActivityLog.conflict_id == conflict_id
         ).order_by(ActivityLog.created_at.desc()).offset(offset).limit(limit).all()
     
@@ -370,7 +379,7 @@ class ActivityLogger:
         from datetime import timedelta
         
         start_date = datetime.utcnow() - timedelta(days=days)
-        query = self.db.query(ActivityLog).filter(
+        query = self.db.query(ActivityLog).options(raiseload("*")).filter(
             ActivityLog.user_id == user_id,
             ActivityLog.created_at >= start_date
         )
@@ -498,29 +507,33 @@ class NotificationService:
     
     def notify_solution_added(
         self,
-        conflict_watchers: List[int],
         solution_creator_id: int,
         conflict_id: int,
         project_id: int
-    ):
-        """Notify watchers about new solution"""
+    ) -> int:
+        """Notify the conflict's solution watchers about a new solution"""
         conflict = self.db.query(Conflict).filter(Conflict.id == conflict_id).first()
         creator = self.db.query(User).filter(User.id == solution_creator_id).first()
         
-        if conflict and creator:
-            for user_id in conflict_watchers:
-                if user_id != solution_creator_id:  # Don't notify creator
-                    self.create_notification(
-                        user_id=user_id,
-                        notification_type="solution_added",
-                        title="New Solution Proposed",
-                        message=f"{creator.full_name} proposed a solution for conflict: {conflict.conflict_type}",
-                        project_id=project_id,
-                        conflict_id=conflict_id,
-                        related_entity_type="solution",
-                        action_url=f"/projects/{project_id}/conflicts/{conflict_id}",
-                        action_text="Review Solution"
-                    )
+        if not (conflict and creator):
+            return 0
+        
+        created = Notification.fanout_for_conflict(
+            self.db,
+            conflict_id=conflict_id,
+            notification_type="solution_added",
+            title="New Solution Proposed",
+            message=f"{creator.full_name} proposed a solution for conflict: {conflict.conflict_type}",
+            watch_column="watch_solutions",
+            exclude_user_id=solution_creator_id,  # Don't notify creator
+            project_id=project_id,
+            related_entity_type="solution",
+            action_url=f"/projects/{project_id}/conflicts/{conflict_id}",
+            action_text="Review Solution"
+        )
+        self.db.commit()
+        
+        return created
     
     def mark_notification_read(self, notification_id: int, user_id: int) -> bool:
         """Mark notification as read"""
@@ -545,7 +558,7 @@ class NotificationService:
         offset: int = 0
     ) -> List[Notification]:
         """Get notifications for a user"""
-        query = self.db.query(Notification).filter(Notification.user_id == user_id)
+        query = self.db.query(Notification).options(raiseload("*")).filter(Notification.user_id == user_id)
         
         if unread_only:
             query = query.filter(Notification.is_read == False)
@@ -0,0 +1,215 @@
+# Production use requires a separate commercial license from the Licensor.
+# For commercial licenses, please contact Tiago Sasaki at tiago@confenge.com.br.
+
+"""
+Asynchronous file writes backed by io_uring where available.
+
+On Linux with the liburing bindings installed, chunks are written through a
+single ring owned by a dedicated thread, submitting up to URING_BATCH_SIZE
+writes per io_uring_enter call. Elsewhere, or if the ring cannot be set up
+(e.g. io_uring disabled by seccomp), writes fall back to aiofiles.
+
+Written against the liburing bindings pinned in requirements.txt (2026.3.30):
+Ring/Cqe objects, io_uring_prep_write(sqe, fd, buf, offset=...), and failed
+completions reported as a negative cqe.res (-errno), which the bindings also
+raise as OSError when the entry is read.
+"""
+
+import asyncio
+import errno
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, List, Optional
+
+import aiofiles
+
+try:
+    import liburing
+except ImportError:  # pragma: no cover - liburing is Linux-only and optional
+    liburing = None
+
+logger = logging.getLogger(__name__)
+
+URING_ENTRIES = 256
+URING_BATCH_SIZE = 32
+URING_BATCH_BYTES = 8 * 1024 * 1024  # Bound memory held per in-flight batch
+
+
+class UringWriter:
+    """
+    Owns one io_uring ring and performs batched positional writes on it.
+    
+    The ring is not thread-safe, so all calls go through a single-thread
+    executor; the event loop only awaits the completion of each batch.
+    """
+    
+    def __init__(self, entries: int = URING_ENTRIES):
+        self.entries = entries
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="io-uring")
+        self._ring = None
+        self._cqe = None
+    
+    def _ensure_ring(self) -> None:
+        if self._ring is None:
+            ring = liburing.Ring()
+            liburing.io_uring_queue_init(self.entries, ring)
+            self._ring = ring
+            self._cqe = liburing.Cqe()
+    
+    def _write_batch(self, fd: int, buffers: List[bytes], offset: int) -> int:
+        """Submit all buffers in one go and reap their completions"""
+        self._ensure_ring()
+        ring, cqe = self._ring, self._cqe
+        
+        pending = {}
+        total = 0
+        for index, buffer in enumerate(buffers):
+            pending[index] = (buffer, offset + total)
+            total += len(buffer)
+        
+        to_submit = list(pending)
+        while to_submit:
+            for index in to_submit:
+                buffer, position = pending[index]
+                sqe = liburing.io_uring_get_sqe(ring)
+                liburing.io_uring_prep_write(sqe, fd, buffer, offset=position)
+                liburing.io_uring_sqe_set_data64(sqe, index)
+            liburing.io_uring_submit(ring)
+            
+            error = None
+            short_writes = []
+            for _ in range(len(to_submit)):
+                liburing.io_uring_wait_cqe(ring, cqe)
+                try:
+                    entry = cqe[0]
+                except OSError as e:
+                    # Failed completions raise on access and must be skipped explicitly
+                    liburing.io_uring_cq_advance(ring, 1)
+                    error = error or e
+                    continue
+                index, written = entry.user_data, entry.res
+                liburing.io_uring_cqe_seen(ring, entry)
+                
+                buffer, position = pending[index]
+                if written < 0:
+                    error = error or OSError(-written, os.strerror(-written))
+                    continue
+                if written == 0:
+                    # Nothing was written; resubmitting would loop forever
+                    error = error or OSError(errno.EIO, f"io_uring write at offset {position} made no progress")
+                    continue
+                if written < len(buffer):
+                    pending[index] = (buffer[written:], position + written)
+                    short_writes.append(index)
+            
+            if error:
+                raise error
+            to_submit = short_writes
+        
+        return total
+    
+    async def write_batch(self, fd: int, buffers: List[bytes], offset: int) -> int:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._write_batch, fd, buffers, offset)
+
+
+_uring_writer: Optional[UringWriter] = None
+_uring_lock = threading.Lock()
+_uring_available = liburing is not None
+
+
+async def _get_uring_writer() -> Optional[UringWriter]:
+    """Return the shared writer, or None once io_uring is known to be unusable"""
+    global _uring_writer, _uring_available
+    
+    if not _uring_available:
+        return None
+    
+    with _uring_lock:
+        if _uring_writer is None:
+            _uring_writer = UringWriter()
+    
+    if _uring_writer._ring is not None:
+        return _uring_writer
+    
+    try:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(_uring_writer._executor, _uring_writer._ensure_ring)
+    except Exception as e:
+        # OSError when io_uring is disabled; anything else means bindings this code doesn't fit
+        logger.warning("io_uring unavailable, falling back to aiofiles: %s", e)
+        _uring_available = False
+        return None
+    
+    return _uring_writer
+
+
+def _preallocate(fd: int, size_hint: Optional[int]) -> None:
+    """Reserve size_hint bytes up front so the filesystem can allocate contiguous extents"""
+    if not size_hint or not hasattr(os, "posix_fallocate"):
+        return
+    try:
+        os.posix_fallocate(fd, 0, size_hint)
+    except OSError as e:
+        # Preallocation is only an optimization (e.g. unsupported or out of quota)
+        logger.debug("posix_fallocate of %d bytes failed: %s", size_hint, e)
+
+
+async def _write_stream_uring(writer: UringWriter, path: str, async_chunks: AsyncIterator[bytes],
+                              size_hint: Optional[int] = None) -> int:
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        _preallocate(fd, size_hint)
+        offset = 0
+        batch: List[bytes] = []
+        batch_bytes = 0
+        async for chunk in async_chunks:
+            if not chunk:
+                continue
+            batch.append(bytes(chunk))
+            batch_bytes += len(chunk)
+            if len(batch) >= URING_BATCH_SIZE or batch_bytes >= URING_BATCH_BYTES:
+                offset += await writer.write_batch(fd, batch, offset)
+                batch, batch_bytes = [], 0
+        if batch:
+            offset += await writer.write_batch(fd, batch, offset)
+        if size_hint and size_hint > offset:
+            # Drop the preallocated space the stream did not use
+            os.ftruncate(fd, offset)
+        return offset
+    finally:
+        os.close(fd)
+
+
+async def _write_stream_aiofiles(path: str, async_chunks: AsyncIterator[bytes],
+                                 size_hint: Optional[int] = None) -> int:
+    written = 0
+    async with aiofiles.open(path, "wb") as f:
+        _preallocate(f.fileno(), size_hint)
+        async for chunk in async_chunks:
+            await f.write(chunk)
+            written += len(chunk)
+        if size_hint and size_hint > written:
+            await f.truncate(written)
+    return written
+
+
+async def write_stream(path: str, async_chunks: AsyncIterator[bytes], size_hint: Optional[int] = None) -> int:
+    """
+    Write an async stream of chunks to a file, replacing any existing content.
+    
+    Args:
+        path: Destination file path
+        async_chunks: Async iterator yielding the file content in order
+        size_hint: Expected size in bytes; the file is preallocated to it where
+            supported and truncated to the bytes actually written afterwards
+    
+    Returns:
+        Number of bytes written
+    """
+    writer = await _get_uring_writer()
+    if writer is not None:
+        return await _write_stream_uring(writer, path, async_chunks, size_hint)
+    return await _write_stream_aiofiles(path, async_chunks, size_hint)
@@ -1,7 +1,7 @@
 # Production use requires a separate commercial license from the Licensor.
 # For commercial licenses, please contact Tiago Sasaki at tiago@confenge.com.br.
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from typing import Optional, Dict, Any
 from datetime import datetime, timedelta
 import logging
@@ -30,7 +30,9 @@ class FeedbackDataCollector:
             return
         
         # Get the conflict and its associated elements
-        conflict = self.db.query(Conflict).filter(Conflict.id == feedback.conflict_id).first()
+        conflict = self.db.query(Conflict).options(
+            selectinload(Conflict.elements)
+        ).filter(Conflict.id == feedback.conflict_id).first()
         if not conflict:
             logger.warning(f"Conflict not found for feedback {feedback.id}")
             return
@@ -10,7 +10,7 @@ from sklearn.metrics import classification_report, accuracy_score
 import joblib
 import os
 from typing import Optional, Dict, Any
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from ..db.database import SessionLocal
 from ..db.models.analytics import HistoricalConflict
 from ..db.models.project import Project, Conflict
@@ -184,7 +184,9 @@ class Predictor:
             if not project:
                 return {"error": "Project not found"}
             
-            conflicts = db.query(Conflict).filter(Conflict.project_id == project_id).all()
+            conflicts = db.query(Conflict).options(
+                selectinload(Conflict.elements)
+            ).filter(Conflict.project_id == project_id).all()
             if not conflicts:
                 return {"risk_score": 0.0, "message": "No conflicts detected"}
             
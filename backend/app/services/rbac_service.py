@@ -1,9 +1,9 @@
 # Production use requires a separate commercial license from the Licensor.
 # For commercial licenses, please contact Tiago Sasaki at tiago@confenge.com.br.
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, select
 from datetime import datetime, timedelta
 import secrets
 import hashlib
@@ -11,7 +11,7 @@ from enum import Enum
 
 from ..db.models.rbac import (
     Permission, Role, RolePermission, UserRole, ProjectInvitation, AuditLog,
-    PermissionType, ProjectRole, create_default_roles_and_permissions, get_default_role_permissions
+    PermissionType, ProjectRole, seed_default_roles_and_permissions
 )
 from ..db.models.project import User, Project
 
@@ -26,6 +26,9 @@ class RBACService:
     Role-Based Access Control service for managing permissions
     """
     
+    # Set once default roles are known to exist, so later calls skip the check
+    _initialized = False
+    
     def __init__(self, db: Session):
         self.db = db
     
@@ -33,36 +36,17 @@ class RBACService:
         """
         Initialize the RBAC system with default roles and permissions
         """
+        if RBACService._initialized:
+            return
+        
         # Check if already initialized
         if self.db.query(Role).count() > 0:
+            RBACService._initialized = True
             return
         
-        # Create default permissions and roles
-        permissions, roles = create_default_roles_and_permissions()
-        
-        # Add permissions to database
-        for permission in permissions:
-            self.db.add(permission)
-        
-        # Add roles to database
-        for role in roles:
-            self.db.add(role)
-        
-        self.db.commit()
-        
-        # Assign permissions to roles
-        role_permissions = get_default_role_permissions()
-        
-        for role_name, permission_names in role_permissions.items():
-            role = self.db.query(Role).filter(Role.name == role_name).first()
-            if role:
-                for permission_name in permission_names:
-                    permission = self.db.query(Permission).filter(Permission.name == permission_name).first()
-                    if permission:
-                        role_permission = RolePermission(role_id=role.id, permission_id=permission.id)
-                        self.db.add(role_permission)
-        
+        seed_default_roles_and_permissions(self.db)
         self.db.commit()
+        RBACService._initialized = True
     
     def check_permission(self, user_id: int, project_id: int, permission_name: str) -> AccessDecision:
         """
@@ -120,6 +104,63 @@ class RBACService:
             )
             return AccessDecision.DENY
     
+    def check_permissions_bulk(self, user_id: int, project_id: int,
+                               permission_names: Optional[List[str]] = None) -> Set[str]:
+        """
+        Check several permissions for a user on a project in one query
+        
+        Follows check_permission: users without any active role on the project
+        are granted everything only if they own it.
+        
+        Args:
+            user_id: ID of the user
+            project_id: ID of the project
+            permission_names: Names of the permissions to check, or None for all
+            
+        Returns:
+            Set of the requested permission names that are granted
+        """
+        try:
+            granted_permissions = select(RolePermission.role_id, Permission.name).join(Permission)
+            if permission_names is not None:
+                granted_permissions = granted_permissions.where(Permission.name.in_(permission_names))
+            granted_permissions = granted_permissions.subquery()
+            
+            # One row per active role, with the matching permission name if any
+            rows = self.db.query(UserRole.role_id, granted_permissions.c.name).outerjoin(
+                granted_permissions, granted_permissions.c.role_id == UserRole.role_id
+            ).filter(
+                and_(
+                    UserRole.user_id == user_id,
+                    UserRole.project_id == project_id,
+                    UserRole.is_active == True,
+                    or_(UserRole.expires_at.is_(None), UserRole.expires_at > datetime.utcnow())
+                )
+            ).all()
+            
+            if not rows:
+                # Check if user is project owner (fallback)
+                project = self.db.query(Project).filter(Project.id == project_id).first()
+                if project and project.owner_id == user_id:
+                    if permission_names is None:
+                        return {name for (name,) in self.db.query(Permission.name).all()}
+                    return set(permission_names)
+                return set()
+            
+            return {name for _, name in rows if name is not None}
+            
+        except Exception as e:
+            # Log error and deny access for security
+            self.audit_log(
+                user_id=user_id,
+                project_id=project_id,
+                action="permission_check_error",
+                resource_type="permission",
+                old_value=", ".join(permission_names) if permission_names is not None else "*",
+                new_value=f"Error: {str(e)}"
+            )
+            return set()
+    
     def assign_role_to_user(self, user_id: int, project_id: int, role_name: str, granted_by: int) -> bool:
         """
         Assign a role to a user for a specific project
@@ -11,9 +11,9 @@ from sqlalchemy import create_engine
 
 from ..services.aps_integration import APSIntegration
 from ..db.models.project import Project, IFCModel
-from ..db.database import DATABASE_URL
+from ..db.database import DATABASE_URL, engine_args
 from ..core.config import settings
-from .process_ifc import process_ifc_task
+from .process_ifc import process_ifc_task, register_list_cache_invalidation
 
 logger = logging.getLogger(__name__)
 
@@ -21,8 +21,10 @@ logger = logging.getLogger(__name__)
 celery_app = Celery('aps_tasks', broker=settings.CELERY_BROKER_URL, backend=settings.CELERY_RESULT_BACKEND)
 
 # Database setup for Celery tasks
-engine = create_engine(DATABASE_URL)
+engine_url, engine_options = engine_args(DATABASE_URL)
+engine = create_engine(engine_url, **engine_options)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+register_list_cache_invalidation(SessionLocal)
 
 # APS Configuration
 APS_CLIENT_ID = os.getenv("APS_CLIENT_ID", "")
@@ -0,0 +1,57 @@
+# Production use requires a separate commercial license from the Licensor.
+# For commercial licenses, please contact Tiago Sasaki at tiago@confenge.com.br.
+
+"""
+Task dispatch helpers that publish through the Celery app's producer pool.
+
+Every .delay() call acquires its own producer and connection from the pool.
+Requests that start several tasks can publish them all over one acquired
+producer instead.
+"""
+
+from typing import List, Optional, Sequence
+
+from celery import Task
+from celery.canvas import Signature
+from celery.result import AsyncResult
+
+
+def enqueue(task: Task, *args, **kwargs) -> AsyncResult:
+    """
+    Publish a single task using a pooled producer of the task's app.
+    
+    Args:
+        task: Celery task to run
+        *args: Positional task arguments
+        **kwargs: Keyword task arguments
+    
+    Returns:
+        AsyncResult of the published task
+    """
+    with task.app.producer_or_acquire() as producer:
+        return task.apply_async(args, kwargs, producer=producer)
+
+
+def enqueue_many(signatures: Sequence[Optional[Signature]]) -> List[Optional[AsyncResult]]:
+    """
+    Publish several tasks over one producer and broker connection.
+    
+    All signatures must belong to the same Celery app. None entries are
+    passed through so callers can skip tasks conditionally while keeping
+    positions stable.
+    
+    Args:
+        signatures: Task signatures to publish, e.g. task.s(*args)
+    
+    Returns:
+        AsyncResult (or None) for each signature, in order
+    """
+    pending = [sig for sig in signatures if sig is not None]
+    if not pending:
+        return [None] * len(signatures)
+    
+    with pending[0].type.app.producer_or_acquire() as producer:
+        return [
+            sig.apply_async(producer=producer) if sig is not None else None
+            for sig in signatures
+        ]
@@ -7,6 +7,14 @@ from ..services.ml_service import ModelTrainer
 
 # Configure Celery
 celery_app = Celery('ml_tasks', broker=settings.CELERY_BROKER_URL, backend=settings.CELERY_RESULT_BACKEND)
+celery_app.conf.update(
+    task_serializer=settings.CELERY_TASK_SERIALIZER,
+    result_serializer=settings.CELERY_RESULT_SERIALIZER,
+    accept_content=settings.CELERY_ACCEPT_CONTENT,
+    result_accept_content=settings.CELERY_ACCEPT_CONTENT,
+    task_compression=settings.CELERY_TASK_COMPRESSION,
+    result_compression=settings.CELERY_TASK_COMPRESSION
+)
 
 @celery_app.task
 def train_risk_prediction_model():
@@ -9,15 +9,15 @@ import hashlib
 # import pickle
 import tempfile
 import numpy as np
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker, selectinload
+from sqlalchemy import create_engine, event
 import redis
 import ifcopenshell
 import ifcopenshell.geom
 import trimesh
 from pygltflib import GLTF2
 from pydantic import BaseModel, ValidationError
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 import signal
 import time
 import traceback
@@ -26,7 +26,7 @@ from ..services.bim_processor import process_ifc_file
 from ..services.sandbox_processor import create_sandbox_processor
 from ..services.rules_engine import run_prescriptive_analysis
 from ..db.models.project import Project, IFCModel, Conflict, Solution
-from ..db.database import DATABASE_URL
+from ..db.database import DATABASE_URL, engine_args
 from ..core.config import settings
 
 # Configure Celery with poison pill handling
@@ -40,11 +40,18 @@ celery_app.conf.update(
     task_acks_late=True,
     worker_prefetch_multiplier=1,
     task_default_retry_delay=60,
-    task_max_retries=3
+    task_max_retries=3,
+    task_serializer=settings.CELERY_TASK_SERIALIZER,
+    result_serializer=settings.CELERY_RESULT_SERIALIZER,
+    accept_content=settings.CELERY_ACCEPT_CONTENT,
+    result_accept_content=settings.CELERY_ACCEPT_CONTENT,
+    task_compression=settings.CELERY_TASK_COMPRESSION,
+    result_compression=settings.CELERY_TASK_COMPRESSION
 )
 
 # Database setup for Celery tasks
-engine = create_engine(DATABASE_URL)
+engine_url, engine_options = engine_args(DATABASE_URL)
+engine = create_engine(engine_url, **engine_options)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Redis cache setup with environment-aware configuration
@@ -71,6 +78,13 @@ except (redis.ConnectionError, redis.TimeoutError):
 CACHE_TTL = 3600 * 24 * 7  # 7 days
 CACHE_PREFIX = 'vitruvius:ifc:'
 
+# List endpoint response cache configuration
+LIST_CACHE_TTL = 300  # 5 minutes, as a safety net on top of explicit invalidation
+LIST_CACHE_PREFIX = f'{CACHE_PREFIX}list:'
+# Outlives every entry written under a version, so a version that expires and
+# restarts from 0 can't match a live entry
+LIST_CACHE_VERSION_TTL = 3600 * 24
+
 def safe_redis_get(key):
     """Safely get value from Redis, return None if Redis unavailable"""
     if redis_client is None:
@@ -99,6 +113,21 @@ def safe_redis_keys(pattern):
     except (redis.ConnectionError, redis.TimeoutError):
         return []
 
+def safe_redis_incr(*keys, ttl=None):
+    """Safely increment counters in Redis (one round trip), do nothing if Redis unavailable"""
+    if redis_client is None or not keys:
+        return False
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipe.incr(key)
+            if ttl:
+                pipe.expire(key, ttl)
+        pipe.execute()
+        return True
+    except (redis.ConnectionError, redis.TimeoutError):
+        return False
+
 def safe_redis_delete(*keys):
     """Safely delete keys from Redis, do nothing if Redis unavailable"""
     if redis_client is None or not keys:
@@ -119,17 +148,26 @@ def safe_redis_info(section=None):
         return {}
 
 def get_file_hash(file_path: str) -> str:
-    """Generate hash for file content for caching"""
+    """
+    Generate hash for file content for caching.
+    
+    Uses SHA-256 like the digest stored on IFCModel.content_sha256 at upload,
+    so cache keys agree whichever of the two is used.
+    """
     try:
-        hash_md5 = hashlib.md5()
+        hash_sha256 = hashlib.sha256()
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                hash_sha256.update(chunk)
+        return hash_sha256.hexdigest()
     except Exception as e:
         print(f"Error generating file hash: {str(e)}")
         return None
 
+def get_model_file_hash(model: IFCModel) -> str:
+    """Content hash for a model, read from the database when known at upload"""
+    return model.content_sha256 or get_file_hash(model.file_path)
+
 def get_cache_key(prefix: str, file_hash: str, suffix: str = "") -> str:
     """Generate cache key"""
     key = f"{CACHE_PREFIX}{prefix}:{file_hash}"
@@ -407,7 +445,7 @@ def invalidate_project_cache(project_id: int) -> bool:
             total_invalidated = 0
             for model in models:
                 if model.file_path and os.path.exists(model.file_path):
-                    file_hash = get_file_hash(model.file_path)
+                    file_hash = get_model_file_hash(model)
                     if file_hash:
                         pattern = get_cache_key('*', file_hash, '*')
                         keys = safe_redis_keys(pattern)
@@ -417,6 +455,7 @@ def invalidate_project_cache(project_id: int) -> bool:
                             total_invalidated += len(keys)
             
             print(f"Invalidated {total_invalidated} cache entries for project {project_id}")
+            invalidate_list_cache(project_id=project_id)
             return True
         
     except Exception as e:
@@ -430,7 +469,7 @@ def invalidate_model_cache(model_id: int) -> bool:
             model = db.query(IFCModel).filter(IFCModel.id == model_id).first()
             
             if model and model.file_path and os.path.exists(model.file_path):
-                file_hash = get_file_hash(model.file_path)
+                file_hash = get_model_file_hash(model)
                 if file_hash:
                     return invalidate_cache(file_hash)
             
@@ -440,6 +479,83 @@ def invalidate_model_cache(model_id: int) -> bool:
         print(f"Error invalidating model cache: {str(e)}")
         return False
 
+def _list_cache_version_key(project_id: Optional[int] = None, user_id: Optional[int] = None) -> str:
+    """Counter versioning a project's lists, or a user's own project list"""
+    if project_id is not None:
+        return f"{LIST_CACHE_PREFIX}version:project:{project_id}"
+    return f"{LIST_CACHE_PREFIX}version:user:{user_id}"
+
+def get_list_cache_key(scope: str, user_id: int, project_id: Optional[int] = None, page: Optional[str] = None) -> str:
+    """
+    Generate cache key for a list endpoint response
+    
+    The key embeds the current version of the project (or, for user-level
+    lists, of the user), so invalidating is a counter bump; superseded entries
+    are never looked up again and expire on their TTL.
+    """
+    version = int(safe_redis_get(_list_cache_version_key(project_id, user_id)) or 0)
+    if project_id is None:
+        key = f"{LIST_CACHE_PREFIX}{scope}:{user_id}:v{version}"
+    else:
+        key = f"{LIST_CACHE_PREFIX}{scope}:{project_id}:{user_id}:v{version}"
+    return f"{key}:{page}" if page is not None else key
+
+def get_cached_list_response(cache_key: str) -> Optional[Tuple[bytes, str]]:
+    """Get cached list response body and its ETag, or None on cache miss"""
+    cached_data = safe_redis_get(cache_key)
+    if not cached_data:
+        return None
+    
+    etag, _, body = cached_data.partition(b"\n")
+    return body, etag.decode()
+
+def cache_list_response(cache_key: str, body: bytes) -> str:
+    """Cache a serialized list response and return its ETag"""
+    etag = f'"{hashlib.sha1(body).hexdigest()}"'
+    safe_redis_setex(cache_key, LIST_CACHE_TTL, etag.encode() + b"\n" + body)
+    return etag
+
+def invalidate_list_cache(project_id: Optional[int] = None, user_id: Optional[int] = None) -> bool:
+    """Invalidate cached list responses for a project and/or a user's project list"""
+    keys = []
+    if project_id is not None:
+        keys.append(_list_cache_version_key(project_id=project_id))
+    if user_id is not None:
+        keys.append(_list_cache_version_key(user_id=user_id))
+    return safe_redis_incr(*keys, ttl=LIST_CACHE_VERSION_TTL)
+
+def _track_list_cache_changes(session, flush_context):
+    """Record projects/models touched by a flush so their list caches can be dropped on commit"""
+    pending = session.info.setdefault('list_cache_invalidations', set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, IFCModel):
+            pending.add((obj.project_id, None))
+        elif isinstance(obj, Project):
+            pending.add((obj.id, obj.owner_id))
+
+def _invalidate_list_cache_on_commit(session):
+    """Invalidate list caches only once the changes are visible to other sessions"""
+    for project_id, user_id in session.info.pop('list_cache_invalidations', ()):
+        invalidate_list_cache(project_id=project_id, user_id=user_id)
+
+def _discard_list_cache_changes(session):
+    """Forget pending invalidations for rolled back changes"""
+    session.info.pop('list_cache_invalidations', None)
+
+def register_list_cache_invalidation(session_factory: sessionmaker) -> None:
+    """
+    Invalidate list caches when sessions from session_factory commit Project or
+    IFCModel changes
+    
+    Registered per sessionmaker (the API's and each worker's), so sessions
+    opened elsewhere, e.g. by scripts, carry no hooks.
+    """
+    event.listen(session_factory, "after_flush", _track_list_cache_changes)
+    event.listen(session_factory, "after_commit", _invalidate_list_cache_on_commit)
+    event.listen(session_factory, "after_rollback", _discard_list_cache_changes)
+
+register_list_cache_invalidation(SessionLocal)
+
 def get_cache_stats() -> dict:
     """Get cache statistics"""
     try:
@@ -587,12 +703,8 @@ def process_ifc_task(self, project_id: int, file_path: str):
             mark_task_as_poison(file_path, error_msg)
             raise TaskProcessingError(error_msg)
         
-        # Generate file hash for caching
-        file_hash = get_file_hash(file_path)
-        if not file_hash:
-            print("Warning: Could not generate file hash, proceeding without cache")
-        
         # Update IFC model status
+        stored_hash = None
         with SessionLocal() as db:
             ifc_model = db.query(IFCModel).filter(
                 IFCModel.project_id == project_id,
@@ -600,9 +712,15 @@ def process_ifc_task(self, project_id: int, file_path: str):
             ).first()
             
             if ifc_model:
+                stored_hash = ifc_model.content_sha256
                 ifc_model.status = "processing"
                 db.commit()
         
+        # File hash for caching; computed at upload, so only older models need a re-read
+        file_hash = stored_hash or get_file_hash(file_path)
+        if not file_hash:
+            print("Warning: Could not generate file hash, proceeding without cache")
+        
         # Check cache for BIM data
         bim_data = None
         if file_hash:
@@ -902,7 +1020,10 @@ def get_conflict_id_by_elements(db, project_id, elements):
     # Find conflicts that involve the same elements
     # This is a simplified approach - in a real implementation you might want
     # more sophisticated matching logic
-    for conflict in db.query(Conflict).filter(Conflict.project_id == project_id).all():
+    conflicts = db.query(Conflict).options(
+        selectinload(Conflict.elements)
+    ).filter(Conflict.project_id == project_id).all()
+    for conflict in conflicts:
         conflict_element_ids = [elem.ifc_id for elem in conflict.elements]
         if set(conflict_element_ids) == set(elements):
             return conflict.id
@@ -1162,8 +1283,8 @@ def run_inter_model_clash_detection(project_id: int):
                 continue
             
             # Generate file hashes for caching
-            file1_hash = get_file_hash(model1.file_path)
-            file2_hash = get_file_hash(model2.file_path)
+            file1_hash = get_model_file_hash(model1)
+            file2_hash = get_model_file_hash(model2)
             
             # Create cache key for this model pair
             cache_key = f"inter_clash_{min(file1_hash, file2_hash)}_{max(file1_hash, file2_hash)}"
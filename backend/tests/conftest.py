@@ -3,20 +3,24 @@ import os
 import tempfile
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from fastapi.testclient import TestClient
 from app.main import app
 from app.db.models.project import Base
 from app.db.database import get_db
+from app.auth.dependencies import _user_cache, decode_token
 from app.core.config import settings
 
 
 @pytest.fixture(scope="session")
 def test_db():
     """Create test database for the entire test session"""
-    # Use in-memory SQLite for faster tests
+    # Use in-memory SQLite for faster tests; one shared connection so the
+    # TestClient's worker threads see the same database
     engine = create_engine(
         "sqlite:///:memory:", 
-        connect_args={"check_same_thread": False}
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
     )
     
     # Create all tables
@@ -28,6 +32,16 @@ def test_db():
     Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def clear_auth_caches():
+    """Start every test without cached users or decoded tokens"""
+    _user_cache.clear()
+    decode_token.cache_clear()
+    yield
+    _user_cache.clear()
+    decode_token.cache_clear()
+
+
 @pytest.fixture(scope="function")
 def db_session(test_db):
     """Create a fresh database session for each test"""
@@ -8,7 +8,6 @@ class UserFactory(factory.Factory):
     class Meta:
         model = User
     
-    id = factory.Sequence(lambda n: n)
     email = factory.Sequence(lambda n: f"user{n}@example.com")
     hashed_password = factory.LazyAttribute(lambda obj: get_password_hash("testpassword"))
     full_name = factory.Faker('name')
@@ -22,7 +21,6 @@ class ProjectFactory(factory.Factory):
     class Meta:
         model = Project
     
-    id = factory.Sequence(lambda n: n)
     name = factory.Sequence(lambda n: f"Test Project {n}")
     description = factory.Faker('text', max_nb_chars=200)
     status = "created"
@@ -35,7 +33,6 @@ class IFCModelFactory(factory.Factory):
     class Meta:
         model = IFCModel
     
-    id = factory.Sequence(lambda n: n)
     filename = factory.Sequence(lambda n: f"test_model_{n}.ifc")
     file_path = factory.Sequence(lambda n: f"/tmp/test_model_{n}.ifc")
     status = "uploaded"
@@ -47,7 +44,6 @@ class ConflictFactory(factory.Factory):
     class Meta:
         model = Conflict
     
-    id = factory.Sequence(lambda n: n)
     conflict_type = factory.Iterator(["collision", "clearance", "structural"])
     severity = factory.Iterator(["high", "medium", "low"])
     description = factory.Faker('text', max_nb_chars=200)
@@ -60,7 +56,6 @@ class SolutionFactory(factory.Factory):
     class Meta:
         model = Solution
     
-    id = factory.Sequence(lambda n: n)
     solution_type = factory.Iterator(["redesign", "relocate", "material_change"])
     description = factory.Faker('text', max_nb_chars=200)
     estimated_cost = factory.Faker('random_int', min=1000, max=50000)  # in cents
@@ -75,7 +70,6 @@ class SolutionFeedbackFactory(factory.Factory):
     class Meta:
         model = SolutionFeedback
     
-    id = factory.Sequence(lambda n: n)
     feedback_type = factory.Iterator(["selected_suggested", "custom_solution"])
     custom_solution_description = factory.Faker('text', max_nb_chars=300)
     implementation_notes = factory.Faker('text', max_nb_chars=200)
@@ -87,10 +81,15 @@ class SolutionFeedbackFactory(factory.Factory):
 
 
 # Helper functions for creating test data
+def _fields(instance):
+    """Column values of a built instance, without SQLAlchemy's internal state"""
+    return {key: value for key, value in instance.__dict__.items() if not key.startswith("_")}
+
+
 def create_user(db_session, **kwargs):
     """Create a user in the database"""
     user_data = UserFactory.build(**kwargs)
-    user = User(**user_data.__dict__)
+    user = User(**_fields(user_data))
     db_session.add(user)
     db_session.commit()
     db_session.refresh(user)
@@ -103,7 +102,7 @@ def create_project(db_session, owner=None, **kwargs):
         owner = create_user(db_session)
     
     project_data = ProjectFactory.build(owner_id=owner.id, **kwargs)
-    project = Project(**project_data.__dict__)
+    project = Project(**_fields(project_data))
     db_session.add(project)
     db_session.commit()
     db_session.refresh(project)
@@ -116,7 +115,7 @@ def create_conflict(db_session, project=None, **kwargs):
         project = create_project(db_session)
     
     conflict_data = ConflictFactory.build(project_id=project.id, **kwargs)
-    conflict = Conflict(**conflict_data.__dict__)
+    conflict = Conflict(**_fields(conflict_data))
     db_session.add(conflict)
     db_session.commit()
     db_session.refresh(conflict)
@@ -129,7 +128,7 @@ def create_solution(db_session, conflict=None, **kwargs):
         conflict = create_conflict(db_session)
     
     solution_data = SolutionFactory.build(conflict_id=conflict.id, **kwargs)
-    solution = Solution(**solution_data.__dict__)
+    solution = Solution(**_fields(solution_data))
     db_session.add(solution)
     db_session.commit()
     db_session.refresh(solution)
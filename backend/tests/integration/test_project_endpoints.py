@@ -2,7 +2,11 @@ import pytest
 import json
 from fastapi import status
 from unittest.mock import patch, Mock
+from sqlalchemy import event
 from tests.factories import create_user, create_project, create_conflict, create_solution
+from app.main import app
+from app.auth.dependencies import get_current_active_user, require_project_view
+from app.db.models.project import IFCModel, Element, Conflict, ProjectCost, SolutionFeedback
 from io import BytesIO
 
 
@@ -331,4 +335,230 @@ class TestProjectEndpoints:
         )
         
         assert response.status_code == status.HTTP_400_BAD_REQUEST
-        assert "Custom solution description required" in response.json()["detail"]
\ No newline at end of file
+        assert "Custom solution description required" in response.json()["detail"]
+
+@pytest.fixture
+def owner(client, db_session):
+    """Create a user and authenticate every request as that user"""
+    user = create_user(db_session)
+    app.dependency_overrides[get_current_active_user] = lambda: user
+    yield user
+    app.dependency_overrides.pop(get_current_active_user, None)
+
+
+class TestProjectConflictsStreaming:
+    """Conflicts are streamed from a constant number of queries"""
+    
+    @pytest.fixture
+    def project_id(self, db_session, owner):
+        """A project with 100 conflicts of one element each, viewable by the owner"""
+        app.dependency_overrides[require_project_view] = lambda: owner
+        
+        project = create_project(db_session, owner=owner)
+        model = IFCModel(project_id=project.id, filename="model.ifc", file_path="/tmp/model.ifc")
+        db_session.add(model)
+        db_session.flush()
+        for i in range(100):
+            element = Element(ifc_model_id=model.id, ifc_id=f"elem{i}", element_type="IfcWall")
+            db_session.add(Conflict(
+                project_id=project.id,
+                conflict_type="collision",
+                elements=[element]
+            ))
+        db_session.commit()
+        project_id = project.id
+        db_session.expire_all()
+        
+        yield project_id
+        app.dependency_overrides.pop(require_project_view, None)
+    
+    @pytest.fixture
+    def statements(self, db_session):
+        """SQL statements executed while the test runs"""
+        statements = []
+        
+        def count_queries(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", count_queries)
+        yield statements
+        event.remove(engine, "before_cursor_execute", count_queries)
+    
+    def test_get_project_conflicts_query_count(self, client, project_id, statements):
+        """The JSON response reads conflicts and their elements in two queries"""
+        response = client.get(f"/api/projects/{project_id}/conflicts")
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/json"
+        data = response.json()
+        assert data["project_id"] == project_id
+        assert len(data["conflicts"]) == 100
+        assert all(len(c["elements"]) == 1 for c in data["conflicts"])
+        assert len(statements) <= 2
+    
+    def test_get_project_conflicts_ndjson(self, client, project_id, statements):
+        """Accept: application/x-ndjson streams one conflict per line"""
+        response = client.get(
+            f"/api/projects/{project_id}/conflicts",
+            headers={"Accept": "application/x-ndjson"}
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = response.text.splitlines()
+        assert len(lines) == 100
+        conflicts = [json.loads(line) for line in lines]
+        assert all(c["type"] == "collision" and len(c["elements"]) == 1 for c in conflicts)
+        assert len(statements) <= 2
+    
+    def test_get_project_conflicts_ndjson_pagination(self, client, project_id):
+        """cursor and limit page through the NDJSON stream by conflict id"""
+        url = f"/api/projects/{project_id}/conflicts"
+        headers = {"Accept": "application/x-ndjson"}
+        
+        first_page = [json.loads(line) for line in client.get(
+            url, params={"limit": 40}, headers=headers
+        ).text.splitlines()]
+        second_page = [json.loads(line) for line in client.get(
+            url, params={"cursor": first_page[-1]["id"], "limit": 100}, headers=headers
+        ).text.splitlines()]
+        
+        assert len(first_page) == 40
+        assert len(second_page) == 60
+        assert first_page[-1]["id"] < second_page[0]["id"]
+    
+    def test_get_project_conflicts_query_error(self, client, project_id):
+        """A failing first batch query returns 500 instead of a truncated 200"""
+        with patch('app.api.v1.endpoints.projects.get_conflicts_with_elements',
+                   side_effect=RuntimeError("database went away")):
+            response = client.get(f"/api/projects/{project_id}/conflicts")
+        
+        assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+
+
+class TestProjectUpserts:
+    """Insert-then-update behaviour of the ON CONFLICT upserts"""
+    
+    def test_create_project_cost_updates_existing_parameter(self, client, db_session, owner):
+        """Posting the same parameter twice updates the row instead of duplicating it"""
+        project = create_project(db_session, owner=owner)
+        
+        first = client.post(
+            f"/api/projects/{project.id}/costs",
+            json={"parameter_name": "steel_beam", "cost": 100.0}
+        )
+        second = client.post(
+            f"/api/projects/{project.id}/costs",
+            json={"parameter_name": "steel_beam", "cost": 250.0}
+        )
+        
+        assert first.status_code == status.HTTP_200_OK
+        assert second.status_code == status.HTTP_200_OK
+        assert second.json()["id"] == first.json()["id"]
+        assert second.json()["cost"] == 250.0
+        
+        db_session.expire_all()
+        costs = db_session.query(ProjectCost).filter(ProjectCost.project_id == project.id).all()
+        assert [(c.parameter_name, c.cost) for c in costs] == [("steel_beam", 250.0)]
+    
+    def test_create_project_cost_keeps_parameters_separate(self, client, db_session, owner):
+        """Different parameters of the same project are separate rows"""
+        project = create_project(db_session, owner=owner)
+        
+        for name, cost in [("steel_beam", 100.0), ("concrete", 80.0)]:
+            response = client.post(
+                f"/api/projects/{project.id}/costs",
+                json={"parameter_name": name, "cost": cost}
+            )
+            assert response.status_code == status.HTTP_200_OK
+        
+        db_session.expire_all()
+        count = db_session.query(ProjectCost).filter(ProjectCost.project_id == project.id).count()
+        assert count == 2
+    
+    def test_submit_solution_feedback_updates_existing_feedback(self, client, db_session, owner):
+        """A user's second feedback on a conflict replaces the first one"""
+        project = create_project(db_session, owner=owner)
+        conflict = create_conflict(db_session, project=project)
+        solution = create_solution(db_session, conflict=conflict)
+        url = f"/api/projects/{project.id}/conflicts/{conflict.id}/feedback"
+        
+        first = client.post(url, json={
+            "feedback_type": "selected_suggested",
+            "solution_id": solution.id,
+            "effectiveness_rating": 3
+        })
+        second = client.post(url, json={
+            "feedback_type": "custom_solution",
+            "custom_solution_description": "Rerouted the duct instead",
+            "effectiveness_rating": 5
+        })
+        
+        assert first.status_code == status.HTTP_200_OK
+        assert second.status_code == status.HTTP_200_OK
+        assert second.json()["feedback_id"] == first.json()["feedback_id"]
+        
+        db_session.expire_all()
+        feedback = db_session.query(SolutionFeedback).filter(
+            SolutionFeedback.conflict_id == conflict.id,
+            SolutionFeedback.user_id == owner.id
+        ).all()
+        assert len(feedback) == 1
+        assert feedback[0].feedback_type == "custom_solution"
+        assert feedback[0].solution_id is None
+        assert feedback[0].effectiveness_rating == 5
+
+
+class TestModelFiles:
+    """Converted model files are only served to the project owner"""
+    
+    @pytest.fixture
+    def model(self, db_session, owner, tmp_path):
+        """A processed model of an owned project with a glTF file on disk"""
+        gltf_file = tmp_path / "model.gltf"
+        gltf_file.write_text('{"asset": {"version": "2.0"}}')
+        
+        project = create_project(db_session, owner=owner)
+        model = IFCModel(
+            project_id=project.id,
+            filename="model.ifc",
+            file_path=str(tmp_path / "model.ifc"),
+            gltf_path=str(gltf_file),
+            status="completed"
+        )
+        db_session.add(model)
+        db_session.commit()
+        return model
+    
+    def test_get_model_gltf_points_at_file_route(self, client, model):
+        """The glTF URL is the authenticated file route of the model"""
+        response = client.get(f"/api/projects/{model.project_id}/models/{model.id}/gltf")
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["gltf_url"] == f"/api/projects/{model.project_id}/models/{model.id}/gltf/file"
+    
+    def test_get_model_gltf_file_owner(self, client, model):
+        """The owner downloads the glTF file"""
+        response = client.get(f"/api/projects/{model.project_id}/models/{model.id}/gltf/file")
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "model/gltf+json"
+        assert response.json() == {"asset": {"version": "2.0"}}
+    
+    def test_get_model_gltf_file_other_user(self, client, db_session, model):
+        """Users who do not own the project get a 404"""
+        other = create_user(db_session)
+        app.dependency_overrides[get_current_active_user] = lambda: other
+        
+        response = client.get(f"/api/projects/{model.project_id}/models/{model.id}/gltf/file")
+        
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+    
+    def test_get_model_gltf_file_unauthenticated(self, client, model):
+        """Anonymous requests are rejected"""
+        app.dependency_overrides.pop(get_current_active_user, None)
+        
+        response = client.get(f"/api/projects/{model.project_id}/models/{model.id}/gltf/file")
+        
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
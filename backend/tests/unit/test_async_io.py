@@ -0,0 +1,186 @@
+import asyncio
+import errno
+import os
+from collections import deque
+from types import SimpleNamespace
+import inspect
+import pytest
+from app.services import async_io
+
+try:
+    import liburing
+except ImportError:
+    liburing = None
+
+
+class FakeCqe:
+    """Completion slot; reading a failed entry raises OSError like the bindings do"""
+    
+    def __init__(self):
+        self.entry = None
+    
+    def __getitem__(self, index):
+        if self.entry.res < 0:
+            raise OSError(-self.entry.res, os.strerror(-self.entry.res))
+        return self.entry
+
+
+class FakeLiburing:
+    """
+    Stand-in for the pinned liburing bindings (2026.3.30), with their signatures.
+    
+    Writes are performed with os.pwrite at submit time, capped at max_write
+    bytes per submission to produce short writes (max_write=0 never makes
+    progress); with fail_errno set, every write completes with res = -fail_errno.
+    """
+    
+    FUNCTIONS = (
+        "io_uring_queue_init", "io_uring_get_sqe", "io_uring_prep_write", "io_uring_sqe_set_data64",
+        "io_uring_submit", "io_uring_wait_cqe", "io_uring_cqe_seen", "io_uring_cq_advance",
+    )
+    
+    def __init__(self, max_write=None, fail_errno=None):
+        self.max_write = max_write
+        self.fail_errno = fail_errno
+        self.submits = 0
+    
+    def Ring(self):
+        return SimpleNamespace(queued=[], completions=deque())
+    
+    def Cqe(self):
+        return FakeCqe()
+    
+    def io_uring_queue_init(self, entries, ring, /, flags=None):
+        pass
+    
+    def io_uring_get_sqe(self, ring, /):
+        sqe = SimpleNamespace()
+        ring.queued.append(sqe)
+        return sqe
+    
+    def io_uring_prep_write(self, sqe, fd, buf, /, offset=None):
+        sqe.fd, sqe.buf, sqe.offset = fd, buf, offset
+    
+    def io_uring_sqe_set_data64(self, sqe, data, /):
+        sqe.user_data = data
+    
+    def io_uring_submit(self, ring, /):
+        self.submits += 1
+        for sqe in ring.queued:
+            data = sqe.buf if self.max_write is None else sqe.buf[:self.max_write]
+            res = -self.fail_errno if self.fail_errno else os.pwrite(sqe.fd, data, sqe.offset)
+            ring.completions.append(SimpleNamespace(user_data=sqe.user_data, res=res))
+        queued = len(ring.queued)
+        ring.queued.clear()
+        return queued
+    
+    def io_uring_wait_cqe(self, ring, cqe, /):
+        cqe.entry = ring.completions[0]
+    
+    def io_uring_cqe_seen(self, ring, cqe, /):
+        ring.completions.popleft()
+    
+    def io_uring_cq_advance(self, ring, nr, /):
+        for _ in range(nr):
+            ring.completions.popleft()
+
+
+async def _chunks(chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+class TestUringWriteStream:
+    """Test suite for the io_uring write path, run against a fake liburing"""
+    
+    @pytest.fixture
+    def fake_liburing(self, monkeypatch):
+        def install(**kwargs):
+            fake = FakeLiburing(**kwargs)
+            monkeypatch.setattr(async_io, "liburing", fake)
+            monkeypatch.setattr(async_io, "_uring_available", True)
+            monkeypatch.setattr(async_io, "_uring_writer", None)
+            return fake
+        return install
+    
+    def test_writes_chunks_in_batches(self, fake_liburing, tmp_path, monkeypatch):
+        """Chunks land in order, URING_BATCH_SIZE writes per submission"""
+        fake = fake_liburing()
+        monkeypatch.setattr(async_io, "URING_BATCH_SIZE", 4)
+        chunks = [bytes([i]) * 10 for i in range(10)]
+        path = tmp_path / "model.ifc"
+        
+        written = asyncio.run(async_io.write_stream(str(path), _chunks(chunks)))
+        
+        assert written == 100
+        assert path.read_bytes() == b"".join(chunks)
+        assert fake.submits == 3
+    
+    def test_short_writes_are_resubmitted(self, fake_liburing, tmp_path):
+        """The rest of a partially written buffer is written at the right offset"""
+        fake_liburing(max_write=3)
+        chunks = [b"ISO-10303-21;", b"HEADER;", b"END-ISO-10303-21;"]
+        path = tmp_path / "model.ifc"
+        
+        written = asyncio.run(async_io.write_stream(str(path), _chunks(chunks), size_hint=64))
+        
+        assert written == sum(len(chunk) for chunk in chunks)
+        assert path.read_bytes() == b"".join(chunks)
+    
+    def test_write_without_progress_raises(self, fake_liburing, tmp_path):
+        """A completion that wrote nothing is an error, not a short write to retry"""
+        fake = fake_liburing(max_write=0)
+        path = tmp_path / "model.ifc"
+        
+        with pytest.raises(OSError):
+            asyncio.run(async_io.write_stream(str(path), _chunks([b"ISO-10303-21;"])))
+        
+        assert fake.submits == 1
+    
+    def test_failed_completion_raises(self, fake_liburing, tmp_path):
+        """A completion with a negative res surfaces as OSError"""
+        fake_liburing(fail_errno=errno.ENOSPC)
+        path = tmp_path / "model.ifc"
+        
+        with pytest.raises(OSError) as exc_info:
+            asyncio.run(async_io.write_stream(str(path), _chunks([b"ISO-10303-21;"])))
+        
+        assert exc_info.value.errno == errno.ENOSPC
+    
+    def test_ring_setup_error_falls_back(self, fake_liburing, tmp_path, monkeypatch):
+        """Bindings that don't fit fall back to aiofiles instead of failing the upload"""
+        fake = fake_liburing()
+        monkeypatch.setattr(fake, "io_uring_queue_init", lambda *args: (_ for _ in ()).throw(TypeError("bad call")))
+        path = tmp_path / "model.ifc"
+        
+        written = asyncio.run(async_io.write_stream(str(path), _chunks([b"ISO-10303-21;"])))
+        
+        assert written == 13
+        assert path.read_bytes() == b"ISO-10303-21;"
+        assert async_io._uring_available is False
+
+
+@pytest.mark.skipif(liburing is None, reason="liburing bindings not installed")
+class TestLiburingBindings:
+    """Checks against the installed liburing bindings"""
+    
+    @pytest.mark.parametrize("name", FakeLiburing.FUNCTIONS)
+    def test_fake_matches_bindings(self, name):
+        """The fake takes the same arguments as the real function"""
+        assert inspect.signature(getattr(FakeLiburing(), name)) == inspect.signature(getattr(liburing, name))
+    
+    def test_write_stream_on_real_ring(self, tmp_path, monkeypatch):
+        """write_stream writes through a real ring where the kernel allows one"""
+        monkeypatch.setattr(async_io, "liburing", liburing)
+        monkeypatch.setattr(async_io, "_uring_available", True)
+        monkeypatch.setattr(async_io, "_uring_writer", None)
+        monkeypatch.setattr(async_io, "URING_BATCH_SIZE", 4)
+        chunks = [bytes([i]) * 1000 for i in range(10)]
+        path = tmp_path / "model.ifc"
+        
+        written = asyncio.run(async_io.write_stream(str(path), _chunks(chunks), size_hint=20000))
+        
+        if async_io._uring_writer is None or async_io._uring_writer._ring is None:
+            pytest.skip("io_uring is not available on this kernel")
+        assert written == 10000
+        assert path.read_bytes() == b"".join(chunks)
@@ -0,0 +1,214 @@
+import inspect
+import weakref
+import pytest
+import orjson
+from fastapi import FastAPI, HTTPException, status
+from fastapi.testclient import TestClient
+from app.core.exceptions import (
+    ErrorCode, VitruviusException, AuthenticationError, AuthorizationError, ValidationError,
+    ResourceNotFoundError, ResourceConflictError, FileError, ProcessingError, DatabaseError,
+    ExternalServiceError, RateLimitError, create_error_handler
+)
+
+
+# Subclasses declared with a fixed error_code and http_status via __init_subclass__
+FIXED_CODE_EXCEPTIONS = [
+    (AuthenticationError, ErrorCode.INVALID_CREDENTIALS, status.HTTP_401_UNAUTHORIZED,
+     "Invalid email or password"),
+    (AuthorizationError, ErrorCode.ACCESS_DENIED, status.HTTP_403_FORBIDDEN,
+     "Access denied"),
+    (ValidationError, ErrorCode.VALIDATION_ERROR, status.HTTP_400_BAD_REQUEST,
+     "Please check your input and try again"),
+    (ResourceNotFoundError, ErrorCode.RESOURCE_NOT_FOUND, status.HTTP_404_NOT_FOUND,
+     "The requested resource was not found"),
+    (ResourceConflictError, ErrorCode.RESOURCE_CONFLICT, status.HTTP_409_CONFLICT,
+     "There was a conflict with the requested operation"),
+    (DatabaseError, ErrorCode.DATABASE_ERROR, status.HTTP_500_INTERNAL_SERVER_ERROR,
+     "A database error occurred"),
+    (RateLimitError, ErrorCode.RATE_LIMIT_EXCEEDED, status.HTTP_429_TOO_MANY_REQUESTS,
+     "Too many requests. Please try again later"),
+]
+
+
+@pytest.fixture
+def error_client():
+    """An app with the standard error handlers that raises whatever the test sets"""
+    app = FastAPI()
+    for exception_type, handler in create_error_handler().items():
+        app.add_exception_handler(exception_type, handler)
+    
+    raised = {}
+    
+    @app.get("/raise")
+    def raise_error():
+        raise raised["exc"]
+    
+    with TestClient(app, raise_server_exceptions=False) as client:
+        def get(exc):
+            raised["exc"] = exc
+            return client.get("/raise")
+        yield get
+
+
+class TestFixedCodeExceptions:
+    """Test suite for the exceptions built by __init_subclass__"""
+    
+    def test_every_fixed_code_subclass_is_covered(self):
+        """New subclasses with a fixed code must be added to FIXED_CODE_EXCEPTIONS"""
+        fixed = {
+            cls for cls in VitruviusException.__subclasses__()
+            if list(inspect.signature(cls.__init__).parameters) == ["self", "message", "details"]
+        }
+        
+        assert fixed == {cls for cls, _, _, _ in FIXED_CODE_EXCEPTIONS}
+    
+    @pytest.mark.parametrize("exc_class,error_code,http_status,user_message", FIXED_CODE_EXCEPTIONS)
+    def test_attributes(self, exc_class, error_code, http_status, user_message):
+        """The generated constructor fills every slot"""
+        exc = exc_class("internal message", details={"field": "name"})
+        
+        assert isinstance(exc, VitruviusException)
+        assert exc.error_code is error_code
+        assert exc.http_status == http_status
+        assert exc.message == "internal message"
+        assert exc.user_message == user_message
+        assert exc.details == {"field": "name"}
+        assert str(exc) == "internal message"
+        assert len(exc.error_id) == 32
+        assert exc.error_id == exc.error_id
+        assert exc_class.__init__.__qualname__ == f"{exc_class.__qualname__}.__init__"
+    
+    @pytest.mark.parametrize("exc_class,error_code,http_status,user_message", FIXED_CODE_EXCEPTIONS)
+    def test_attributes_use_slots(self, exc_class, error_code, http_status, user_message):
+        """Every attribute lands in a declared slot, none in the instance dict"""
+        exc = exc_class("internal message")
+        exc.error_id, exc.timestamp
+        
+        assert vars(exc) == {}
+        assert exc.details == {}
+    
+    @pytest.mark.parametrize("exc_class,error_code,http_status,user_message", FIXED_CODE_EXCEPTIONS)
+    def test_weak_referenceable(self, exc_class, error_code, http_status, user_message):
+        """Slots keep weak references working like a plain Exception subclass"""
+        exc = exc_class("internal message")
+        
+        assert weakref.ref(exc)() is exc
+    
+    @pytest.mark.parametrize("exc_class,error_code,http_status,user_message", FIXED_CODE_EXCEPTIONS)
+    def test_json_matches_to_dict(self, exc_class, error_code, http_status, user_message):
+        """The pre-encoded body is the JSON of to_dict(), with and without details"""
+        for details in (None, {"field": "name", "limit": 3}):
+            exc = exc_class("internal message", details=details)
+            
+            assert orjson.loads(exc.to_json_bytes()) == orjson.loads(orjson.dumps(exc.to_dict()))
+    
+    @pytest.mark.parametrize("exc_class,error_code,http_status,user_message", FIXED_CODE_EXCEPTIONS)
+    def test_handler_response(self, error_client, exc_class, error_code, http_status, user_message):
+        """The handler answers with the class's status code and error body"""
+        response = error_client(exc_class("internal message"))
+        
+        assert response.status_code == http_status
+        assert response.headers["content-type"] == "application/json"
+        body = response.json()
+        assert body["error_code"] == error_code.value
+        assert body["message"] == user_message
+        assert body["details"] is None
+        assert len(body["error_id"]) == 32
+        assert body["timestamp"]
+
+
+class TestErrorHandlers:
+    """Test suite for the JSON output of the error handlers"""
+    
+    def test_custom_user_message_is_escaped(self, error_client):
+        """A non-default message is JSON-escaped"""
+        exc = VitruviusException(
+            error_code=ErrorCode.INVALID_INPUT,
+            message="bad",
+            http_status=status.HTTP_400_BAD_REQUEST,
+            user_message='Quote " and backslash \\ in message'
+        )
+        
+        response = error_client(exc)
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["message"] == 'Quote " and backslash \\ in message'
+    
+    def test_details_are_returned(self, error_client):
+        """Details are included in the body"""
+        response = error_client(ResourceNotFoundError("missing", details={"project_id": 7}))
+        
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json()["details"] == {"project_id": 7}
+    
+    def test_given_error_id_is_kept(self, error_client):
+        """An explicit error id appears in the body"""
+        exc = VitruviusException(error_code=ErrorCode.INTERNAL_ERROR, message="x", error_id="abc123")
+        
+        response = error_client(exc)
+        
+        assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        assert response.json()["error_id"] == "abc123"
+    
+    @pytest.mark.parametrize("error_code,http_status", [
+        (ErrorCode.FILE_TOO_LARGE, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE),
+        (ErrorCode.INVALID_FILE_TYPE, status.HTTP_400_BAD_REQUEST),
+        (ErrorCode.UPLOAD_FAILED, status.HTTP_400_BAD_REQUEST),
+    ])
+    def test_file_error_status(self, error_client, error_code, http_status):
+        """File errors map too-large files to 413 and everything else to 400"""
+        response = error_client(FileError(error_code, "file problem"))
+        
+        assert response.status_code == http_status
+        assert response.json()["error_code"] == error_code.value
+    
+    def test_processing_error(self, error_client):
+        """Processing errors are 422 with the given code"""
+        response = error_client(ProcessingError(ErrorCode.PROCESSING_TIMEOUT, "slow"))
+        
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert response.json()["error_code"] == "PROCESSING_TIMEOUT"
+        assert response.json()["message"] == "Request processing timed out"
+    
+    def test_external_service_error(self, error_client):
+        """External service errors are 502 with the given code"""
+        response = error_client(ExternalServiceError(ErrorCode.EXTERNAL_SERVICE_UNAVAILABLE, "down"))
+        
+        assert response.status_code == status.HTTP_502_BAD_GATEWAY
+        assert response.json()["error_code"] == "EXTERNAL_SERVICE_UNAVAILABLE"
+    
+    @pytest.mark.parametrize("http_status,error_code,message", [
+        (401, "INVALID_CREDENTIALS", "Invalid email or password"),
+        (403, "ACCESS_DENIED", "Access denied"),
+        (404, "RESOURCE_NOT_FOUND", "The requested resource was not found"),
+        (409, "RESOURCE_CONFLICT", "There was a conflict with the requested operation"),
+        (429, "RATE_LIMIT_EXCEEDED", "Too many requests. Please try again later"),
+        (400, "INTERNAL_ERROR", "An internal error occurred"),
+    ])
+    def test_http_exception(self, error_client, http_status, error_code, message):
+        """HTTPExceptions keep their status code and get the mapped error code"""
+        response = error_client(HTTPException(status_code=http_status, detail="Project not found"))
+        
+        assert response.status_code == http_status
+        body = response.json()
+        assert body["error_code"] == error_code
+        assert body["message"] == message
+        assert body["details"] is None
+    
+    def test_http_exception_structured_detail(self, error_client):
+        """Non-string details do not break the handler"""
+        response = error_client(HTTPException(status_code=422, detail=[{"loc": ["body"], "msg": "bad"}]))
+        
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert response.json()["error_code"] == "VALIDATION_ERROR"
+    
+    def test_unhandled_exception(self, error_client):
+        """Other exceptions become a 500 that does not leak the original message"""
+        response = error_client(RuntimeError("secret connection string"))
+        
+        assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        body = response.json()
+        assert body["error_code"] == "INTERNAL_ERROR"
+        assert body["message"] == "An internal error occurred"
+        assert "secret" not in response.text
+        assert len(body["error_id"]) == 32
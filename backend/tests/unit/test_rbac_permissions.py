@@ -0,0 +1,191 @@
+import pytest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+from fastapi import status
+from app.auth.auth import create_access_token
+from app.auth.dependencies import get_request_permissions
+from app.db.models.project import User
+from app.db.models.rbac import Role, UserRole, get_default_role_permissions, seed_default_roles_and_permissions
+from app.services.rbac_service import RBACService
+from tests.factories import create_user, create_project
+
+
+class TestCheckPermissionsBulk:
+    """Test suite for RBACService.check_permissions_bulk"""
+    
+    @pytest.fixture
+    def rbac_service(self, db_session):
+        """RBAC service over a database seeded with the default roles"""
+        seed_default_roles_and_permissions(db_session)
+        db_session.commit()
+        return RBACService(db_session)
+    
+    @pytest.fixture
+    def project(self, db_session):
+        return create_project(db_session)
+    
+    def grant(self, db_session, user, project, role_name, **kwargs):
+        """Give a user a role on a project"""
+        role = db_session.query(Role).filter(Role.name == role_name).one()
+        db_session.add(UserRole(
+            user_id=user.id,
+            role_id=role.id,
+            project_id=project.id,
+            granted_by=project.owner_id,
+            **kwargs
+        ))
+        db_session.commit()
+    
+    def test_owner_without_role_gets_every_permission(self, rbac_service, project):
+        """Owners fall back to every permission when they hold no role"""
+        granted = rbac_service.check_permissions_bulk(project.owner_id, project.id)
+        
+        assert granted == set(get_default_role_permissions()["owner"])
+    
+    def test_collaborator_gets_role_permissions(self, db_session, rbac_service, project):
+        """Collaborators get exactly the collaborator permissions"""
+        user = create_user(db_session)
+        self.grant(db_session, user, project, "collaborator")
+        
+        granted = rbac_service.check_permissions_bulk(user.id, project.id)
+        
+        assert granted == set(get_default_role_permissions()["collaborator"])
+        assert "delete_project" not in granted
+    
+    def test_viewer_gets_read_permissions(self, db_session, rbac_service, project):
+        """Viewers only get the read permissions"""
+        user = create_user(db_session)
+        self.grant(db_session, user, project, "viewer")
+        
+        granted = rbac_service.check_permissions_bulk(user.id, project.id)
+        
+        assert granted == set(get_default_role_permissions()["viewer"])
+    
+    def test_non_member_gets_nothing(self, db_session, rbac_service, project):
+        """Users without a role on a project they don't own get no permissions"""
+        user = create_user(db_session)
+        
+        assert rbac_service.check_permissions_bulk(user.id, project.id) == set()
+    
+    def test_roles_are_scoped_to_their_project(self, db_session, rbac_service, project):
+        """A role on one project grants nothing on another"""
+        user = create_user(db_session)
+        self.grant(db_session, user, project, "collaborator")
+        other_project = create_project(db_session)
+        
+        assert rbac_service.check_permissions_bulk(user.id, other_project.id) == set()
+    
+    def test_expired_and_inactive_roles_are_ignored(self, db_session, rbac_service, project):
+        """Only active, unexpired roles grant permissions"""
+        expired = create_user(db_session)
+        self.grant(db_session, expired, project, "collaborator", expires_at=datetime.utcnow() - timedelta(days=1))
+        inactive = create_user(db_session)
+        self.grant(db_session, inactive, project, "collaborator", is_active=False)
+        
+        assert rbac_service.check_permissions_bulk(expired.id, project.id) == set()
+        assert rbac_service.check_permissions_bulk(inactive.id, project.id) == set()
+    
+    def test_requested_permissions_only(self, db_session, rbac_service, project):
+        """Only the requested permission names are checked"""
+        user = create_user(db_session)
+        self.grant(db_session, user, project, "viewer")
+        
+        granted = rbac_service.check_permissions_bulk(user.id, project.id, ["view_project", "edit_project"])
+        
+        assert granted == {"view_project"}
+        assert rbac_service.check_permissions_bulk(
+            project.owner_id, project.id, ["view_project", "edit_project"]
+        ) == {"view_project", "edit_project"}
+    
+    def test_matches_check_permission(self, db_session, rbac_service, project):
+        """The bulk check agrees with the single permission check for every role"""
+        users = {"owner": db_session.get(User, project.owner_id), "none": create_user(db_session)}
+        for role_name in ("collaborator", "viewer"):
+            users[role_name] = create_user(db_session)
+            self.grant(db_session, users[role_name], project, role_name)
+        
+        for user in users.values():
+            granted = rbac_service.check_permissions_bulk(user.id, project.id)
+            for permission in get_default_role_permissions()["owner"]:
+                decision = rbac_service.check_permission(user.id, project.id, permission)
+                assert (decision.value == "allow") == (permission in granted)
+
+
+class TestGetRequestPermissions:
+    """Test suite for the per-request permission cache"""
+    
+    @pytest.fixture
+    def rbac_service(self, db_session):
+        seed_default_roles_and_permissions(db_session)
+        db_session.commit()
+        return RBACService(db_session)
+    
+    def request(self):
+        """A request whose middleware has set up an empty permission cache"""
+        return SimpleNamespace(state=SimpleNamespace(perm_cache={}))
+    
+    def test_loads_once_per_request(self, db_session, rbac_service):
+        """Repeated lookups within one request reuse the first result"""
+        project = create_project(db_session)
+        request = self.request()
+        
+        with patch.object(rbac_service, "check_permissions_bulk", wraps=rbac_service.check_permissions_bulk) as bulk:
+            first = get_request_permissions(request, rbac_service, project.owner_id, project.id)
+            second = get_request_permissions(request, rbac_service, project.owner_id, project.id)
+        
+        assert bulk.call_count == 1
+        assert first == second == set(get_default_role_permissions()["owner"])
+    
+    def test_cache_keyed_by_user_and_project(self, db_session, rbac_service):
+        """Other users and projects are not served from the same entry"""
+        project = create_project(db_session)
+        other_project = create_project(db_session)
+        stranger = create_user(db_session)
+        request = self.request()
+        
+        assert get_request_permissions(request, rbac_service, project.owner_id, project.id)
+        assert get_request_permissions(request, rbac_service, stranger.id, project.id) == set()
+        assert get_request_permissions(request, rbac_service, project.owner_id, other_project.id) == set()
+        assert len(request.state.perm_cache) == 3
+    
+    def test_new_request_reloads(self, db_session, rbac_service):
+        """A role granted after a request is visible to the next request"""
+        project = create_project(db_session)
+        user = create_user(db_session)
+        first_request = self.request()
+        
+        assert get_request_permissions(first_request, rbac_service, user.id, project.id) == set()
+        
+        viewer = db_session.query(Role).filter(Role.name == "viewer").one()
+        db_session.add(UserRole(user_id=user.id, role_id=viewer.id, project_id=project.id, granted_by=project.owner_id))
+        db_session.commit()
+        
+        assert get_request_permissions(first_request, rbac_service, user.id, project.id) == set()
+        assert get_request_permissions(self.request(), rbac_service, user.id, project.id) == set(
+            get_default_role_permissions()["viewer"]
+        )
+    
+    def test_without_request_is_not_cached(self, db_session, rbac_service):
+        """Outside of a request every call queries"""
+        project = create_project(db_session)
+        
+        with patch.object(rbac_service, "check_permissions_bulk", wraps=rbac_service.check_permissions_bulk) as bulk:
+            get_request_permissions(None, rbac_service, project.owner_id, project.id)
+            get_request_permissions(None, rbac_service, project.owner_id, project.id)
+        
+        assert bulk.call_count == 2
+    
+    def test_app_requests_get_separate_caches(self, client, db_session, rbac_service):
+        """Through the app, each request loads permissions once for itself"""
+        project = create_project(db_session)
+        owner_email = db_session.get(User, project.owner_id).email
+        headers = {"Authorization": f"Bearer {create_access_token(data={'sub': owner_email})}"}
+        
+        with patch.object(RBACService, "check_permissions_bulk", autospec=True,
+                          side_effect=RBACService.check_permissions_bulk) as bulk:
+            first = client.get(f"/api/projects/{project.id}/conflicts", headers=headers)
+            second = client.get(f"/api/projects/{project.id}/conflicts", headers=headers)
+        
+        assert first.status_code == second.status_code == status.HTTP_200_OK
+        assert bulk.call_count == 2
@@ -0,0 +1,76 @@
+import pytest
+from fastapi import status
+from sqlalchemy.orm import sessionmaker
+from app.auth.auth import create_access_token
+from app.auth.dependencies import _user_cache, get_cached_user, USER_CACHE_COLUMNS
+from tests.factories import create_user
+
+
+class TestUserCache:
+    """Test suite for the authenticated user cache"""
+    
+    @pytest.fixture
+    def other_session(self, test_db):
+        """A second session, standing in for another request"""
+        session = sessionmaker(bind=test_db)()
+        yield session
+        session.close()
+    
+    def test_snapshot_holds_only_auth_columns(self, db_session):
+        """Credentials and APS tokens are never cached"""
+        user = create_user(db_session, aps_access_token="secret-token")
+        
+        get_cached_user(db_session, user.email)
+        
+        assert set(_user_cache[user.email]) == set(USER_CACHE_COLUMNS)
+        assert "hashed_password" not in _user_cache[user.email]
+        assert "aps_access_token" not in _user_cache[user.email]
+    
+    def test_cached_user_loads_other_columns_on_access(self, db_session, other_session):
+        """Columns outside the snapshot are read from the database"""
+        user = create_user(db_session, aps_access_token="secret-token")
+        get_cached_user(db_session, user.email)
+        
+        cached = get_cached_user(other_session, user.email)
+        
+        assert cached.id == user.id
+        assert cached.aps_access_token == "secret-token"
+        assert cached.hashed_password == user.hashed_password
+    
+    def test_user_update_invalidates_snapshot(self, db_session, other_session):
+        """Committing a change to the user row drops the cached snapshot"""
+        user = create_user(db_session)
+        get_cached_user(db_session, user.email)
+        
+        changed = other_session.get(type(user), user.id)
+        changed.is_active = False
+        other_session.commit()
+        
+        assert user.email not in _user_cache
+        db_session.expire_all()
+        assert get_cached_user(db_session, user.email).is_active is False
+    
+    def test_email_change_invalidates_old_email(self, db_session, other_session):
+        """The snapshot under the previous email is dropped too"""
+        user = create_user(db_session)
+        old_email = user.email
+        get_cached_user(db_session, old_email)
+        
+        changed = other_session.get(type(user), user.id)
+        changed.email = f"renamed-{old_email}"
+        other_session.commit()
+        
+        assert old_email not in _user_cache
+    
+    def test_logout_drops_snapshot(self, client, db_session):
+        """Logging out forgets the cached user"""
+        user = create_user(db_session)
+        headers = {"Authorization": f"Bearer {create_access_token(data={'sub': user.email})}"}
+        
+        assert client.get("/api/auth/me", headers=headers).status_code == status.HTTP_200_OK
+        assert user.email in _user_cache
+        
+        response = client.post("/api/auth/logout", headers=headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert user.email not in _user_cache